@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import os
+import sys
+import unicodedata
+from array import array
+from lxml import etree
+
+RECORD_TAGS = {
+    "article", "inproceedings", "proceedings", "book",
+    "incollection", "phdthesis", "mastersthesis", "www", "data"
+}
+
+# File names inside the output directory. They are read by
+# django-backend-app/api/services/author_index.py, keep both in sync.
+RECORDS_FILE = "records.jsonl"
+POSTINGS_FILE = "postings.bin"
+AUTHORS_FILE = "authors.tsv"
+AUTHOR_OFFSETS_FILE = "authors.offsets"
+PERSONS_FILE = "persons.jsonl"
+
+# Fuzzy name search tables over persons.jsonl, memory-mapped by
+# django-backend-app/api/services/name_search.py, keep both in sync.
+NAME_SEARCH_META_FILE = "name_search.json"
+NAMES_FILE = "names.txt"
+NAME_LINES_FILE = "names.lines"
+NAME_PERSONS_FILE = "names.persons"
+NORMALIZED_FILE = "names.normalized"
+NORMALIZED_LINES_FILE = "names.normalized.lines"
+TRIGRAM_KEYS_FILE = "name_trigrams.keys"
+TRIGRAM_OFFSETS_FILE = "name_trigrams.offsets"
+TRIGRAM_POSTINGS_FILE = "name_trigrams.postings"
+TOKENS_FILE = "name_tokens.txt"
+TOKEN_LINES_FILE = "name_tokens.lines"
+TOKEN_OFFSETS_FILE = "name_tokens.offsets"
+TOKEN_POSTINGS_FILE = "name_tokens.postings"
+NAME_SEARCH_FILES = (NAME_SEARCH_META_FILE, NAMES_FILE, NAME_LINES_FILE, NAME_PERSONS_FILE,
+                     NORMALIZED_FILE, NORMALIZED_LINES_FILE,
+                     TRIGRAM_KEYS_FILE, TRIGRAM_OFFSETS_FILE, TRIGRAM_POSTINGS_FILE,
+                     TOKENS_FILE, TOKEN_LINES_FILE, TOKEN_OFFSETS_FILE, TOKEN_POSTINGS_FILE)
+
+
+def existing_file(path: str) -> str:
+    """
+    Ensure `path` is an existing file.
+    Raises an error if the file does not exist.
+    """
+    if not os.path.isfile(path):
+        raise argparse.ArgumentTypeError(f"Not a valid file: {path}")
+    return path
+
+
+def parse_args():
+    """
+    Parse command-line arguments.
+    Expects two arguments:
+      - `xml_filename`: Path to dblp.xml (or dblp.xml.gz).
+      - `output_dir`: Directory the index files are written to.
+    """
+    parser = argparse.ArgumentParser(
+        description="Build the author -> record inverted index used by the Django backend."
+    )
+    parser.add_argument("xml_filename", type=existing_file,
+                        help="Path to dblp.xml or dblp.xml.gz.")
+    parser.add_argument("output_dir",
+                        help="Directory for the index files (e.g. django-backend-app/data/dblp_index).")
+    return parser.parse_args()
+
+
+def normalize_author_name(name):
+    """Unicode-normalize, case-fold and collapse whitespace so lookups are not spelling-sensitive."""
+    return " ".join(unicodedata.normalize("NFKC", name).casefold().split())
+
+
+def normalize_person_name(name):
+    """Strip accents, case-fold and collapse whitespace, as the backend's name search does."""
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())
+
+
+def name_trigram_codes(name):
+    """Codes of the padded trigrams of a normalized name (21 bits per code point)."""
+    padded = f"  {name} "
+    return {
+        (ord(padded[i]) << 42) | (ord(padded[i + 1]) << 21) | ord(padded[i + 2])
+        for i in range(len(padded) - 2)
+    }
+
+
+def write_postings(postings_by_key, keys, offsets_path, postings_path):
+    """Write uint64 offsets (one more than keys) and the uint32 entry ids they point into."""
+    offsets = array("Q", [0])
+    with open(postings_path, "wb") as postings_out:
+        for key in keys:
+            postings = postings_by_key.pop(key)
+            postings.tofile(postings_out)
+            offsets.append(offsets[-1] + len(postings))
+    with open(offsets_path, "wb") as offsets_out:
+        offsets.tofile(offsets_out)
+
+
+def write_lines(lines, text_path, lines_path):
+    """Write one string per line and the uint64 byte offset of every line (plus the end)."""
+    offsets = array("Q", [0])
+    with open(text_path, "wb") as text_out:
+        for line in lines:
+            encoded = line.encode("utf-8") + b"\n"
+            text_out.write(encoded)
+            offsets.append(offsets[-1] + len(encoded))
+    with open(lines_path, "wb") as lines_out:
+        offsets.tofile(lines_out)
+
+
+def build_name_search_postings(persons_path, tmp_path):
+    """
+    Write the tables of the backend's fuzzy name search for `persons_path`, with one
+    entry per name in file order: the names, their normalized forms and the offset
+    of their persons.jsonl line, and trigram and token postings. Backend workers map these files instead of
+    building the index in memory.
+    """
+    grams, tokens = {}, {}
+    names, normalized_names, person_offsets = [], [], array("Q")
+    position = 0
+    with open(persons_path, "rb") as persons_in:
+        for line in persons_in:
+            line_start, position = position, position + len(line)
+            if not line.strip():
+                continue
+            for name in json.loads(line).get("names", []):
+                entry_id = len(names)
+                names.append(name.replace("\n", " "))
+                person_offsets.append(line_start)
+                normalized = normalize_person_name(name)
+                normalized_names.append(normalized)
+                for code in name_trigram_codes(normalized):
+                    grams.setdefault(code, array("I")).append(entry_id)
+                for token in set(normalized.split()):
+                    tokens.setdefault(token, array("I")).append(entry_id)
+
+    entries = len(names)
+    write_lines(names, tmp_path(NAMES_FILE), tmp_path(NAME_LINES_FILE))
+    write_lines(normalized_names, tmp_path(NORMALIZED_FILE), tmp_path(NORMALIZED_LINES_FILE))
+    del names, normalized_names
+    with open(tmp_path(NAME_PERSONS_FILE), "wb") as persons_out:
+        person_offsets.tofile(persons_out)
+
+    gram_keys = array("Q", sorted(grams))
+    with open(tmp_path(TRIGRAM_KEYS_FILE), "wb") as keys_out:
+        gram_keys.tofile(keys_out)
+    write_postings(grams, gram_keys, tmp_path(TRIGRAM_OFFSETS_FILE), tmp_path(TRIGRAM_POSTINGS_FILE))
+
+    token_list = sorted(tokens)
+    write_lines(token_list, tmp_path(TOKENS_FILE), tmp_path(TOKEN_LINES_FILE))
+    write_postings(tokens, token_list, tmp_path(TOKEN_OFFSETS_FILE), tmp_path(TOKEN_POSTINGS_FILE))
+
+    with open(tmp_path(NAME_SEARCH_META_FILE), "w", encoding="utf-8") as meta_out:
+        json.dump({"entries": entries, "persons_size": os.path.getsize(persons_path)}, meta_out)
+    return entries
+
+
+def first_text(elem, tag):
+    """Full text content (including markup such as <i>) of the first `tag` child, or ''."""
+    child = elem.find(tag)
+    return "".join(child.itertext()).strip() if child is not None else ""
+
+
+def extract_record(elem):
+    """
+    Convert a DBLP record element into the same shape the `author_profile`
+    XQuery returns for a publication, plus the record's affiliation notes.
+    """
+    return {
+        "key": (elem.get("key") or "").strip(),
+        "tag": elem.tag,
+        "publtype": (elem.get("publtype") or "").strip(),
+        "title": first_text(elem, "title"),
+        "year": first_text(elem, "year"),
+        "journal": first_text(elem, "journal"),
+        "booktitle": first_text(elem, "booktitle"),
+        "publisher": first_text(elem, "publisher"),
+        "authors": [(a.text or "").strip() for a in elem.findall("author") if (a.text or "").strip()],
+        "ee": [(ee.text or "").strip() for ee in elem.findall("ee") if (ee.text or "").strip()],
+        "affiliations": [
+            " ".join("".join(note.itertext()).split())
+            for note in elem.findall("note")
+            if note.get("type") == "affiliation"
+        ],
+    }
+
+
+def build_index(xml_filename, output_dir):
+    """
+    Stream through dblp.xml once and write:
+      - records.jsonl:   one JSON record per line
+      - postings.bin:    uint64 byte offsets into records.jsonl, grouped by author
+      - authors.tsv:     sorted "normalized name<TAB>first posting<TAB>posting count" lines
+      - authors.offsets: uint64 byte offset of every line in authors.tsv (for binary search)
+      - persons.jsonl:   names and affiliations of every person (homepages/) record,
+                         loaded by the backend's fuzzy name search
+      - name_trigrams.*, name_tokens.*, name_search.json:
+                         that search's trigram and token postings over persons.jsonl
+    Files are written under a ".tmp" suffix and moved into place at the end, so a
+    running backend never maps a half-written index.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    def tmp_path(filename):
+        return os.path.join(output_dir, filename + ".tmp")
+
+    postings_by_author = {}
+    total_records = 0
+
+    total_persons = 0
+
+    with open(tmp_path(RECORDS_FILE), "wb") as records_out, \
+            open(tmp_path(PERSONS_FILE), "wb") as persons_out:
+        context = etree.iterparse(
+            xml_filename,
+            events=("end",),
+            load_dtd=False,
+            resolve_entities=True
+        )
+
+        for event, elem in context:
+            if elem.tag not in RECORD_TAGS:
+                continue
+
+            record = extract_record(elem)
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+            if not record["authors"]:
+                continue
+
+            offset = records_out.tell()
+            records_out.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+            records_out.write(b"\n")
+            total_records += 1
+
+            for name in set(normalize_author_name(a) for a in record["authors"]):
+                postings_by_author.setdefault(name, array("Q")).append(offset)
+
+            if record["tag"] == "www" and record["key"].startswith("homepages/"):
+                person = {"names": record["authors"], "affiliations": record["affiliations"]}
+                persons_out.write(json.dumps(person, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+                persons_out.write(b"\n")
+                total_persons += 1
+
+        del context
+
+    names = sorted(postings_by_author, key=lambda n: n.encode("utf-8"))
+    line_offsets = array("Q")
+    position = 0
+
+    with open(tmp_path(POSTINGS_FILE), "wb") as postings_out, \
+            open(tmp_path(AUTHORS_FILE), "wb") as authors_out:
+        for name in names:
+            postings = postings_by_author[name]
+            line_offsets.append(authors_out.tell())
+            authors_out.write(f"{name}\t{position}\t{len(postings)}\n".encode("utf-8"))
+            postings.tofile(postings_out)
+            position += len(postings)
+
+    with open(tmp_path(AUTHOR_OFFSETS_FILE), "wb") as offsets_out:
+        line_offsets.tofile(offsets_out)
+
+    del postings_by_author
+    total_names = build_name_search_postings(tmp_path(PERSONS_FILE), tmp_path)
+
+    # persons.jsonl goes last: the backend rebuilds its name index when that file changes
+    for filename in (RECORDS_FILE, POSTINGS_FILE, AUTHORS_FILE, AUTHOR_OFFSETS_FILE, *NAME_SEARCH_FILES, PERSONS_FILE):
+        os.replace(tmp_path(filename), os.path.join(output_dir, filename))
+
+    print(f"Indexed {total_records} records for {len(names)} authors "
+          f"and {total_persons} person records ({total_names} names) into {output_dir}.")
+
+
+def main():
+    args = parse_args()
+    if sys.byteorder != "little":
+        print("ERROR: the index files are written little-endian; run this on a little-endian machine.")
+        sys.exit(1)
+    build_index(args.xml_filename, args.output_dir)
+
+
+if __name__ == "__main__":
+    main()
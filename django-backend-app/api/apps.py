@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        from utils.registry import registry
+        from . import resources  # noqa: F401  Registers the lazily loaded resources
+
+        if settings.WARM_UP_RESOURCES:
+            registry.warm_up_in_background(settings.WARM_UP_RESOURCES)
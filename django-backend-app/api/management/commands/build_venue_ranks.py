@@ -0,0 +1,161 @@
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from rapidfuzz import fuzz, process
+
+from api.services.author_index import RECORDS_FILE
+from api.services.basex_pool import get_basex_pool
+from api.services.dblp_queries import query_items
+from api.services.profile_fetcher import ProfileFetcher
+from api.services.venue_ranks import VenueRankTable, core_fingerprint
+from utils.CORE import VenueRanker
+
+
+class Command(BaseCommand):
+    help = ("Pre-resolves every distinct DBLP venue against the CORE rankings into the table "
+            "ProfileFetcher reads. Run after each DBLP or CORE release; when a table exists, "
+            "only venues affected by the changes are re-scored.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true",
+                            help="Re-score every venue instead of only the ones affected by changes.")
+        parser.add_argument("--examples", type=int, default=20,
+                            help="Number of changed venues listed in the report.")
+
+    def handle(self, *args, **options):
+        ranker = VenueRanker(VenueRanker.read_csv(settings.CORE_RANKS_FILE))
+        venues = self._dblp_venues()
+        self.stdout.write(f"{len(venues)} distinct DBLP venues, {len(ranker.entries)} CORE entries.")
+
+        path = settings.VENUE_RANKS_FILE
+        previous = None
+        if os.path.exists(path) and not options["full"]:
+            previous = VenueRankTable.from_file(path)
+
+        if previous is None:
+            matches = ranker.match_many(sorted(venues))
+            rescored = len(matches)
+        else:
+            matches, to_rescore = self._carry_over(previous, ranker, venues)
+            matches.update(ranker.match_many(sorted(to_rescore)))
+            rescored = len(to_rescore)
+        self.stdout.write(f"Scored {rescored} venues.")
+
+        if previous is not None:
+            self._report_rank_changes(previous, ranker, matches, options["examples"])
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({
+                "core_fingerprint": core_fingerprint(settings.CORE_RANKS_FILE),
+                "core": ranker.entries,
+                "venues": matches,
+            }, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(path + ".tmp", path)
+
+        ranked = sum(1 for position in matches.values() if position is not None)
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {len(matches)} venues ({ranked} with a CORE match) to {path}."
+        ))
+
+    def _dblp_venues(self):
+        """Distinct venue strings, read from the author index when built, otherwise from BaseX."""
+        records_path = os.path.join(settings.DBLP_AUTHOR_INDEX_DIR, RECORDS_FILE)
+        if os.path.exists(records_path):
+            with open(records_path, encoding="utf-8") as f:
+                return {ProfileFetcher._get_venue(json.loads(line)) for line in f if line.strip()}
+
+        self.stdout.write("Author index not found; reading venues from BaseX.")
+        with get_basex_pool().session() as session:
+            return {venue for venue in query_items(session, "dblp_venues") if venue}
+
+    def _carry_over(self, previous, ranker, venues):
+        """
+        Diff the previous CORE snapshot against the current one and keep every match
+        the changes cannot affect. Returns (matches kept, venues to re-score).
+
+        A venue has to be re-scored when it is new in DBLP, when the entry it matched was
+        removed or renamed, or when it scores above the threshold against a name or
+        abbreviation that was added or changed. Rank-only changes need no re-scoring
+        because ranks are resolved through the stored entry.
+        """
+        old_by_id = {entry[0]: (position, entry) for position, entry in enumerate(previous.core)}
+        new_by_id = {entry[0]: (position, entry) for position, entry in enumerate(ranker.entries)}
+
+        added = [entry_id for entry_id in new_by_id if entry_id not in old_by_id]
+        removed = [entry_id for entry_id in old_by_id if entry_id not in new_by_id]
+        renamed = [entry_id for entry_id, (_, entry) in new_by_id.items()
+                   if entry_id in old_by_id and old_by_id[entry_id][1][1:3] != entry[1:3]]
+        reranked = [entry_id for entry_id, (_, entry) in new_by_id.items()
+                    if entry_id in old_by_id and old_by_id[entry_id][1][3] != entry[3]]
+        self.stdout.write(f"CORE changes: {len(added)} added, {len(removed)} removed, "
+                          f"{len(renamed)} renamed, {len(reranked)} re-ranked.")
+
+        # A name or abbreviation shared by several entries resolves to the first one, so a
+        # reordered CORE file can hand a string to a different entry without any edit
+        old_owners, new_owners = self._string_owners(previous.core), self._string_owners(ranker.entries)
+        reassigned = {value for value, entry_id in new_owners.items() if old_owners.get(value) != entry_id}
+
+        # Old position -> new position for entries whose strings did not change
+        stale = set(removed) | set(renamed) | {old_owners[value] for value in reassigned if value in old_owners}
+        remap = {old_by_id[entry_id][0]: new_by_id[entry_id][0]
+                 for entry_id in new_by_id if entry_id in old_by_id and entry_id not in stale}
+
+        new_venues = [venue for venue in venues if venue not in previous.matches]
+        dropped = len(previous.matches) - (len(venues) - len(new_venues))
+        self.stdout.write(f"DBLP changes: {len(new_venues)} new venues, {dropped} no longer present.")
+
+        to_rescore = set(new_venues)
+        matches = {}
+        for venue in venues:
+            if venue in to_rescore:
+                continue
+            position = previous.matches[venue]
+            if position is None:
+                matches[venue] = None
+            elif position in remap:
+                matches[venue] = remap[position]
+            else:
+                to_rescore.add(venue)
+
+        changed_strings = list(reassigned | {value for entry_id in added + renamed
+                                             for value in new_by_id[entry_id][1][1:3] if value})
+        candidates = list(matches)
+        if changed_strings and candidates:
+            scores = process.cdist(candidates, changed_strings, scorer=fuzz.ratio,
+                                   score_cutoff=ranker.threshold, workers=-1)
+            for venue, best in zip(candidates, scores.max(axis=1)):
+                if best >= ranker.threshold:
+                    to_rescore.add(venue)
+
+        for venue in to_rescore:
+            matches.pop(venue, None)
+        return matches, to_rescore
+
+    @staticmethod
+    def _string_owners(entries):
+        """Name/abbreviation -> id of the first entry carrying it."""
+        owners = {}
+        for entry in entries:
+            for value in entry[1:3]:
+                if value:
+                    owners.setdefault(value, entry[0])
+        return owners
+
+    def _report_rank_changes(self, previous, ranker, matches, examples):
+        """List venues whose resolved CORE rank differs from the previous table."""
+        changes = []
+        for venue, position in matches.items():
+            if venue not in previous.matches:
+                continue
+            old_position = previous.matches[venue]
+            old_rank = previous.core[old_position][3] if old_position is not None else None
+            new_rank = ranker.entries[position][3] if position is not None else None
+            if old_rank != new_rank:
+                changes.append((venue, old_rank, new_rank))
+
+        self.stdout.write(f"{len(changes)} venues changed rank.")
+        for venue, old_rank, new_rank in sorted(changes)[:examples]:
+            self.stdout.write(f"  {venue}: {old_rank or '-'} -> {new_rank or '-'}")
@@ -0,0 +1,71 @@
+import re
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.services.basex_pool import get_basex_pool
+from api.services.dblp_queries import OFFLINE_QUERIES, QUERIES, VARIABLE_TYPES
+
+INDEX_PROPERTIES = ["textindex", "attrindex", "tokenindex", "ftindex"]
+
+
+class Command(BaseCommand):
+    help = "Reports which DBLP indexes exist and whether each production query is rewritten to index access."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--author", default="Heiko Paulheim",
+                            help="Author name bound to the queries while checking them.")
+        parser.add_argument("--limit", type=int, default=5,
+                            help="Value bound to $limit for the search query.")
+
+    def handle(self, *args, **options):
+        bindings = {
+            "author_name": options["author"],
+            "author_query": options["author"],
+            "limit": options["limit"],
+        }
+        database = settings.BASEX["DATABASE"]
+        all_indexed = True
+
+        with get_basex_pool().session() as session:
+            info = session.execute(f"XQUERY db:info('{database}')")
+            self.stdout.write(f"Indexes on '{database}':")
+            for prop in INDEX_PROPERTIES:
+                match = re.search(rf"<{prop}>(\w+)</{prop}>", info)
+                value = match.group(1) if match else "unknown"
+                self.stdout.write(f"  {prop:<12} {value}")
+
+            session.execute("SET QUERYINFO true")
+            try:
+                for name, query_text in QUERIES.items():
+                    if name in OFFLINE_QUERIES:
+                        continue
+                    query = session.query(query_text)
+                    try:
+                        for var in re.findall(r"declare variable \$(\w+)", query_text):
+                            query.bind(f"${var}", str(bindings[var]), VARIABLE_TYPES.get(var, ""))
+                        start = time.perf_counter()
+                        query.execute()
+                        elapsed = (time.perf_counter() - start) * 1000
+                        query_info = query.info()
+                    finally:
+                        query.close()
+
+                    rewrites = [line.strip("- ").strip() for line in query_info.splitlines()
+                                if "index" in line.lower() and "apply" in line.lower()]
+                    status = "index" if rewrites else "SCAN"
+                    all_indexed = all_indexed and bool(rewrites)
+                    self.stdout.write(f"{name}: {status} ({elapsed:.1f} ms)")
+                    for line in rewrites:
+                        self.stdout.write(f"    {line}")
+            finally:
+                session.execute("SET QUERYINFO false")
+
+        if all_indexed:
+            self.stdout.write(self.style.SUCCESS("All production queries use an index."))
+        else:
+            self.stdout.write(self.style.WARNING(
+                "Some queries fall back to a collection scan; rebuild the database with the "
+                "options in download_dblp.sh."
+            ))
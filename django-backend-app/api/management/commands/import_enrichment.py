@@ -0,0 +1,52 @@
+import datetime
+import json
+import os
+
+from django.core.management.base import BaseCommand
+
+from api.services.enrichment_cache import get_enrichment_cache
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = ("Loads OpenAlex results dumped to JSON files (a list of works, or a {doi: work} "
+            "object such as some_dump.json) into the DOI enrichment cache.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("files", nargs="+", help="JSON dump files.")
+        parser.add_argument("--source", default="openalex", help="Source recorded for the entries.")
+
+    def handle(self, *args, **options):
+        cache = get_enrichment_cache()
+        total = 0
+        for path in options["files"]:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            works = data.values() if isinstance(data, dict) else data
+
+            records = {}
+            for work in works:
+                if not isinstance(work, dict) or not work.get("doi"):
+                    continue
+                records[work["doi"]] = {
+                    "title": work.get("title"),
+                    "abstract": work.get("abstract"),
+                    "citations": work.get("cited_by_count"),
+                }
+
+            # Fresher entries already in the cache win over the dump
+            for doi in cache.get_many(list(records)):
+                records.pop(doi, None)
+
+            # Entries are dated by the dump file, so they expire like fetched ones
+            fetched_at = datetime.datetime.utcfromtimestamp(os.path.getmtime(path))
+            items = list(records.items())
+            written = 0
+            for start in range(0, len(items), BATCH_SIZE):
+                written += cache.put_many(dict(items[start:start + BATCH_SIZE]), options["source"],
+                                          fetched_at=fetched_at)
+            self.stdout.write(f"{path}: cached {written} DOIs.")
+            total += written
+
+        self.stdout.write(self.style.SUCCESS(f"Cached {total} DOIs."))
@@ -0,0 +1,54 @@
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# What a worker imports before it can serve the first request
+BOOT_SCRIPT = (
+    "import os, django; "
+    "os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings'); "
+    "django.setup(); "
+    "import backend.wsgi, {urlconf}"
+)
+
+
+class Command(BaseCommand):
+    help = ("Boots the project in a fresh interpreter with `python -X importtime` and reports "
+            "the slowest modules, to keep heavy libraries out of worker startup.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top", type=int, default=25,
+                            help="Number of modules listed per table.")
+
+    def handle(self, *args, **options):
+        script = BOOT_SCRIPT.format(urlconf=settings.ROOT_URLCONF)
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", script],
+            cwd=settings.BASE_DIR, capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            self.stderr.write(result.stderr.splitlines()[-1] if result.stderr else "Boot failed.")
+            return
+
+        # Lines look like "import time:      self [us] |   cumulative | imported package"
+        timings = []
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "self [us]" in line:
+                continue
+            self_us, cumulative_us, package = line[len("import time:"):].split("|")
+            depth = (len(package) - len(package.lstrip()) - 1) // 2  # Two spaces per nesting level
+            timings.append((package.strip(), depth, int(self_us), int(cumulative_us)))
+
+        total = sum(t[3] for t in timings if t[1] == 0)
+        self.stdout.write(f"Imported {len(timings)} modules in {total / 1e6:.2f}s "
+                          f"(interpreter startup excluded).")
+
+        self.stdout.write("\nTop-level imports by cumulative time:")
+        top_level = sorted((t for t in timings if t[1] == 0), key=lambda t: t[3], reverse=True)
+        for package, _, _, cumulative_us in top_level[:options["top"]]:
+            self.stdout.write(f"  {cumulative_us / 1000:9.1f} ms  {package}")
+
+        self.stdout.write("\nModules by own (self) time:")
+        for package, _, self_us, _ in sorted(timings, key=lambda t: t[2], reverse=True)[:options["top"]]:
+            self.stdout.write(f"  {self_us / 1000:9.1f} ms  {package}")
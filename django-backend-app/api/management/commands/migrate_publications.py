@@ -0,0 +1,70 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+
+from api.models import Author, Publication
+from api.services.profile_fetcher import ProfileFetcher
+from api.services.publication_store import PublicationStore, publication_key
+from utils.doi import extract_dois
+
+
+class Command(BaseCommand):
+    help = ("Moves publications embedded in author documents into the shared publications "
+            "collection, keeping abstracts, topics and citations already fetched.")
+
+    def handle(self, *args, **options):
+        Publication.ensure_indexes()
+        authors = Author._get_collection()
+        migrated = 0
+
+        for raw in authors.find({"publications.0": {"$exists": True}}, {"name": 1, "publications": 1}):
+            name = raw["name"]
+            try:
+                keys, operations = self._migrate_author(name, raw["publications"])
+            except Exception as e:
+                self.stdout.write(f"Error migrating {name}: {e}")
+                continue
+
+            if operations:
+                Publication._get_collection().bulk_write(operations, ordered=False)
+            authors.update_one(
+                {"_id": raw["_id"]},
+                {"$set": {"publication_keys": keys}, "$unset": {"publications": ""}}
+            )
+            migrated += 1
+            self.stdout.write(f"Migrated {len(keys)} publications for {name}")
+
+        self.stdout.write(self.style.SUCCESS(f"Migrated {migrated} authors."))
+
+    def _migrate_author(self, name, embedded):
+        """
+        Re-read the author's DBLP records so every paper is stored under its DBLP key,
+        then carry the enrichment of the embedded copies over to the shared documents.
+        """
+        fetcher = ProfileFetcher(name)
+        fetcher.fetch_data()
+        publications, _ = fetcher.parse_publications()
+        keys = PublicationStore.save_many(publications)
+
+        key_by_title, key_by_doi = {}, {}
+        for pub in publications:
+            dois = extract_dois(pub["links"])
+            key = publication_key(pub["key"], dois)
+            key_by_title[(pub["title"].casefold(), pub["year"])] = key
+            for doi in dois:
+                key_by_doi[doi] = key
+
+        now = datetime.datetime.utcnow()
+        operations = []
+        for pub in embedded:
+            dois = extract_dois(pub.get("links") or [])
+            key = key_by_title.get((pub.get("title", "").casefold(), pub.get("year", 0)))
+            key = key or next((key_by_doi[doi] for doi in dois if doi in key_by_doi), None)
+            if key is None:
+                continue
+            operations.extend(PublicationStore.enrichment_operations({"key": key}, {
+                "abstract": pub.get("abstract"),
+                "topics": pub.get("topics"),
+                "citations": pub.get("citations") or None,
+            }, now))
+        return keys, operations
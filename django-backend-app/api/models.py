@@ -1,42 +1,51 @@
 from django.db import models
 from mongoengine import (
-    Document, StringField, ListField, DateTimeField, BooleanField,
-    EmbeddedDocument, EmbeddedDocumentListField, IntField, URLField
+    Document, StringField, ListField, DateTimeField, BooleanField, IntField, URLField
 )
 import datetime
 
 
-class CoAuthor(EmbeddedDocument):
-    name = StringField(required=True)
-
-
-class Publication(EmbeddedDocument):
+class Publication(Document):
     """
-    Embedded document representing enriched fields of a research publication.
-    These fields are not directly available in XML and require additional processing.
+    MongoDB document representing a research publication, stored once per paper and
+    shared by all of its authors. Enriched fields (abstract, topics, citations) are
+    not directly available in XML and are written here once, whichever author's
+    profile triggered the enrichment.
     """
+    key = StringField(required=True, unique=True)  # DBLP record key, or "doi:<doi>" without one
     title = StringField(required=True)  # Still useful to map/enrich correct paper
     topics = ListField(StringField())  # LLM-generated topics
     abstract = StringField()  # Retrieved/generated abstract
     venue = StringField()
     core_rank = StringField(default="Unknown")  # CORE ranking if added
     citations = IntField(default=0)  # From external citation count sources
-    coauthors = EmbeddedDocumentListField(CoAuthor)  # Names only
+    authors = ListField(StringField())  # All DBLP authors, in order
     links = ListField(StringField())
+    dois = ListField(StringField())  # Normalized DOIs from `links` (utils.doi.normalize_doi), indexed
     year = IntField(default=0)
-    is_preprint = BooleanField(default="false")  # Flag to mark preprints
+    is_preprint = BooleanField(default=False)  # Flag to mark preprints
 
+    created_at = DateTimeField(default=datetime.datetime.utcnow)
+    updated_at = DateTimeField(default=datetime.datetime.utcnow)
+
+    meta = {
+        'collection': 'publications',
+        'indexes': [
+            'dois',  # Multikey index for DOI -> publication lookups
+        ],
+    }
 
 
 class Author(Document):
     """
-    MongoDB document representing an author with LLM-generated description and enriched publications.
+    MongoDB document representing an author with LLM-generated description and
+    references to their publications.
     """
     name = StringField(required=True, unique=True)  # Author name as unique identifier
     description = StringField()  # LLM-generated summary of author
     affiliations = ListField(StringField())
-    # Enriched publication data embedded directly under author
-    publications = EmbeddedDocumentListField(Publication)
+    # `Publication.key` of every publication, in DBLP order
+    publication_keys = ListField(StringField())
 
     created_at = DateTimeField(default=datetime.datetime.utcnow)
     updated_at = DateTimeField(default=datetime.datetime.utcnow)
@@ -44,9 +53,32 @@ class Author(Document):
     meta = {
         'collection': 'authors',  # MongoDB collection name
         'indexes': ['name'],      # Indexed for fast lookups by name
+        # Authors saved before publications moved to their own collection still carry
+        # an embedded `publications` array until `migrate_publications` has run
+        'strict': False,
     }
 
     def save(self, *args, **kwargs):
         """Override save to update `updated_at` before saving."""
         self.updated_at = datetime.datetime.utcnow()
         return super(Author, self).save(*args, **kwargs)
+
+
+class Enrichment(Document):
+    """
+    Enrichment fetched from an external source (OpenAlex) for one DOI, shared by every
+    publication, author and endpoint carrying that DOI. Also records DOIs the source
+    does not know (`found=False`), so they are not looked up again until the entry expires.
+    See api/services/enrichment_cache.py.
+    """
+    doi = StringField(required=True, unique=True)  # Normalized DOI (utils.doi.normalize_doi)
+    found = BooleanField(default=True)  # False if the source had no work for the DOI
+    title = StringField()
+    abstract = StringField()
+    citations = IntField()
+    source = StringField(required=True)  # e.g. "openalex"
+    fetched_at = DateTimeField(default=datetime.datetime.utcnow)
+
+    meta = {
+        'collection': 'enrichment',
+    }
@@ -0,0 +1,19 @@
+# Heavy resources used by the API, created on first use through utils.registry.
+# Registering them here imports nothing; list names in WARM_UP_RESOURCES to load
+# them in the background when a worker starts instead of on its first request.
+from django.conf import settings
+
+from utils.registry import registry
+
+
+def load_venue_ranker():
+    from utils.CORE import VenueRanker
+    return VenueRanker.from_csv(settings.CORE_RANKS_FILE)
+
+
+registry.register("venue_ranker", load_venue_ranker)
+registry.register("venue_rank_table", "api.services.venue_ranks.get_venue_rank_table")
+registry.register("author_index", "api.services.author_index.get_author_index")
+registry.register("keyword_extractor", "utils.keybert.KeywordExtractor")
+registry.register("ollama_model", "api.services.ollama_processor.preload_default_model")
+registry.register("prompt_tokenizer", "api.services.topic_batching.load_tokenizer")
@@ -0,0 +1,105 @@
+import json
+import logging
+import mmap
+import os
+import threading
+import unicodedata
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Written by dblp_parser_preprocessing/parser/build_author_index.py
+RECORDS_FILE = "records.jsonl"
+POSTINGS_FILE = "postings.bin"
+AUTHORS_FILE = "authors.tsv"
+AUTHOR_OFFSETS_FILE = "authors.offsets"
+
+
+def normalize_author_name(name):
+    """Same normalization the index builder applies to author names."""
+    return " ".join(unicodedata.normalize("NFKC", name).casefold().split())
+
+
+def _map_file(path):
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class AuthorRecordIndex:
+    """
+    Memory-mapped author -> DBLP record index built once per DBLP release.
+    A lookup is a binary search over the sorted author table followed by one
+    seek per record, so its cost does not depend on the size of DBLP.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._records = _map_file(os.path.join(directory, RECORDS_FILE))
+        self._authors = _map_file(os.path.join(directory, AUTHORS_FILE))
+        postings = _map_file(os.path.join(directory, POSTINGS_FILE))
+        offsets = _map_file(os.path.join(directory, AUTHOR_OFFSETS_FILE))
+        self._postings = memoryview(postings).cast("Q") if postings else memoryview(b"").cast("Q")
+        self._line_offsets = memoryview(offsets).cast("Q") if offsets else memoryview(b"").cast("Q")
+
+    def __len__(self):
+        return len(self._line_offsets)
+
+    def _entry(self, i):
+        start = self._line_offsets[i]
+        end = self._authors.find(b"\n", start)
+        name, first, count = self._authors[start:end].split(b"\t")
+        return name, int(first), int(count)
+
+    def _find(self, name):
+        """Binary search for a normalized name; returns (first posting, count) or None."""
+        target = normalize_author_name(name).encode("utf-8")
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            key, first, count = self._entry(mid)
+            if key < target:
+                lo = mid + 1
+            elif key > target:
+                hi = mid
+            else:
+                return first, count
+        return None
+
+    def _record_at(self, offset):
+        end = self._records.find(b"\n", offset)
+        return json.loads(self._records[offset:end])
+
+    def records_for(self, name):
+        """Return every DBLP record listing `name` as an author, or None if the name is unknown."""
+        found = self._find(name)
+        if found is None:
+            return None
+        first, count = found
+        return [self._record_at(offset) for offset in self._postings[first:first + count]]
+
+
+_index = None
+_index_lock = threading.Lock()
+_index_missing = False
+
+
+def get_author_index():
+    """
+    Return the process-wide author index, or None when it has not been built.
+    Callers fall back to querying BaseX in that case.
+    """
+    global _index, _index_missing
+    if _index is None and not _index_missing:
+        with _index_lock:
+            if _index is None and not _index_missing:
+                directory = settings.DBLP_AUTHOR_INDEX_DIR
+                if not os.path.exists(os.path.join(directory, AUTHOR_OFFSETS_FILE)):
+                    logger.warning(f"DBLP author index not found in {directory}; using BaseX lookups.")
+                    _index_missing = True
+                else:
+                    _index = AuthorRecordIndex(directory)
+                    logger.info(f"Loaded DBLP author index with {len(_index)} authors from {directory}")
+    return _index
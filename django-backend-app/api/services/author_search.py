@@ -1,96 +1,148 @@
 import logging
 import xml.etree.ElementTree as ET
+import datetime
+import queue
+from concurrent.futures import ThreadPoolExecutor
 from ..models import Author
 from .ollama_processor import OllamaTextProcessor
-from BaseXClient import BaseXClient
+from .author_index import get_author_index
+from .basex_pool import get_basex_pool
+from .dblp_queries import execute_query, query_items
+from .name_search import get_name_search_index
 
 logger = logging.getLogger(__name__)
 
 
 class AuthorSearchService:
-    def __init__(self, query):
+    MAX_WORKERS = 8  # Authors enriched concurrently (DBLP titles + LLM description)
+
+    def __init__(self, query, limit=5, offset=0):
         self.query = query.strip()
+        self.limit = limit
+        self.offset = offset
 
     def search_and_save_authors(self):
         """
-        Fuzzy search for authors matching the query,
-        then get affiliations, publications, and store in MongoDB.
+        Fuzzy search for authors matching the query, then get affiliations and store
+        them in MongoDB. Returns immediately: authors without a cached description
+        get `description: None` and `description_pending: True`; their descriptions
+        are produced by `stream_descriptions`.
         """
-        matched_authors = self._get_author_affiliations(self.query)
+        matched_authors = self._get_author_affiliations(self.query, limit=self.limit, offset=self.offset)
         if not matched_authors:
             return {"error": f"No matches found for '{self.query}'."}
 
+        # One Mongo round-trip for all matched authors
+        cached_authors = {a.name: a for a in Author.objects(name__in=list(matched_authors))}
+
         results = {}
         for author_name, affiliations in matched_authors.items():
-            cached_author = Author.objects(name=author_name).first()
+            cached_author = cached_authors.get(author_name)
             description = cached_author.description if cached_author else None
 
-            # Fetch titles if description missing
-            paper_titles = []
-            if not description:
-                paper_titles = self._get_publication_titles(author_name)
-                description = self._get_researcher_description(author_name, paper_titles)
-
             # Save to DB
             if cached_author:
-                cached_author.description = cached_author.description or description
-                cached_author.affiliations = cached_author.affiliations or affiliations
-                cached_author.save()
-                logger.info(f"Updated author '{author_name}' in MongoDB.")
+                if not cached_author.affiliations and affiliations:
+                    cached_author.affiliations = affiliations
+                    cached_author.save()
+                    logger.info(f"Updated author '{author_name}' in MongoDB.")
             else:
                 Author(
                     name=author_name,
-                    description=description,
                     affiliations=affiliations
                 ).save()
                 logger.info(f"Saved new author '{author_name}' to MongoDB.")
 
             results[author_name] = {
-                "description": description,
+                "description": description or None,
+                "description_pending": not description,
                 "affiliations": affiliations
             }
 
         return results
 
-    def _get_author_affiliations(self, author_query, limit=5):
-        """Uses fuzzy + exact match to get authors and their affiliations from BaseX."""
-        from BaseXClient import BaseXClient
-        import xml.etree.ElementTree as ET
+    def stream_descriptions(self, author_names):
+        """
+        Generate descriptions for the given authors concurrently and yield
+        (name, description) pairs as each one completes. Titles come from the
+        BaseX pool and descriptions are spread over the Ollama instances; every
+        description is persisted to its Author document as soon as it is ready.
+        """
+        for _, name, description in self.stream_description_events(author_names):
+            yield name, description
 
-        session = BaseXClient.Session('localhost', 1984, 'admin', 'admin')
-        author_aff_map = {}
+    def stream_description_events(self, author_names, tokens=False):
+        """
+        Like `stream_descriptions`, but yields ("description", name, description)
+        events and, with `tokens`, ("token", name, text) events with the model's
+        output for each author as it is generated.
+        """
+        cached_authors = {a.name: a for a in Author.objects(name__in=list(author_names))}
+
+        to_describe = []
+        for name in author_names:
+            cached_author = cached_authors.get(name)
+            if cached_author and cached_author.description:
+                yield "description", name, cached_author.description
+            else:
+                to_describe.append(name)
+
+        if not to_describe:
+            return
+
+        # Workers report tokens and finished descriptions through one queue, in arrival order
+        events = queue.Queue()
+
+        # Workers save their own description, so it is kept even if the client has gone away
+        def describe(name):
+            on_token = (lambda text: events.put(("token", name, text))) if tokens else None
+            description = "Description generation failed."
+            try:
+                description = self._describe_author(name, on_token)
+            except Exception as e:
+                logger.error(f"Description generation failed for author '{name}': {e}")
+            try:
+                Author.objects(name=name).update_one(
+                    set__description=description,
+                    set__updated_at=datetime.datetime.utcnow(),
+                    upsert=True
+                )
+                logger.info(f"Saved description for author '{name}' to MongoDB.")
+            except Exception as e:
+                logger.error(f"Could not save description for author '{name}': {e}")
+            events.put(("description", name, description))
+
+        executor = ThreadPoolExecutor(max_workers=min(self.MAX_WORKERS, len(to_describe)))
+        try:
+            for name in to_describe:
+                executor.submit(describe, name)
+            remaining = len(to_describe)
+            while remaining:
+                event, name, text = events.get()
+                if event == "description":
+                    remaining -= 1
+                yield event, name, text
+        finally:
+            # When the consumer stops early (GeneratorExit), authors not started yet are dropped
+            executor.shutdown(wait=False, cancel_futures=True)
 
-        xquery = f"""
-        let $author_name := lower-case('{author_query}')
-
-        let $exact :=
-          for $entry in //www
-          let $author := lower-case(normalize-space(string-join($entry/author, ' ')))
-          where $author = $author_name
-          return element result {{
-            attribute type {{ "exact" }},
-            <author>{{ $entry/author }}</author>,
-            for $aff in $entry/note[@type='affiliation']
-            return <affiliation label="{{ $aff/@label }}">{{ $aff/text() }}</affiliation>
-          }}
-
-        let $partial :=
-          for $entry in //www[author contains text {{ $author_name }} using fuzzy]
-          let $author := lower-case(normalize-space(string-join($entry/author, ' ')))
-          where $author != $author_name
-          return element result {{
-            attribute type {{ "partial" }},
-            <author>{{ $entry/author }}</author>,
-            for $aff in $entry/note[@type='affiliation']
-            return <affiliation label="{{ $aff/@label }}">{{ $aff/text() }}</affiliation>
-          }}
-        let $partial_limited := subsequence($partial, 1, {limit})
-        return ($exact, $partial_limited)
+    def _get_author_affiliations(self, author_query, limit=5, offset=0):
         """
+        Uses fuzzy + exact match to get authors and their affiliations, from the
+        in-process name search index when it is loaded and from BaseX otherwise.
+        """
+        index = get_name_search_index()
+        if index is not None:
+            return {
+                match["name"]: list(match["affiliations"])
+                for match in index.search(author_query, limit=limit, offset=offset)
+            }
+
+        author_aff_map = {}
 
         try:
-            session.execute("OPEN dblp")
-            result = session.execute(f'XQUERY {xquery}')
+            with get_basex_pool().session() as session:
+                result = execute_query(session, "author_search", author_query=author_query, limit=offset + limit)
 
             root = ET.fromstring(f"<results>{result}</results>")
             for res in root.findall('result'):
@@ -111,47 +163,43 @@ class AuthorSearchService:
 
         except Exception as e:
             logger.error(f"BaseX query failed: {e}")
-        finally:
-            session.close()
 
-        return author_aff_map
+        return dict(list(author_aff_map.items())[offset:offset + limit]) if offset else author_aff_map
 
     def _get_publication_titles(self, author_name, limit=10):
         """Fetch and parse publication titles for a given author (exact match only)."""
-        from BaseXClient import BaseXClient
-        import xml.etree.ElementTree as ET
-
-        session = BaseXClient.Session('localhost', 1984, 'admin', 'admin')
         publications = []
 
-        try:
-            session.execute("OPEN dblp")
-
-            query_text = f"""
-            let $author_name := '{author_name}'
-            for $pub in //(article|inproceedings|book|incollection|phdthesis|mastersthesis|proceedings|www|data)
-            where $pub/author = $author_name
-            return $pub
-            """
+        index = get_author_index()
+        records = index.records_for(author_name) if index else None
+        if records is not None:
+            titles = [r["title"] for r in records if r.get("title")]
+            return list(dict.fromkeys(titles))[:limit]
 
-            query = session.query(query_text)
+        with get_basex_pool().session() as session:
+            items = query_items(session, "author_publications", author_name=author_name)
 
-            for _, item in query.iter():
-                try:
-                    elem = ET.fromstring(item)
-                    title = elem.findtext("title")
-                    if title:
-                        publications.append(title.strip())
-                except ET.ParseError as e:
-                    logger.warning(f"Skipping publication due to parse error: {e}")
+        for item in items:
+            try:
+                elem = ET.fromstring(item)
+                title = elem.findtext("title")
+                if title:
+                    publications.append(title.strip())
+            except ET.ParseError as e:
+                logger.warning(f"Skipping publication due to parse error: {e}")
 
-            query.close()
-            return list(dict.fromkeys(publications))[:limit]
+        return list(dict.fromkeys(publications))[:limit]
 
-        finally:
-            session.close()
+    def _describe_author(self, author_name, on_token=None):
+        """Fetch an author's titles and generate a description; runs in a worker thread."""
+        try:
+            paper_titles = self._get_publication_titles(author_name)
+            return self._get_researcher_description(author_name, paper_titles, on_token)
+        except Exception as e:
+            logger.error(f"Failed to describe author '{author_name}': {e}")
+            return "Description generation failed."
 
-    def _get_researcher_description(self, name, paper_titles):
+    def _get_researcher_description(self, name, paper_titles, on_token=None):
         """Generate a short researcher description using Ollama or fallback."""
         processor = OllamaTextProcessor(batch_size=1, max_tokens=50, temperature=0.7)
         researcher = {
@@ -159,7 +207,7 @@ class AuthorSearchService:
             "papers": [{"title": title} for title in paper_titles[:10]]
         }
 
-        description = processor.generate_description(researcher)
+        description = processor.generate_description(researcher, on_token=on_token)
         # description = "blla blla blla"  # Placeholder
 
         if not description:
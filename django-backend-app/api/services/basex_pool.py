@@ -0,0 +1,174 @@
+import logging
+import queue
+import socket
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from BaseXClient import BaseXClient
+
+logger = logging.getLogger(__name__)
+
+
+class BaseXPoolTimeout(Exception):
+    """Raised when no BaseX session becomes free within the checkout timeout."""
+
+
+class PooledSession:
+    """
+    A BaseX session that already has the DBLP database opened.
+    Keeps track of when it was last used so the pool can decide whether to ping it,
+    and caches prepared query handles so they are registered only once per session.
+    """
+
+    def __init__(self, host, port, user, password, database):
+        self.session = BaseXClient.Session(host, port, user, password)
+        self.session.execute(f"OPEN {database}")
+        self.last_used = time.monotonic()
+        self.prepared = {}
+
+    def query(self, query_text):
+        return self.session.query(query_text)
+
+    def prepare(self, name, query_text):
+        """Return the cached query handle for `name`, registering it on first use."""
+        query = self.prepared.get(name)
+        if query is None:
+            query = self.session.query(query_text)
+            self.prepared[name] = query
+        return query
+
+    def execute(self, command):
+        return self.session.execute(command)
+
+    def is_alive(self):
+        try:
+            self.session.execute("XQUERY 1")
+            return True
+        except Exception as e:
+            logger.warning(f"BaseX session failed health check: {e}")
+            return False
+
+    def close(self):
+        for query in self.prepared.values():
+            try:
+                query.close()
+            except Exception:
+                pass
+        self.prepared.clear()
+        try:
+            self.session.close()
+        except Exception as e:
+            logger.debug(f"Error while closing BaseX session: {e}")
+
+
+class BaseXSessionPool:
+    """
+    Thread-safe pool of BaseX sessions shared by all services in the process.
+    Sessions are created lazily up to `size`, reused LIFO, and pinged before reuse
+    when they have been idle for longer than `healthcheck_interval` seconds.
+    """
+
+    def __init__(self, host, port, user, password, database,
+                 size=8, checkout_timeout=10.0, healthcheck_interval=30.0):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.database = database
+        self.size = size
+        self.checkout_timeout = checkout_timeout
+        self.healthcheck_interval = healthcheck_interval
+
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _connect(self):
+        logger.info(f"Opening BaseX session to {self.host}:{self.port} ({self.database})")
+        return PooledSession(self.host, self.port, self.user, self.password, self.database)
+
+    def acquire(self):
+        """Check out a session, creating or replacing it if necessary."""
+        if not self._slots.acquire(timeout=self.checkout_timeout):
+            raise BaseXPoolTimeout(
+                f"No BaseX session available after {self.checkout_timeout}s (pool size {self.size})"
+            )
+
+        try:
+            while True:
+                try:
+                    pooled = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._connect()
+
+                idle_for = time.monotonic() - pooled.last_used
+                if idle_for < self.healthcheck_interval or pooled.is_alive():
+                    return pooled
+                pooled.close()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, pooled, discard=False):
+        """Return a session to the pool, or drop it if it is broken."""
+        try:
+            if discard:
+                pooled.close()
+            else:
+                pooled.last_used = time.monotonic()
+                self._idle.put(pooled)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def session(self):
+        """
+        Context manager yielding a pooled session with the database opened.
+        A session that raised a connection error is discarded instead of reused.
+        BaseXClient reports XQuery errors as plain IOError (OSError) too, so after
+        one of those the session is pinged and kept if it still answers.
+        """
+        pooled = self.acquire()
+        discard = False
+        try:
+            yield pooled
+        except (ConnectionError, socket.timeout, EOFError):
+            discard = True
+            raise
+        except OSError:
+            discard = not pooled.is_alive()
+            raise
+        finally:
+            self.release(pooled, discard=discard)
+
+    def close_all(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_basex_pool():
+    """Return the process-wide BaseX session pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                config = settings.BASEX
+                _pool = BaseXSessionPool(
+                    host=config['HOST'],
+                    port=config['PORT'],
+                    user=config['USER'],
+                    password=config['PASSWORD'],
+                    database=config['DATABASE'],
+                    size=config['POOL_SIZE'],
+                    checkout_timeout=config['CHECKOUT_TIMEOUT'],
+                    healthcheck_interval=config['HEALTHCHECK_INTERVAL'],
+                )
+    return _pool
@@ -0,0 +1,126 @@
+# Every DBLP query used by the backend lives here as a named query with external
+# variables. Values are bound through the BaseX query API instead of being pasted
+# into the query text, so names such as "O'Brien" cannot break the query and the
+# query text stays identical between calls.
+#
+# Author lookups start from the <author> text node (`//author[text() = $name]`) and
+# walk up to the record, which BaseX rewrites to a text index access; the original
+# `//(article|...)[author = $name]` form was evaluated as a full collection scan.
+# Run `manage.py check_dblp_indexes` to confirm the rewrite against a live database.
+QUERIES = {
+    "author_publications": """
+        declare variable $author_name as xs:string external;
+        //author[text() = $author_name]/parent::*[
+          self::article or self::inproceedings or self::book or self::incollection or
+          self::phdthesis or self::mastersthesis or self::proceedings or self::www or self::data
+        ]
+    """,
+
+    # Everything ProfileFetcher needs in one round trip: publication records, affiliations
+    # and coauthor counts, serialized as a single JSON document.
+    "author_profile": """
+        declare variable $author_name as xs:string external;
+
+        let $records := //author[text() = $author_name]/parent::*[
+          self::article or self::inproceedings or self::book or self::incollection or
+          self::phdthesis or self::mastersthesis or self::proceedings or self::www or self::data
+        ]
+        let $coauthors := $records[year][lower-case(string(title[1])) != 'home page']/author[. != $author_name]
+        return serialize(map {
+          "publications": array {
+            for $pub in $records
+            return map {
+              "key": string($pub/@key),
+              "tag": local-name($pub),
+              "publtype": string($pub/@publtype),
+              "title": string($pub/title[1]),
+              "year": string($pub/year[1]),
+              "journal": string($pub/journal[1]),
+              "booktitle": string($pub/booktitle[1]),
+              "publisher": string($pub/publisher[1]),
+              "authors": array { $pub/author ! string(.) },
+              "ee": array { $pub/ee ! string(.) }
+            }
+          },
+          "affiliations": array { distinct-values($records/note[@type='affiliation'] ! normalize-space(.)) },
+          "coauthors": map:merge(
+            for $coauthor in $coauthors
+            group by $name := string($coauthor)
+            return map { $name: count($coauthor) }
+          )
+        }, map { "method": "json" })
+    """,
+
+    "author_search": """
+        declare variable $author_query as xs:string external;
+        declare variable $limit as xs:integer external;
+
+        let $author_name := lower-case($author_query)
+
+        let $exact :=
+          for $entry in //www[author contains text { $author_query } all words]
+          let $author := lower-case(normalize-space(string-join($entry/author, ' ')))
+          where $author = $author_name
+          return element result {
+            attribute type { "exact" },
+            <author>{ $entry/author }</author>,
+            for $aff in $entry/note[@type='affiliation']
+            return <affiliation label="{ $aff/@label }">{ $aff/text() }</affiliation>
+          }
+
+        let $partial :=
+          for $entry in //www[author contains text { $author_name } using fuzzy]
+          let $author := lower-case(normalize-space(string-join($entry/author, ' ')))
+          where $author != $author_name
+          return element result {
+            attribute type { "partial" },
+            <author>{ $entry/author }</author>,
+            for $aff in $entry/note[@type='affiliation']
+            return <affiliation label="{ $aff/@label }">{ $aff/text() }</affiliation>
+          }
+        let $partial_limited := subsequence($partial, 1, $limit)
+        return ($exact, $partial_limited)
+    """,
+
+    # Offline: every distinct venue string, read by `manage.py build_venue_ranks`
+    # when the precomputed author index is not available.
+    "dblp_venues": """
+        distinct-values((
+          //article/journal, //inproceedings/booktitle, //book/booktitle,
+          //book/publisher, //incollection/booktitle, //data/publisher
+        ) ! string(.))
+    """,
+}
+
+# Queries that scan the whole database by design and only run in offline jobs;
+# `check_dblp_indexes` does not expect an index rewrite for them.
+OFFLINE_QUERIES = {"dblp_venues"}
+
+# XML Schema types for the external variables, so BaseX can type-check bindings.
+VARIABLE_TYPES = {
+    "author_name": "xs:string",
+    "author_query": "xs:string",
+    "limit": "xs:integer",
+}
+
+
+def _bind(query, bindings):
+    for name, value in bindings.items():
+        query.bind(f"${name}", str(value), VARIABLE_TYPES.get(name, ""))
+
+
+def query_items(session, name, **bindings):
+    """
+    Run the named query on a pooled session and return its result items as strings.
+    The query handle is kept on the session and reused by later calls.
+    """
+    query = session.prepare(name, QUERIES[name])
+    _bind(query, bindings)
+    return [item for _, item in query.iter()]
+
+
+def execute_query(session, name, **bindings):
+    """Run the named query on a pooled session and return the serialized result."""
+    query = session.prepare(name, QUERIES[name])
+    _bind(query, bindings)
+    return query.execute()
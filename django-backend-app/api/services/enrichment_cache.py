@@ -0,0 +1,125 @@
+import datetime
+import logging
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from pymongo import UpdateOne
+
+from utils.doi import normalize_doi
+
+from ..models import Enrichment
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ("title", "abstract", "citations")
+
+
+class EnrichmentCache:
+    """
+    DOI -> enrichment (abstract, citation count, title) shared by every enrichment path.
+
+    Entries live in the `enrichment` collection, with an in-process LRU in front of it
+    so repeated lookups do not reach MongoDB. Entries older than `max_age` count as
+    missing, so citation counts are refreshed now and then. DOIs the source does not
+    know are stored too (`found` False), so they are not looked up again either.
+
+    DOIs may be passed bare or as links; results are keyed by the value the caller
+    passed in.
+    """
+
+    def __init__(self, max_age, max_entries=50000):
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self._memory = OrderedDict()  # normalized DOI -> entry dict
+        self._lock = threading.Lock()
+
+    def _remember(self, doi, entry):
+        with self._lock:
+            self._memory[doi] = entry
+            self._memory.move_to_end(doi)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def get_many(self, dois):
+        """Return {doi: entry} for the DOIs with a fresh entry, found or not."""
+        wanted = {}
+        for doi in dois:
+            normalized = normalize_doi(doi)
+            if normalized:
+                wanted.setdefault(normalized, []).append(doi)
+
+        entries = {}
+        with self._lock:
+            for normalized in wanted:
+                entry = self._memory.get(normalized)
+                if entry is not None:
+                    self._memory.move_to_end(normalized)
+                    entries[normalized] = entry
+
+        remaining = [doi for doi in wanted if doi not in entries]
+        if remaining:
+            for entry in Enrichment._get_collection().find({"doi": {"$in": remaining}}, {"_id": 0}):
+                self._remember(entry["doi"], entry)
+                entries[entry["doi"]] = entry
+
+        oldest = datetime.datetime.utcnow() - self.max_age
+        return {
+            doi: entry
+            for normalized, entry in entries.items() if entry["fetched_at"] >= oldest
+            for doi in wanted[normalized]
+        }
+
+    def put_many(self, records, source, fetched_at=None):
+        """
+        Store {doi: {"title", "abstract", "citations"} or None} fetched from `source`;
+        None marks a DOI the source does not know. Neither an empty abstract nor a
+        not-found answer replaces data stored earlier. `fetched_at` defaults to now.
+        Returns the number of entries written.
+        """
+        now = fetched_at or datetime.datetime.utcnow()
+        operations, entries = [], {}
+        for doi, record in records.items():
+            normalized = normalize_doi(doi)
+            if not normalized:
+                continue
+            fields = {"source": source, "fetched_at": now}
+            if record is None:
+                update = {"$set": fields, "$setOnInsert": {"doi": normalized, "found": False}}
+            else:
+                fields.update({name: record.get(name) for name in FIELDS if record.get(name) is not None})
+                fields.update({"doi": normalized, "found": True})
+                update = {"$set": fields}
+            operations.append(UpdateOne({"doi": normalized}, update, upsert=True))
+            entries[normalized] = (fields, record is not None and bool(record.get("abstract")))
+
+        if not operations:
+            return 0
+        Enrichment._get_collection().bulk_write(operations, ordered=False)
+
+        # Update the LRU only where the stored document is known in full; other DOIs are
+        # dropped from it and re-read from MongoDB on their next lookup
+        for normalized, (fields, complete) in entries.items():
+            with self._lock:
+                previous = self._memory.pop(normalized, None)
+            if previous is not None or complete:
+                self._remember(normalized, {**(previous or {}), **fields})
+        logger.info(f"Cached enrichment for {len(operations)} DOIs from {source}.")
+        return len(operations)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_enrichment_cache():
+    """Process-wide cache configured from the ENRICHMENT_* settings."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = EnrichmentCache(
+                    max_age=datetime.timedelta(days=settings.ENRICHMENT_MAX_AGE_DAYS),
+                    max_entries=settings.ENRICHMENT_CACHE_SIZE,
+                )
+    return _cache
@@ -0,0 +1,418 @@
+import bisect
+import json
+import logging
+import mmap
+import os
+import threading
+import time
+import unicodedata
+from array import array
+
+import numpy as np
+from django.conf import settings
+from rapidfuzz import fuzz, process
+
+logger = logging.getLogger(__name__)
+
+# Written by dblp_parser_preprocessing/parser/build_author_index.py
+PERSONS_FILE = "persons.jsonl"
+NAME_SEARCH_META_FILE = "name_search.json"
+NAMES_FILE = "names.txt"
+NAME_LINES_FILE = "names.lines"
+NAME_PERSONS_FILE = "names.persons"
+NORMALIZED_FILE = "names.normalized"
+NORMALIZED_LINES_FILE = "names.normalized.lines"
+TRIGRAM_KEYS_FILE = "name_trigrams.keys"
+TRIGRAM_OFFSETS_FILE = "name_trigrams.offsets"
+TRIGRAM_POSTINGS_FILE = "name_trigrams.postings"
+TOKENS_FILE = "name_tokens.txt"
+TOKEN_LINES_FILE = "name_tokens.lines"
+TOKEN_OFFSETS_FILE = "name_tokens.offsets"
+TOKEN_POSTINGS_FILE = "name_tokens.postings"
+
+
+def normalize_name(name):
+    """Strip accents, case-fold and collapse whitespace."""
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def trigram_code(gram):
+    """Pack a trigram into one integer (21 bits per code point), the key of the trigram postings."""
+    return (ord(gram[0]) << 42) | (ord(gram[1]) << 21) | ord(gram[2])
+
+
+def _compact(postings_by_key, keys):
+    """Flatten {key: array of entry ids} into (offsets, postings) in `keys` order."""
+    offsets, postings = array("Q", [0]), array("I")
+    for key in keys:
+        postings.extend(postings_by_key.pop(key))
+        offsets.append(len(postings))
+    return np.frombuffer(offsets, dtype=np.uint64), np.frombuffer(postings, dtype=np.uint32)
+
+
+def build_postings(normalized):
+    """
+    Build the trigram and token postings for normalized names in process, for when
+    the files written by build_author_index.py are missing or do not match persons.jsonl.
+    Returns (trigram keys, trigram offsets, trigram postings, tokens, token offsets, token postings).
+    """
+    grams, tokens = {}, {}
+    for entry_id, norm in enumerate(normalized):
+        for gram in trigrams(norm):
+            code = trigram_code(gram)
+            ids = grams.get(code)
+            if ids is None:
+                ids = grams[code] = array("I")
+            ids.append(entry_id)
+        for token in set(norm.split()):
+            ids = tokens.get(token)
+            if ids is None:
+                ids = tokens[token] = array("I")
+            ids.append(entry_id)
+
+    gram_keys = sorted(grams)
+    token_list = sorted(tokens)
+    return (np.array(gram_keys, dtype=np.uint64), *_compact(grams, gram_keys),
+            token_list, *_compact(tokens, token_list))
+
+
+def _map_bytes(path):
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _map_offsets(path):
+    """uint64 offsets file as a memoryview; indexing it is cheaper than indexing a numpy memmap."""
+    data = _map_bytes(path)
+    return memoryview(data).cast("Q") if data else memoryview(b"").cast("Q")
+
+
+def _map_array(path, dtype):
+    if os.path.getsize(path) == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r")
+
+
+class MappedLines:
+    """Read-only sequence over the lines of a mapped text file, given its uint64 line offsets."""
+
+    def __init__(self, text_path, lines_path):
+        self._text = _map_bytes(text_path)
+        self._lines = _map_offsets(lines_path)
+
+    def __len__(self):
+        return max(0, len(self._lines) - 1)
+
+    def __getitem__(self, i):
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self._text[self._lines[i]:self._lines[i + 1] - 1].decode("utf-8")
+
+    def equals(self, i, encoded):
+        """Whether line `i` is the UTF-8 bytes `encoded`, compared without decoding it."""
+        start, end = self._lines[i], self._lines[i + 1] - 1
+        return end - start == len(encoded) and self._text[start:end] == encoded
+
+
+class MemoryEntries:
+    """Names and affiliations of every entry (one per name alias), held in lists."""
+
+    def __init__(self, persons):
+        self.names = []
+        self.normalized = []
+        self._affiliations = []
+        for person in persons:
+            affiliations = person.get("affiliations", [])
+            for name in person.get("names", []):
+                self.names.append(name)
+                self.normalized.append(normalize_name(name))
+                self._affiliations.append(affiliations)
+
+    def __len__(self):
+        return len(self.names)
+
+    def name(self, i):
+        return self.names[i]
+
+    def normalized_name(self, i):
+        return self.normalized[i]
+
+    def is_normalized(self, i, normalized):
+        return self.normalized[i] == normalized
+
+    def affiliations(self, i):
+        return self._affiliations[i]
+
+
+class MappedEntries:
+    """
+    The same entries read from the name tables written by build_author_index.py;
+    affiliations come from the entry's persons.jsonl line and are only read for results.
+    """
+
+    def __init__(self, directory):
+        self.names = MappedLines(os.path.join(directory, NAMES_FILE), os.path.join(directory, NAME_LINES_FILE))
+        self.normalized = MappedLines(os.path.join(directory, NORMALIZED_FILE),
+                                      os.path.join(directory, NORMALIZED_LINES_FILE))
+        self._person_offsets = _map_offsets(os.path.join(directory, NAME_PERSONS_FILE))
+        self._persons = _map_bytes(os.path.join(directory, PERSONS_FILE))
+
+    def __len__(self):
+        return len(self.names)
+
+    def name(self, i):
+        return self.names[i]
+
+    def normalized_name(self, i):
+        return self.normalized[i]
+
+    def is_normalized(self, i, normalized):
+        return self.normalized.equals(i, normalized.encode("utf-8"))
+
+    def affiliations(self, i):
+        start = self._person_offsets[i]
+        end = self._persons.find(b"\n", start)
+        line = self._persons[start:end if end != -1 else len(self._persons)]
+        return json.loads(line).get("affiliations", [])
+
+
+def load_mapped(directory):
+    """
+    Map the name search files build_author_index.py wrote next to persons.jsonl, or
+    return None when they are missing or were built from a different persons file.
+    Mapped pages are shared by every worker process instead of copied into each.
+    Returns (entries, postings) for NameSearchIndex.
+    """
+    try:
+        with open(os.path.join(directory, NAME_SEARCH_META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("persons_size") != os.path.getsize(os.path.join(directory, PERSONS_FILE)):
+            logger.warning("Name search files do not match persons.jsonl; building the index in process")
+            return None
+        entries = MappedEntries(directory)
+        postings = (
+            _map_array(os.path.join(directory, TRIGRAM_KEYS_FILE), np.uint64),
+            _map_array(os.path.join(directory, TRIGRAM_OFFSETS_FILE), np.uint64),
+            _map_array(os.path.join(directory, TRIGRAM_POSTINGS_FILE), np.uint32),
+            MappedLines(os.path.join(directory, TOKENS_FILE), os.path.join(directory, TOKEN_LINES_FILE)),
+            _map_array(os.path.join(directory, TOKEN_OFFSETS_FILE), np.uint64),
+            _map_array(os.path.join(directory, TOKEN_POSTINGS_FILE), np.uint32),
+        )
+    except FileNotFoundError:
+        return None
+    if len(entries) != meta.get("entries"):
+        logger.warning("Name search files do not match persons.jsonl; building the index in process")
+        return None
+    return entries, postings
+
+
+class NameSearchIndex:
+    """
+    Fuzzy search over DBLP person names.
+
+    Candidates are gathered from a trigram inverted index (typo tolerance) and a
+    sorted token table (prefix search), then ranked with RapidFuzz. Only the
+    rarest query trigrams are intersected, so a lookup touches a few thousand
+    postings instead of every name in DBLP. Exact matches are the entries that
+    contain every query trigram and normalize to the query.
+
+    Both indexes are sorted keys plus offsets into one flat array of entry ids.
+    Normally they and the names are memory-mapped from files the DBLP ingest
+    precomputes (`from_file`), so workers neither build nor copy them.
+    """
+
+    MAX_QUERY_TRIGRAMS = 8       # Rarest trigrams used to collect candidates
+    MAX_CANDIDATES = 1000        # Candidates per source passed to RapidFuzz
+    MAX_PREFIX_TOKENS = 200      # Tokens expanded for a prefix query
+    SCORE_CUTOFF = 60
+
+    def __init__(self, entries, postings):
+        self.entries = entries
+        (self._gram_keys, self._gram_offsets, self._gram_postings,
+         self._tokens, self._token_offsets, self._token_postings) = postings
+
+    @classmethod
+    def from_persons(cls, persons):
+        """Build the whole index in memory from person dicts ({"names", "affiliations"})."""
+        entries = MemoryEntries(persons)
+        return cls(entries, build_postings(entries.normalized))
+
+    @classmethod
+    def from_file(cls, path):
+        """Map the index precomputed next to persons.jsonl, or build it from the file."""
+        mapped = load_mapped(os.path.dirname(path))
+        if mapped is not None:
+            return cls(*mapped)
+        with open(path, encoding="utf-8") as f:
+            return cls.from_persons(json.loads(line) for line in f if line.strip())
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _query_trigrams(self, query):
+        """Posting arrays of the query's trigrams, and whether every trigram was found."""
+        codes = np.array(sorted(trigram_code(g) for g in trigrams(query)), dtype=np.uint64)
+        found = np.searchsorted(self._gram_keys, codes)
+        hit = found < len(self._gram_keys)
+        hit[hit] = self._gram_keys[found[hit]] == codes[hit]
+        grams = [self._gram_postings[self._gram_offsets[i]:self._gram_offsets[i + 1]] for i in found[hit]]
+        return grams, len(grams) == len(codes)
+
+    def _exact_ids(self, query, grams, complete):
+        if not complete or not grams:
+            return []
+        # Postings are sorted: look the rarest one's ids up in the others by binary search
+        grams = sorted(grams, key=len)
+        ids = grams[0]
+        for postings in grams[1:]:
+            found = np.minimum(np.searchsorted(postings, ids), len(postings) - 1)
+            ids = ids[postings[found] == ids]
+            if not len(ids):
+                return []
+        return [int(i) for i in ids if self.entries.is_normalized(int(i), query)]
+
+    def _trigram_candidates(self, grams):
+        if not grams:
+            return np.empty(0, dtype=np.uint32)
+        grams = sorted(grams, key=len)[:self.MAX_QUERY_TRIGRAMS]
+
+        ids, counts = np.unique(np.concatenate(grams), return_counts=True)
+        min_shared = max(1, int(len(grams) * 0.3))
+        ids, counts = ids[counts >= min_shared], counts[counts >= min_shared]
+        if len(ids) > self.MAX_CANDIDATES:
+            top = np.argpartition(-counts, self.MAX_CANDIDATES)[:self.MAX_CANDIDATES]
+            ids = ids[top]
+        return ids
+
+    def _prefix_candidates(self, query):
+        """Entries having a token that starts with the last query token."""
+        tokens = query.split()
+        if not tokens:
+            return np.empty(0, dtype=np.uint32)
+        prefix = tokens[-1]
+        start = bisect.bisect_left(self._tokens, prefix)
+        matched, total = [], 0
+        for i in range(start, min(start + self.MAX_PREFIX_TOKENS, len(self._tokens))):
+            if not self._tokens[i].startswith(prefix) or total >= self.MAX_CANDIDATES:
+                break
+            matched.append(self._token_postings[self._token_offsets[i]:self._token_offsets[i + 1]])
+            total += len(matched[-1])
+        if not matched:
+            return np.empty(0, dtype=np.uint32)
+        return np.concatenate(matched)[:self.MAX_CANDIDATES]
+
+    def _result(self, i, score, match):
+        return {"name": self.entries.name(i), "affiliations": self.entries.affiliations(i),
+                "score": score, "match": match}
+
+    def search(self, query, limit=5, offset=0):
+        """
+        Return ranked matches as dicts with name, affiliations, score and match type
+        ("exact", "prefix" or "fuzzy"). Exact matches always rank first.
+        """
+        query = normalize_name(query)
+        if not query:
+            return []
+
+        grams, complete = self._query_trigrams(query)
+        exact_ids = self._exact_ids(query, grams, complete)
+        prefix_ids = set(self._prefix_candidates(query).tolist())
+        candidate_ids = set(self._trigram_candidates(grams).tolist()) | prefix_ids
+        candidate_ids.difference_update(exact_ids)
+
+        results = [self._result(i, 100.0, "exact") for i in exact_ids[:offset + limit]]
+
+        wanted = offset + limit - len(results)
+        if wanted <= 0:
+            return results[offset:offset + limit]
+
+        candidate_ids = list(candidate_ids)
+        choices = [self.entries.normalized_name(i) for i in candidate_ids]
+        scored = process.extract(query, choices, scorer=fuzz.WRatio,
+                                 score_cutoff=self.SCORE_CUTOFF, limit=wanted)
+        for _, score, pos in scored:
+            i = candidate_ids[pos]
+            results.append(self._result(i, round(score, 1), "prefix" if i in prefix_ids else "fuzzy"))
+
+        return results[offset:offset + limit]
+
+
+class NameSearchIndexLoader:
+    """
+    Keeps the current NameSearchIndex and rebuilds it in the background whenever the
+    persons file written by the DBLP ingest changes. Requests keep using the previous
+    index (or the BaseX fallback on first load) until the new one is ready.
+    """
+
+    RELOAD_CHECK_INTERVAL = 60  # Seconds between mtime checks
+
+    def __init__(self, path):
+        self.path = path
+        self.index = None
+        self._loaded_mtime = None
+        self._last_check = float("-inf")
+        self._loading = False
+        self._lock = threading.Lock()
+
+    def _mtime(self):
+        try:
+            return os.stat(self.path).st_mtime
+        except FileNotFoundError:
+            return None
+
+    def _load(self, mtime):
+        try:
+            start = time.perf_counter()
+            index = NameSearchIndex.from_file(self.path)
+            self.index, self._loaded_mtime = index, mtime
+            logger.info(f"Loaded name search index with {len(index)} names "
+                        f"in {time.perf_counter() - start:.1f}s")
+        except Exception as e:
+            logger.error(f"Failed to load name search index from {self.path}: {e}")
+        finally:
+            self._loading = False
+
+    def get(self):
+        now = time.monotonic()
+        if now - self._last_check >= self.RELOAD_CHECK_INTERVAL:
+            with self._lock:
+                if not self._loading and now - self._last_check >= self.RELOAD_CHECK_INTERVAL:
+                    self._last_check = now
+                    mtime = self._mtime()
+                    if mtime is not None and mtime != self._loaded_mtime:
+                        self._loading = True
+                        threading.Thread(target=self._load, args=(mtime,), daemon=True).start()
+        return self.index
+
+    def reload(self):
+        """Rebuild the index synchronously, e.g. right after a new DBLP dump was ingested."""
+        with self._lock:
+            self._loading = True
+        self._load(self._mtime())
+        return self.index
+
+
+_loader = None
+_loader_lock = threading.Lock()
+
+
+def get_name_search_index():
+    """
+    Return the current name search index, or None while it is missing or still
+    loading; callers fall back to the BaseX full-text search then.
+    """
+    global _loader
+    if _loader is None:
+        with _loader_lock:
+            if _loader is None:
+                _loader = NameSearchIndexLoader(os.path.join(settings.DBLP_AUTHOR_INDEX_DIR, PERSONS_FILE))
+    return _loader.get()
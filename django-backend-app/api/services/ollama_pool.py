@@ -0,0 +1,181 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+
+from utils.rate_limit import AsyncTokenBucket
+
+logger = logging.getLogger(__name__)
+
+
+class OllamaUnavailable(Exception):
+    """No Ollama backend can take a request right now (all circuits are open)."""
+
+
+class OllamaRejected(Exception):
+    """
+    The backend answered but rejected the request (a 4xx response). Raised inside a
+    lease, it releases the backend without counting a failure or a latency sample.
+    """
+
+
+class OllamaBackend:
+    """One Ollama server and what the pool knows about it. Guarded by the pool's lock."""
+
+    def __init__(self, url):
+        self.url = url.rstrip("/")
+        self.in_flight = 0
+        self.latency = None         # EWMA of successful request durations, in seconds
+        self.ttft = None            # EWMA of time to first streamed token, in seconds
+        self.failures = 0           # Consecutive failures
+        self.open_until = 0.0       # Circuit is open (backend ejected) until this monotonic time
+        self.probing = False        # A half-open probe request is in flight
+        self.requests = 0
+        self.errors = 0
+
+    def available(self, now):
+        if self.open_until == 0.0:
+            return True
+        # Half-open after the cooldown: one probe request decides whether it comes back
+        return now >= self.open_until and not self.probing
+
+
+class OllamaPool:
+    """
+    Dispatches LLM requests to the least-loaded healthy Ollama backend.
+
+    A backend's expected wait is (in-flight requests + 1) x its latency EWMA, so slower
+    instances get proportionally less work. `failure_threshold` consecutive failures open
+    its circuit for `cooldown` seconds; after that a single probe request is let through,
+    and its outcome closes the circuit again or re-opens it.
+
+    An optional `rate_limiter` (a token bucket) paces requests across all backends.
+    """
+
+    def __init__(self, urls, failure_threshold=3, cooldown=30.0, ewma_alpha=0.3, parallel=1, rate_limiter=None):
+        if not urls:
+            raise ValueError("At least one Ollama URL is required")
+        self.backends = [OllamaBackend(url) for url in urls]
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.ewma_alpha = ewma_alpha
+        self.parallel = parallel  # Requests each backend runs at once (its OLLAMA_NUM_PARALLEL)
+        self.rate_limiter = rate_limiter
+        self._lock = threading.Lock()
+
+    def capacity(self):
+        """Requests worth running concurrently against the backends that are currently up."""
+        now = time.monotonic()
+        with self._lock:
+            healthy = sum(1 for backend in self.backends if backend.available(now))
+        return max(1, healthy) * self.parallel
+
+    def _acquire(self, exclude):
+        now = time.monotonic()
+        with self._lock:
+            candidates = [b for b in self.backends if b not in exclude and b.available(now)]
+            if not candidates:
+                raise OllamaUnavailable("No healthy Ollama backend available")
+
+            # Backends without a measurement yet are assumed to be as fast as the average one
+            known = [b.latency for b in self.backends if b.latency is not None]
+            default_latency = sum(known) / len(known) if known else 1.0
+
+            def expected_wait(backend):
+                latency = backend.latency if backend.latency is not None else default_latency
+                return ((backend.in_flight + 1) * latency, backend.in_flight)
+
+            backend = min(candidates, key=expected_wait)
+            probe = backend.open_until != 0.0
+            backend.probing = backend.probing or probe
+            backend.in_flight += 1
+            backend.requests += 1
+            return backend, probe
+
+    def _release(self, backend, probe, ok, elapsed=None):
+        """Return a leased backend; `ok` is None when the outcome says nothing about its health."""
+        with self._lock:
+            backend.in_flight -= 1
+            if probe:
+                backend.probing = False
+            if ok is None:
+                return
+            if ok:
+                backend.failures = 0
+                backend.open_until = 0.0
+                backend.latency = elapsed if backend.latency is None else (
+                    self.ewma_alpha * elapsed + (1 - self.ewma_alpha) * backend.latency
+                )
+                return
+
+            backend.errors += 1
+            backend.failures += 1
+            if backend.failures >= self.failure_threshold:
+                backend.open_until = time.monotonic() + self.cooldown
+                logger.warning(f"Ollama backend {backend.url} failed {backend.failures} times in a row; "
+                               f"ejecting it for {self.cooldown:.0f}s")
+
+    def record_ttft(self, backend, seconds):
+        """Record how long `backend` took to stream its first token."""
+        with self._lock:
+            backend.ttft = seconds if backend.ttft is None else (
+                self.ewma_alpha * seconds + (1 - self.ewma_alpha) * backend.ttft
+            )
+
+    @contextmanager
+    def lease(self, exclude=()):
+        """
+        Yield the backend to send one request to. Raising inside the block counts as a
+        failure of that backend, except for OllamaRejected; pass backends that already
+        failed this request in `exclude`.
+        """
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire_sync()
+        backend, probe = self._acquire(exclude)
+        start = time.perf_counter()
+        try:
+            yield backend
+        except OllamaRejected:
+            self._release(backend, probe, ok=None)
+            raise
+        except Exception:
+            self._release(backend, probe, ok=False)
+            raise
+        self._release(backend, probe, ok=True, elapsed=time.perf_counter() - start)
+
+    def stats(self):
+        now = time.monotonic()
+        with self._lock:
+            return [{
+                "url": backend.url,
+                "circuit": "closed" if backend.open_until == 0.0 else (
+                    "half-open" if now >= backend.open_until else "open"),
+                "in_flight": backend.in_flight,
+                "latency_ms": round(backend.latency * 1000) if backend.latency is not None else None,
+                "ttft_ms": round(backend.ttft * 1000) if backend.ttft is not None else None,
+                "requests": backend.requests,
+                "errors": backend.errors,
+            } for backend in self.backends]
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_ollama_pool():
+    """Process-wide pool of the backends listed in the OLLAMA_* settings."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = OllamaPool(
+                    settings.OLLAMA_URLS,
+                    failure_threshold=settings.OLLAMA_FAILURE_THRESHOLD,
+                    cooldown=settings.OLLAMA_COOLDOWN,
+                    parallel=settings.OLLAMA_PARALLEL,
+                    rate_limiter=AsyncTokenBucket(settings.OLLAMA_RATE, burst=settings.OLLAMA_BURST)
+                    if settings.OLLAMA_RATE > 0 else None,
+                )
+    return _pool
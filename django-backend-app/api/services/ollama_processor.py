@@ -1,85 +1,184 @@
 import requests
-import re
 import json
 import time
 from concurrent.futures import ThreadPoolExecutor
-from itertools import cycle
-from threading import Lock
 
-# List of available Ollama instances (add more if needed)
-OLLAMA_PORTS = [11434, 11435]
-OLLAMA_PORT_CYCLE = cycle(OLLAMA_PORTS)  # Infinite cycle for round-robin
-CYCLE_LOCK = Lock()  # Thread-safe lock for round-robin
+from django.conf import settings
+
+from utils.http_client import sync_session
+
+from .ollama_pool import OllamaRejected, OllamaUnavailable, get_ollama_pool
+from .topic_batching import get_topic_batcher
 
 
 class OllamaTextProcessor:
-    def __init__(self, model="mistral", batch_size=3, max_tokens=128, temperature=0.7):
-        self.model = model
-        self.batch_size = batch_size
+    def __init__(self, model=None, batch_size=None, max_tokens=128, temperature=0.7):
+        self.model = model or settings.OLLAMA_MODEL
+        self.batch_size = batch_size  # Cap on papers per topic prompt; None leaves it to the batcher
         self.max_tokens = max_tokens
         self.temperature = temperature
 
-    # ---------------- Round-Robin Instance Selection -------------------
-    def get_next_port(self):
-        with CYCLE_LOCK:
-            return next(OLLAMA_PORT_CYCLE)
+    def context_window(self):
+        """
+        Context size (num_ctx) sent with every request for this model. Ollama reloads a
+        model whose num_ctx changes, so preloads, topic and description calls all use
+        the one the topic batcher budgets for.
+        """
+        return get_topic_batcher(self.model).context_window
 
     # ---------------- Model Pull Handling -------------------
-    def pull_model_on_port(self, port):
-        url = f"http://localhost:{port}/api/pull"
-        response = requests.post(url, json={"name": self.model})
+    def pull_model(self, base_url):
+        url = f"{base_url}/api/pull"
+        response = sync_session("ollama").post(url, json={"name": self.model})
         if response.status_code == 200:
-            print(f"[INFO] Successfully pulled model '{self.model}' on port {port}")
+            print(f"[INFO] Successfully pulled model '{self.model}' on {base_url}")
         else:
-            print(f"[ERROR] Failed to pull model on port {port}: {response.text}")
+            print(f"[ERROR] Failed to pull model on {base_url}: {response.text}")
 
-    # ---------------- Request Sending with Retry -------------------
-    def send_request_to_ollama(self, prompt):
-        port = self.get_next_port()
-        url = f"http://localhost:{port}/api/generate"
-        print(f"[INFO] Sending request to Ollama on port {port}")
+    def preload(self):
+        """Load the model into memory on every backend so the first real request does not wait for it."""
+        session = sync_session("ollama")
+        loaded = []
+        for backend in get_ollama_pool().backends:
+            url = f"{backend.url}/api/generate"
+            payload = {  # No prompt: load only, with the context size generate calls will ask for
+                "model": self.model,
+                "options": {"num_ctx": self.context_window()},
+                "keep_alive": settings.OLLAMA_KEEP_ALIVE,
+            }
+            try:
+                response = session.post(url, json=payload)
+                if response.status_code == 404 or (response.status_code == 400 and 'model' in response.text.lower()):
+                    self.pull_model(backend.url)
+                    response = session.post(url, json=payload)
+            except requests.RequestException as e:
+                print(f"[WARNING] Could not preload '{self.model}' on {backend.url}: {e}")
+                continue
+            if response.status_code == 200:
+                print(f"[INFO] Loaded model '{self.model}' on {backend.url}")
+                loaded.append(backend.url)
+            else:
+                print(f"[WARNING] Could not preload '{self.model}' on {backend.url}: {response.status_code}")
+        return loaded
 
-        time.sleep(1)
+    # ---------------- Request Sending with Failover -------------------
+    def _read_stream(self, response, backend, started, on_token):
+        """Collect a streamed /api/generate response, passing each chunk to `on_token`."""
+        chunks = []
+        with response:
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                data = json.loads(line)
+                if data.get("error"):
+                    raise requests.RequestException(data["error"])
+                token = data.get("response", "")
+                if token:
+                    if not chunks:
+                        ttft = time.perf_counter() - started
+                        get_ollama_pool().record_ttft(backend, ttft)
+                        print(f"[INFO] First token from {backend.url} after {ttft * 1000:.0f} ms")
+                    chunks.append(token)
+                    if on_token is not None:
+                        on_token(token)
+                if data.get("done"):
+                    break
+        return "".join(chunks)
 
-        response = requests.post(url, json={
+    def send_request_to_ollama(self, prompt, on_token=None, options=None, output_format=None):
+        """
+        Generate a completion for `prompt`. The response is streamed: `on_token`, if given,
+        is called with each chunk of text as it arrives. `options` are extra Ollama model
+        options (e.g. num_predict); `output_format` ("json" or a JSON schema) constrains
+        the output. Returns the full text, or None.
+        """
+        payload = {
             "model": self.model,
             "prompt": prompt,
             "options": {
                 "max_tokens": self.max_tokens,
-                "temperature": self.temperature
+                "temperature": self.temperature,
+                "num_ctx": self.context_window(),
+                **(options or {})
             },
-            "stream": False
-        })
-
-        # Handle "model not found"
-        if response.status_code == 400 and 'model' in response.text.lower():
-            print(f"[WARNING] Model not found on port {port}. Pulling model...")
-            self.pull_model_on_port(port)
-            # Retry after pulling model
-            response = requests.post(url, json={
-                "model": self.model,
-                "prompt": prompt,
-                "options": {
-                    "max_tokens": self.max_tokens,
-                    "temperature": self.temperature
-                },
-                "stream": False
-            })
+            "stream": True,
+            "keep_alive": settings.OLLAMA_KEEP_ALIVE
+        }
+        if output_format is not None:
+            payload["format"] = output_format
+        session = sync_session("ollama")
+        pool = get_ollama_pool()
+        failed = []
+        emitted = []
 
-        if response.status_code != 200:
-            print(f"[ERROR] API call failed on port {port}: {response.status_code} {response.text}")
-            return None
+        def forward(token):
+            emitted.append(token)
+            on_token(token)
 
-        return response.json().get("response", "")
+        # A backend that errors is reported to the pool and the request moves on to another
+        # one, unless part of the answer has already been passed on to the caller
+        for _ in range(min(2, len(pool.backends))):
+            try:
+                with pool.lease(exclude=failed) as backend:
+                    url = f"{backend.url}/api/generate"
+                    print(f"[INFO] Sending request to Ollama at {backend.url}")
+
+                    started = time.perf_counter()
+                    response = session.post(url, json=payload, stream=True)
+
+                    # Handle "model not found"
+                    if response.status_code in (400, 404) and 'model' in response.text.lower():
+                        print(f"[WARNING] Model not found on {backend.url}. Pulling model...")
+                        self.pull_model(backend.url)
+                        # Retry after pulling model
+                        started = time.perf_counter()
+                        response = session.post(url, json=payload, stream=True)
+
+                    # Raised inside the lease: a rejected request (bad model or options) leaves the
+                    # backend's health alone, server errors count as its failure
+                    if 400 <= response.status_code < 500:
+                        raise OllamaRejected(f"{response.status_code} {response.text}")
+                    if response.status_code != 200:
+                        raise requests.HTTPError(f"{response.status_code} {response.text}", response=response)
+
+                    return self._read_stream(response, backend, started, forward if on_token else None)
+            except OllamaUnavailable as e:
+                print(f"[ERROR] {e}")
+                return None
+            except OllamaRejected as e:
+                # A rejected request would fail on any backend as well
+                print(f"[ERROR] Request rejected by {backend.url}: {e}")
+                return None
+            except (requests.RequestException, ValueError) as e:
+                print(f"[ERROR] API call failed on {backend.url}: {e}")
+                if emitted:
+                    return None
+                failed.append(backend)
+        return None
 
     # ---------------- Prompt Builders -------------------
+    @staticmethod
+    def local_ids(batch):
+        """Short IDs the prompt and the answer use for the papers of a batch, in batch order."""
+        return [f"P{i}" for i in range(1, len(batch) + 1)]
+
     def build_topic_prompt(self, batch):
         prompt = "Given the following research papers, generate 2-3 key research topics for each paper.\n\n"
-        prompt += "Respond ONLY in this exact JSON format:\n{\n  \"DOI\": [\"topic1\", \"topic2\"],\n  \"DOI\": [\"topic1\", \"topic2\", \"DOI\"]\n}\n\n"
-        for paper in batch:
-            prompt += f"DOI: {paper['id']}\nTitle: {paper['title']}\nAbstract: {paper['abstract']}\n\n"
+        prompt += "Respond ONLY with a JSON object mapping each paper ID to its topics, e.g.\n{\n  \"P1\": [\"topic1\", \"topic2\"],\n  \"P2\": [\"topic1\", \"topic2\", \"topic3\"]\n}\n\n"
+        for local_id, paper in zip(self.local_ids(batch), batch):
+            prompt += f"Paper {local_id}\nTitle: {paper['title']}\nAbstract: {paper['abstract']}\n\n"
         return prompt
 
+    @staticmethod
+    def topic_schema(local_ids):
+        """JSON schema of a topic answer, passed to Ollama as `format` to constrain its output."""
+        topics = {"type": "array", "items": {"type": "string"}, "minItems": 1, "maxItems": 3}
+        return {
+            "type": "object",
+            "properties": {local_id: topics for local_id in local_ids},
+            "required": list(local_ids),
+        }
+
     def build_description_prompt(self, researcher):
         paper_titles = ", ".join(paper["title"] for paper in researcher["papers"])
 
@@ -91,31 +190,42 @@ class OllamaTextProcessor:
 
     # ---------------- Response Parsing -------------------
     def parse_topic_response(self, response_text, batch):
-        batch_results = {}
+        """
+        Map the model's answer back to paper IDs, keeping only entries that match the
+        topic schema (a list of 1-3 non-empty strings). Papers without a valid entry
+        are left out, so callers can retry just those.
+        """
         try:
             parsed = json.loads(response_text)
-            for paper in batch:
-                batch_results[paper['id']] = parsed.get(paper['id'], [])
         except json.JSONDecodeError:
-            print("[WARNING] Failed to parse JSON, falling back to regex parsing...")
-            for paper in batch:
-                pattern = rf'{paper["id"]}:\s*\[(.*?)\]'
-                match = re.search(pattern, response_text, re.DOTALL)
-                if match:
-                    topics = [t.strip().strip('"') for t in match.group(1).split(",") if t.strip()]
-                    batch_results[paper['id']] = topics
-                else:
-                    print(f"[WARNING] No topics found for paper {paper['id']}")
-                    batch_results[paper['id']] = []
+            print("[WARNING] Model response is not valid JSON")
+            return {}
+        if not isinstance(parsed, dict):
+            print("[WARNING] Model response is not a JSON object")
+            return {}
+
+        batch_results = {}
+        for local_id, paper in zip(self.local_ids(batch), batch):
+            topics = parsed.get(local_id)
+            if not isinstance(topics, list):
+                continue
+            topics = [t.strip() for t in topics if isinstance(t, str) and t.strip()][:3]
+            if topics:
+                batch_results[paper['id']] = topics
+        missing = len(batch) - len(batch_results)
+        if missing:
+            print(f"[WARNING] No valid topics for {missing} of {len(batch)} papers")
         return batch_results
 
     # ---------------- Batch Processor -------------------
-    def process_batch(self, batch, task="topics"):
+    def process_batch(self, batch, task="topics", on_token=None, options=None):
+        output_format = None
         if task == "topics":
             prompt = self.build_topic_prompt(batch)
+            output_format = self.topic_schema(self.local_ids(batch))
         else:
             prompt = self.build_description_prompt(batch[0])  # Only one researcher per batch
-        result = self.send_request_to_ollama(prompt)
+        result = self.send_request_to_ollama(prompt, on_token=on_token, options=options, output_format=output_format)
         print("Result", result)
         if not result:
             print("[ERROR] Empty response from model")
@@ -123,26 +233,53 @@ class OllamaTextProcessor:
         return self.parse_topic_response(result, batch) if task == "topics" else result
 
     # ---------------- Public Methods -------------------
-    def generate_topics(self, papers):
+    def generate_topics(self, papers, retries=1):
+        """
+        Return {paper id: topics}. Papers the model leaves out or answers invalidly are
+        re-batched and retried up to `retries` times; papers already answered are not
+        sent again.
+        """
         topics = {}
-        batches = [papers[i:i + self.batch_size] for i in range(0, len(papers), self.batch_size)]
-        print(f"[INFO] Created {len(batches)} batches from {len(papers)} papers.")
+        batcher = get_topic_batcher(self.model)
 
-        with ThreadPoolExecutor(max_workers=len(OLLAMA_PORTS)) as executor:
-            results = list(executor.map(self.process_batch, batches))
-        for batch_result in results:
-            topics.update(batch_result)
+        def run(batch):
+            # Allow enough output for this batch's JSON; the context size is the same for every call
+            result = self.process_batch(batch, options={"num_predict": batcher.num_predict(batch)})
+            batcher.record(len(batch), sum(1 for paper in batch if result.get(paper['id'])))
+            return result
+
+        pending = papers
+        for attempt in range(retries + 1):
+            batches = batcher.batches(pending, self.build_topic_prompt, cap=self.batch_size)
+            print(f"[INFO] Created {len(batches)} batches from {len(pending)} papers.")
+
+            # One request per free backend slot; the pool spreads them by load
+            with ThreadPoolExecutor(max_workers=get_ollama_pool().capacity()) as executor:
+                results = list(executor.map(run, batches))
+            for batch_result in results:
+                topics.update(batch_result)
+
+            pending = [paper for paper in pending if paper['id'] not in topics]
+            if not pending:
+                break
+            if attempt < retries:
+                print(f"[INFO] Retrying {len(pending)} papers without valid topics")
 
         return topics
 
-    def generate_description(self, researcher):
-        return self.process_batch([researcher], task="description")
+    def generate_description(self, researcher, on_token=None):
+        return self.process_batch([researcher], task="description", on_token=on_token)
+
+
+def preload_default_model():
+    """Warm-up hook for the "ollama_model" resource: load OLLAMA_MODEL on every backend."""
+    return OllamaTextProcessor().preload()
 
 
 # ---------------- Example Usage -------------------
 
 if __name__ == "__main__":
-    processor = OllamaTextProcessor(batch_size=3, max_tokens=130, temperature=0.6)
+    processor = OllamaTextProcessor(max_tokens=130, temperature=0.6)
 
     # Example papers for topic extraction
     papers = [
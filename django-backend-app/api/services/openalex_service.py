@@ -1,59 +1,178 @@
 # openalex_service.py
 
-import aiohttp
 import asyncio
 import logging
+import threading
+from urllib.parse import quote
+
+from django.conf import settings
+
+from utils.doi import normalize_doi
+from utils.http_client import UpstreamError, client_session, policy_for, retry_after_seconds
+from utils.rate_limit import AdaptiveRateLimiter
 
 logger = logging.getLogger(__name__)
 
+WORKS_URL = "https://api.openalex.org/works"
+SELECT_FIELDS = "id,doi,title,cited_by_count,abstract_inverted_index"
+BATCH_SIZE = 50    # DOIs per filter query; keeps request URLs short
+PER_PAGE = 200     # A batch fits in one page even when a DOI matches several works
+
+
+def reconstruct_abstract(inverted_index):
+    if not inverted_index:
+        return None
+    position_word = {pos: word for word, positions in inverted_index.items() for pos in positions}
+    return " ".join([position_word[pos] for pos in sorted(position_word.keys())])
+
+
 class OpenAlexFetcher:
+    """
+    Fetches citation counts and abstracts for DOIs with batched `filter=doi:a|b|...`
+    queries. Batches run concurrently (bounded by `concurrency`) and every request takes
+    a token from a shared AdaptiveRateLimiter, which slows down on 429s and honours
+    Retry-After. Only throttled batches are retried. A `mailto` address puts requests
+    in OpenAlex's polite pool, which has more reliable response times.
+    """
+
+    def __init__(self, rate_limiter, concurrency=4, mailto="", max_attempts=5):
+        self.rate_limiter = rate_limiter
+        self.concurrency = concurrency
+        self.mailto = mailto
+        self.max_attempts = max_attempts
+
+    def _params(self, **params):
+        if self.mailto:
+            params["mailto"] = self.mailto
+        return params
+
     @staticmethod
-    async def fetch_openalex_data(dois):
-        async def reconstruct_abstract(inverted_index):
-            if not inverted_index:
-                return None
-            position_word = {pos: word for word, positions in inverted_index.items() for pos in positions}
-            return " ".join([position_word[pos] for pos in sorted(position_word.keys())])
-
-        async def fetch_work(session, doi):
-            url = f"https://api.openalex.org/works/https://doi.org/{doi}?select=id,doi,title,cited_by_count,abstract_inverted_index"
-            
-            await asyncio.sleep(1)  # ⏱️ Wait 1 second before sending request
-
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    logger.info("Fetched pub with DOI: {url}")
-                    return {
-                        "doi": data.get("doi"),
-                        "cited_by_count": data.get("cited_by_count", 0),
-                        "abstract": await reconstruct_abstract(data.get("abstract_inverted_index"))
-                    }
-                elif response.status == 429:
-                    logger.warning(f"OpenAlex fetch rate-limited for DOI {doi}")
-                    return {"doi": doi, "error": 429}
-                else:
-                    logger.warning(f"OpenAlex fetch failed for DOI {doi}: {response.status}")
-                    return None
-
-
-        semaphore = asyncio.Semaphore(1)
-
-        async def bound_fetch(doi):
-            async with semaphore:
-                return await fetch_work(session, doi)
-
-        async with aiohttp.ClientSession() as session:
-            tasks = [bound_fetch(doi) for doi in dois]
-            results = await asyncio.gather(*tasks)
-
-        # If any result had a 429, return a signal to caller
-        if any(res.get("error") == 429 for res in results if res):
-            return {"error": 429}
-
-        # Otherwise return valid data
-        return {res['doi']: res for res in results if res and "doi" in res}
+    def _record(work):
+        return {
+            "doi": work.get("doi"),
+            "title": work.get("title"),
+            "cited_by_count": work.get("cited_by_count", 0),
+            "abstract": reconstruct_abstract(work.get("abstract_inverted_index")),
+        }
+
+    async def _fetch(self, client, dois, attempt=1):
+        """
+        Look up normalized DOIs: a filter query for a batch, or a single-work request for
+        a DOI that cannot go into a filter (it contains ',' or '|'). `attempt` counts the
+        tries of this batch and sets the pause after a 429 without Retry-After.
+        Returns ({normalized doi: record}, outcome) with outcome "ok", "throttled" or "failed".
+        """
+        if len(dois) == 1 and ("," in dois[0] or "|" in dois[0]):
+            url = f"{WORKS_URL}/https://doi.org/{quote(dois[0], safe='/')}"
+            params = self._params(select=SELECT_FIELDS)
+        else:
+            url = WORKS_URL
+            params = self._params(filter=f"doi:{'|'.join(dois)}", select=SELECT_FIELDS, **{"per-page": PER_PAGE})
+
+        await self.rate_limiter.acquire()
+        try:
+            response = await client.get(url, params=params)
+        except UpstreamError as e:
+            logger.warning(f"OpenAlex lookup of {len(dois)} DOIs failed: {e}")
+            return {}, "failed"
+
+        if response.status == 429:
+            policy = policy_for("openalex")
+            retry_after = retry_after_seconds(response.headers.get("Retry-After"), policy.max_backoff)
+            if retry_after is None:
+                # No hint from the server: back off exponentially with this batch's attempts
+                retry_after = min(policy.max_backoff, policy.backoff * (2 ** (attempt - 1)))
+            self.rate_limiter.on_throttle(retry_after)
+            return {}, "throttled"
+        if response.status == 404 and url != WORKS_URL:
+            self.rate_limiter.on_success()
+            return {}, "ok"  # Unknown DOI
+        if response.status != 200:
+            logger.warning(f"OpenAlex lookup of {len(dois)} DOIs failed: {response.status}")
+            return {}, "failed"
+        self.rate_limiter.on_success()
+
+        data = response.json() or {}
+        works = data.get("results", []) if url == WORKS_URL else [data]
+        records = {}
+        for work in works:
+            doi = normalize_doi(work.get("doi"))
+            if doi and doi not in records:
+                records[doi] = self._record(work)
+        return records, "ok"
+
+    async def fetch_works(self, dois, on_batch=None):
+        """
+        Fetch records for `dois`, keyed by the caller's DOI strings.
+
+        `on_batch`, an optional coroutine function, is awaited with each batch's records
+        as soon as they arrive, so callers can persist partial results. Returns
+        (records, missing, rate_limited): `missing` lists the DOIs that could not be
+        fetched (throttled `max_attempts` times or failed); DOIs OpenAlex does not know
+        are in neither.
+        """
+        wanted = {}
+        for doi in dois:
+            normalized = normalize_doi(doi)
+            if normalized:
+                wanted.setdefault(normalized, []).append(doi)
+
+        batchable = [doi for doi in wanted if "," not in doi and "|" not in doi]
+        queue = asyncio.Queue()
+        for start in range(0, len(batchable), BATCH_SIZE):
+            queue.put_nowait((batchable[start:start + BATCH_SIZE], 1))
+        for doi in wanted:
+            if "," in doi or "|" in doi:
+                queue.put_nowait(([doi], 1))
+
+        records, missing = {}, []
+        rate_limited = False
+
+        async def worker(client):
+            nonlocal rate_limited
+            while not queue.empty():
+                batch, attempt = queue.get_nowait()
+                found, outcome = await self._fetch(client, batch, attempt)
+                if outcome == "throttled" and attempt < self.max_attempts:
+                    queue.put_nowait((batch, attempt + 1))  # Only this batch is retried
+                    continue
+                if outcome != "ok":
+                    rate_limited = rate_limited or outcome == "throttled"
+                    missing.extend(doi for normalized in batch for doi in wanted[normalized])
+                    continue
+
+                batch_records = {doi: record for normalized, record in found.items()
+                                 for doi in wanted.get(normalized, [])}
+                records.update(batch_records)
+                if on_batch is not None and batch_records:
+                    await on_batch(batch_records)
+
+        async with client_session("openalex") as client:
+            await asyncio.gather(*(worker(client) for _ in range(min(self.concurrency, queue.qsize()))))
+
+        logger.info(f"OpenAlex returned {len(records)} of {len(dois)} requested DOIs "
+                    f"({len(missing)} could not be fetched)")
+        return records, missing, rate_limited
 
     @staticmethod
     def extract_dois(links):
         return [link.replace("https://doi.org/", "").strip() for link in links if "https://doi.org/" in link]
+
+
+_fetcher = None
+_fetcher_lock = threading.Lock()
+
+
+def get_openalex_fetcher():
+    """Process-wide fetcher configured from the OPENALEX_* settings."""
+    global _fetcher
+    if _fetcher is None:
+        with _fetcher_lock:
+            if _fetcher is None:
+                _fetcher = OpenAlexFetcher(
+                    AdaptiveRateLimiter(settings.OPENALEX_RATE, burst=settings.OPENALEX_BURST,
+                                        min_rate=settings.OPENALEX_MIN_RATE, name="OpenAlex"),
+                    concurrency=settings.OPENALEX_CONCURRENCY,
+                    mailto=settings.OPENALEX_MAILTO,
+                )
+    return _fetcher
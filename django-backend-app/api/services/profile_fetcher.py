@@ -1,48 +1,45 @@
+import json
 import urllib.parse
-import xml.etree.ElementTree as ET
 from collections import defaultdict
-from utils.CORE import fuzzy_match
-import pandas as pd
-from django.conf import settings
-from ..models import Author, Publication, CoAuthor
+from utils.registry import registry
+from ..models import Author
 import logging
-from BaseXClient import BaseXClient
+from .author_index import get_author_index, normalize_author_name
+from .basex_pool import get_basex_pool
+from .dblp_queries import execute_query
+from .publication_store import PublicationStore
+from .venue_ranks import get_venue_rank_table
 
 logger = logging.getLogger(__name__)
 
-# Load CORE data
-core_data = pd.read_csv(
-    settings.BASE_DIR / 'data' / 'CORE.csv',
-    names=["id", "name", "abbreviation", "source", "rank", "6", "7", "8", "9"]
-)[['name', 'abbreviation', 'rank']]
-
-
 class ProfileFetcher:
     def __init__(self, author_name):
         self.author_name = author_name.strip()
-        self.core_data = core_data
-        self.publications_xml = []
+        self.core_ranks = {}
+        self.records = []
+        self.affiliations = []
+        self.coauthor_counts = {}
 
     def fetch_profile(self):
         author = Author.objects(name=self.author_name).first()
 
         # CASE 1: Already cached with publications
-        if author and author.publications:
+        if author and author.publication_keys:
             logger.info(f"Author '{author.name}' found in MongoDB with cached publications.")
             return self._author_to_dict(author)
 
         logger.info(f"Fetching BaseX for author '{self.author_name}'")
 
-        # Fetch from BaseX
-        self.fetch_data_from_basex()
-        affiliations = self._get_author_affiliations(self.author_name)
+        # Fetch from the precomputed index, or BaseX if the index does not know the author
+        self.fetch_data()
+        affiliations = self.affiliations
         publications, coauthors_dict = self.parse_publications()
 
         # CASE 2: Exists but missing publications -> update
-        if author and not author.publications:
+        if author and not author.publication_keys:
             logger.info(f"Updating existing author '{self.author_name}' with new publications.")
             author.affiliations = affiliations
-            author.publications = self._build_publications_for_db(publications)
+            author.publication_keys = self._store_publications(publications)
             author.save()
             return self._author_to_dict(author)
 
@@ -53,83 +50,85 @@ class ProfileFetcher:
                 name=self.author_name,
                 affiliations=affiliations,
                 description="",  # Placeholder
-                publications=self._build_publications_for_db(publications)
+                publication_keys=self._store_publications(publications)
             )
             author_doc.save()
 
         # Return compiled result
         return self.compile_results(self.author_name, affiliations, publications, coauthors_dict)
 
-    def _build_publications_for_db(self, publications):
-        """Convert parsed dict to Publication objects for DB."""
-        publication_docs = []
-        for pub in publications:
-            pub_doc = Publication(
-                title=pub["title"],
-                abstract=pub["abstract"],
-                core_rank=pub["core_rank"],
-                citations=pub["citations"],
-                coauthors=[CoAuthor(name=a["name"]) for a in pub["coauthors"] if a["name"] != self.author_name],
-                links=pub["links"],
-                year=pub['year'],
-                venue=pub["venue"],
-                topics=pub.get("topics", []),
-                is_preprint=pub["is_preprint"]
-            )
-            publication_docs.append(pub_doc)
-        return publication_docs
+    def _store_publications(self, publications):
+        """Store parsed publications in the shared publications collection and return their keys."""
+        return PublicationStore.save_many(publications)
+
+    def fetch_data(self):
+        """Load the author's DBLP records from the author index, falling back to BaseX."""
+        index = get_author_index()
+        records = index.records_for(self.author_name) if index else None
+        if records is None:
+            self.fetch_data_from_basex()
+            return
+
+        own_name = normalize_author_name(self.author_name)
+        self.records = records
+        self.affiliations = list(dict.fromkeys(
+            aff for record in records for aff in record.get("affiliations", [])
+        ))
+        self.coauthor_counts = defaultdict(int)
+        for record in records:
+            if not record.get("year") or record.get("title", "").lower() == "home page":
+                continue
+            for name in record.get("authors", []):
+                if normalize_author_name(name) != own_name:
+                    self.coauthor_counts[name] += 1
 
     def fetch_data_from_basex(self):
-        session = BaseXClient.Session('localhost', 1984, 'admin', 'admin')
-        try:
-            session.execute("OPEN dblp")
-            query_text = f"""
-            let $author_name := '{self.author_name}'
-            for $pub in //(article|inproceedings|book|incollection|phdthesis|mastersthesis|proceedings|www|data)
-            where $pub/author = $author_name
-            return $pub
-            """
-            query = session.query(query_text)
-            for _, item in query.iter():
-                self.publications_xml.append(item)
-            query.close()
-        finally:
-            session.close()
+        """Fetch the author's records, affiliations and coauthor counts in a single query."""
+        with get_basex_pool().session() as session:
+            result = execute_query(session, "author_profile", author_name=self.author_name)
 
-    def parse_publications(self):
-        publications, coauthors_dict = [], defaultdict(int)
+        profile = json.loads(result) if result else {}
+        self.records = profile.get("publications", [])
+        self.affiliations = profile.get("affiliations", [])
+        self.coauthor_counts = profile.get("coauthors", {})
 
-        for pub_xml in self.publications_xml:
-            elem = ET.fromstring(pub_xml)
-            pub_data = self._parse_single_publication(elem, coauthors_dict)
+    def parse_publications(self):
+        publications = []
+        coauthors_dict = defaultdict(int, self.coauthor_counts)
+
+        # Look venues up in the precomputed table; rank the rest in one batch
+        venues = {self._get_venue(record) for record in self.records}
+        table = get_venue_rank_table()
+        self.core_ranks = table.lookup(venues) if table else {}
+        ranker = registry.get("venue_ranker")
+        self.core_ranks.update(ranker.rank_many(v for v in venues if v not in self.core_ranks))
+
+        for record in self.records:
+            pub_data = self._parse_single_publication(record)
             if pub_data:
                 publications.append(pub_data)
 
         return publications, coauthors_dict
 
-    def _parse_single_publication(self, publ_info, coauthors_dict):
-        title = publ_info.findtext("title", "").strip()
-        year = int(publ_info.findtext("year", "0") or 0)
+    def _parse_single_publication(self, record):
+        title = record.get("title", "").strip()
+        year = int(record.get("year") or 0)
         if title.lower() == "home page" or year == 0:
             logger.info(f"Skipping invalid publication: '{title}' with year: {year}")
             return None  # Skip this entry
         
-        venue = self._get_venue(publ_info)
-        core_rank = fuzzy_match(self.core_data, venue, 'name', 'abbreviation') or "Unknown"
-        is_preprint = publ_info.attrib.get("publtype") == "informal"
-
-        # Coauthors and authors
-        authors = []
-        for author in publ_info.findall("author"):
-            author_name = author.text.strip()
-            authors.append({"name": author_name})
-            if author_name != self.author_name:
-                coauthors_dict[author_name] += 1
+        venue = self._get_venue(record)
+        core_rank = self.core_ranks.get(venue) or "Unknown"
+        is_preprint = record.get("publtype") == "informal"
+
+        # Authors (coauthor counts come precomputed from the query)
+        authors = [{"name": name.strip()} for name in record.get("authors", [])]
 
         # Links
-        links = [ee.text.strip() for ee in publ_info.findall("ee")]
+        links = [ee.strip() for ee in record.get("ee", [])]
 
         return {
+            "key": record.get("key", ""),
             "title": title,
             "year": year,
             "venue": venue,
@@ -160,47 +159,25 @@ class ProfileFetcher:
             "coauthors": coauthors_list
         }
 
-    def _get_venue(self, publ_info):
-        if publ_info.tag == "inproceedings":
-            return publ_info.findtext("booktitle", "Unknown Conference")
-        elif publ_info.tag == "article":
-            return publ_info.findtext("journal", "Unknown Journal")
-        elif publ_info.tag == "book":
-            return publ_info.findtext("booktitle") or publ_info.findtext("publisher", "Unknown Book")
-        elif publ_info.tag == "incollection":
-            return publ_info.findtext("booktitle", "Unknown Book/Collection")
-        elif publ_info.tag == "phdthesis":
+    @staticmethod
+    def _get_venue(record):
+        tag = record.get("tag")
+        if tag == "inproceedings":
+            return record.get("booktitle") or "Unknown Conference"
+        elif tag == "article":
+            return record.get("journal") or "Unknown Journal"
+        elif tag == "book":
+            return record.get("booktitle") or record.get("publisher") or "Unknown Book"
+        elif tag == "incollection":
+            return record.get("booktitle") or "Unknown Book/Collection"
+        elif tag == "phdthesis":
             return "PhD Dissertation"
-        elif publ_info.tag == "mastersthesis":
+        elif tag == "mastersthesis":
             return "Master's Dissertation"
-        elif publ_info.tag == "data":
-            return publ_info.findtext("publisher", "Unknown Dataset Publisher")
+        elif tag == "data":
+            return record.get("publisher") or "Unknown Dataset Publisher"
         return "Unknown"
 
-    def _get_author_affiliations(self, author_name):
-        session = BaseXClient.Session('localhost', 1984, 'admin', 'admin')
-        affiliations = []
-        try:
-            session.execute("OPEN dblp")
-            query_text = f"""
-            let $author_name := '{author_name}'
-            for $aff in distinct-values(
-            //(article|inproceedings|book|incollection|phdthesis|mastersthesis|proceedings|www|data)[author = $author_name]/note[@type='affiliation']/text()
-            )
-            return <affiliation>{{$aff}}</affiliation>
-            """
-            query = session.query(query_text)
-            for _, item in query.iter():
-                try:
-                    elem = ET.fromstring(item)
-                    affiliations.append(elem.text.strip())
-                except ET.ParseError as e:
-                    logger.warning(f"Parse error: {e} on item: {item}")
-            query.close()
-            return affiliations
-        finally:
-            session.close()
-
     def _author_to_dict(self, author):
         return {
             "name": author.name,
@@ -208,17 +185,17 @@ class ProfileFetcher:
             "description": author.description,
             "publications": [
                 {
-                    "title": pub.title,
-                    "abstract": pub.abstract,
-                    "venue": pub.venue,
-                    "core_rank": pub.core_rank,
-                    "citations": pub.citations,
-                    "coauthors": [co.name for co in pub.coauthors],
-                    "links": pub.links,
-                    "year": pub.year,
-                    "topics": pub.topics if pub.topics else [],
-                    "is_preprint": pub.is_preprint
+                    "title": pub["title"],
+                    "abstract": pub.get("abstract"),
+                    "venue": pub.get("venue"),
+                    "core_rank": pub.get("core_rank", "Unknown"),
+                    "citations": pub.get("citations", 0),
+                    "coauthors": [name for name in pub.get("authors", []) if name != author.name],
+                    "links": pub.get("links", []),
+                    "year": pub.get("year", 0),
+                    "topics": pub.get("topics") or [],
+                    "is_preprint": pub.get("is_preprint", False)
                 }
-                for pub in author.publications
+                for pub in PublicationStore.find_by_keys(author.publication_keys)
             ]
         }
@@ -0,0 +1,166 @@
+import datetime
+import logging
+from collections import defaultdict
+
+from pymongo import UpdateMany, UpdateOne
+
+from utils.doi import extract_dois, normalize_doi
+
+from ..models import Publication
+from .enrichment_cache import get_enrichment_cache
+
+logger = logging.getLogger(__name__)
+
+
+def publication_key(record_key, dois):
+    """
+    Key a publication is stored under: its DBLP record key, or its first DOI for
+    records that do not have one. Returns None if neither is available.
+    """
+    if record_key:
+        return record_key
+    if dois:
+        return f"doi:{dois[0]}"
+    return None
+
+
+class PublicationStore:
+    """
+    Bulk read/write access to the top-level `publications` collection, which holds
+    each paper once no matter how many authors reference it. Reads resolve many
+    keys or DOIs with one `$in` query; writes are sent in a single `bulk_write`.
+
+    DOIs may be passed bare ("10.1145/...") or as links ("https://doi.org/10.1145/...");
+    results are keyed by the value the caller passed in.
+    """
+
+    @staticmethod
+    def _normalize(dois):
+        """Map normalized DOI -> original caller value, dropping values that are not DOIs."""
+        normalized = {}
+        for doi in dois:
+            key = normalize_doi(doi)
+            if key:
+                normalized.setdefault(key, doi)
+        return normalized
+
+    @staticmethod
+    def save_many(publications):
+        """
+        Insert parsed publications (dicts as produced by ProfileFetcher) that are not
+        stored yet and return their keys in input order. Existing papers are left
+        untouched, so enrichment written for another author is kept; new papers start
+        with whatever the enrichment cache already holds for their DOIs.
+        """
+        now = datetime.datetime.utcnow()
+        pub_dois = [extract_dois(pub["links"]) for pub in publications]
+        cached = get_enrichment_cache().get_many({doi for dois in pub_dois for doi in dois})
+
+        keys, operations = [], []
+        for pub, dois in zip(publications, pub_dois):
+            enrichment = next((cached[doi] for doi in dois if cached.get(doi, {}).get("found")), {})
+            key = publication_key(pub.get("key"), dois)
+            if key is None:
+                logger.info(f"Skipping publication without DBLP key or DOI: '{pub['title']}'")
+                continue
+            keys.append(key)
+            operations.append(UpdateOne({"key": key}, {"$setOnInsert": {
+                "key": key,
+                "title": pub["title"],
+                "topics": pub.get("topics", []),
+                "abstract": pub["abstract"] or enrichment.get("abstract", ""),
+                "venue": pub["venue"],
+                "core_rank": pub["core_rank"],
+                "citations": pub["citations"] or enrichment.get("citations") or 0,
+                "authors": [a["name"] for a in pub["coauthors"]],
+                "links": pub["links"],
+                "dois": dois,
+                "year": pub["year"],
+                "is_preprint": pub["is_preprint"],
+                "created_at": now,
+                "updated_at": now,
+            }}, upsert=True))
+
+        if operations:
+            result = Publication._get_collection().bulk_write(operations, ordered=False)
+            logger.info(f"Stored {result.upserted_count} new of {len(operations)} publications.")
+        return list(dict.fromkeys(keys))
+
+    @staticmethod
+    def find_by_keys(keys):
+        """Return the stored publications for `keys` as plain dicts, in the order of `keys`."""
+        if not keys:
+            return []
+        by_key = {
+            pub["key"]: pub
+            for pub in Publication._get_collection().find({"key": {"$in": list(keys)}}, {"_id": 0})
+        }
+        return [by_key[key] for key in keys if key in by_key]
+
+    @staticmethod
+    def find_by_dois(dois):
+        """
+        Return {doi: [publication dict, ...]} for every publication carrying one of
+        the DOIs. Publications are plain dicts as stored in Mongo.
+        """
+        normalized = PublicationStore._normalize(dois)
+        if not normalized:
+            return {}
+
+        cursor = Publication._get_collection().find(
+            {"dois": {"$in": list(normalized)}},
+            {"title": 1, "abstract": 1, "topics": 1, "dois": 1}
+        )
+
+        matches = defaultdict(list)
+        for publication in cursor:
+            for doi in publication.get("dois", []):
+                if doi in normalized:
+                    matches[normalized[doi]].append(publication)
+        return matches
+
+    @staticmethod
+    def enrichment_operations(selector, fields, now):
+        """
+        Write operations applying {"abstract": ..., "citations": ..., "topics": ...}
+        to the publications matching `selector`. `citations` is always overwritten;
+        `abstract` and `topics` are only filled in when currently empty.
+        """
+        operations = []
+        if fields.get("citations") is not None:
+            operations.append(UpdateMany(
+                selector, {"$set": {"citations": fields["citations"], "updated_at": now}}
+            ))
+        if isinstance(fields.get("abstract"), str) and fields["abstract"]:
+            operations.append(UpdateMany(
+                {**selector, "abstract": {"$in": [None, ""]}},
+                {"$set": {"abstract": fields["abstract"], "updated_at": now}}
+            ))
+        if fields.get("topics"):
+            operations.append(UpdateMany(
+                {**selector, "topics": {"$in": [None, []]}},
+                {"$set": {"topics": fields["topics"], "updated_at": now}}
+            ))
+        return operations
+
+    @staticmethod
+    def bulk_update(updates):
+        """
+        Apply {doi: {"abstract": ..., "citations": ..., "topics": ...}} to every
+        publication carrying the DOI, in one bulk write.
+        Returns the number of publications modified.
+        """
+        now = datetime.datetime.utcnow()
+        operations = []
+        for doi, fields in updates.items():
+            normalized = normalize_doi(doi)
+            if fields and normalized:
+                operations.extend(PublicationStore.enrichment_operations({"dois": normalized}, fields, now))
+
+        if not operations:
+            return 0
+
+        result = Publication._get_collection().bulk_write(operations, ordered=False)
+        logger.info(f"Bulk-updated {result.modified_count} publications for {len(updates)} DOIs "
+                    f"in {len(operations)} operations.")
+        return result.modified_count
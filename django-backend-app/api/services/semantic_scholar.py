@@ -0,0 +1,150 @@
+import asyncio
+import hashlib
+import logging
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+
+from utils.http_client import client_session
+from utils.rate_limit import AsyncTokenBucket
+from utils.response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+BASE_URL = "https://api.semanticscholar.org/graph/v1"
+PAGE_SIZE = 500    # /author/{id}/papers allows up to 1000; abstracts make large pages slow
+BATCH_SIZE = 500   # Maximum number of IDs per /paper/batch call
+
+AUTHOR_PAPER_FIELDS = ("url", "title", "year", "authors", "abstract", "venue", "citationCount", "fieldsOfStudy")
+PAPER_FIELDS = ("url", "year", "authors", "abstract", "fieldsOfStudy", "venue")
+
+
+class SemanticScholarClient:
+    """
+    Semantic Scholar Graph API lookups, served through a ResponseCache. Upstream calls
+    (cache misses only) share one token bucket, so concurrent page and batch fetches
+    stay within the API's rate limit.
+    """
+
+    def __init__(self, cache, rate_limiter, concurrency=4, api_key=""):
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.concurrency = concurrency
+        self.headers = {"x-api-key": api_key} if api_key else {}
+
+    @staticmethod
+    def cache_key(kind, identifier, fields):
+        """Key on the object and the requested field set, independent of field order."""
+        raw = f"{kind}|{identifier}|{','.join(sorted(set(fields)))}"
+        return f"{kind}:{hashlib.sha256(raw.encode('utf-8')).hexdigest()}"
+
+    async def _get(self, key, url):
+        async def fetch():
+            await self.rate_limiter.acquire()
+            logger.info(f"Making request to Semantic Scholar API: {url}")
+            async with client_session("semantic_scholar") as client:
+                return await client.get_json(url, headers=self.headers)
+
+        return await self.cache.get_or_fetch(key, fetch)
+
+    async def author(self, author_id, fields=("paperCount",)):
+        url = f"{BASE_URL}/author/{author_id}?fields={','.join(fields)}"
+        return await self._get(self.cache_key("author", author_id, fields), url)
+
+    async def author_papers_page(self, author_id, offset, fields=AUTHOR_PAPER_FIELDS):
+        url = (f"{BASE_URL}/author/{author_id}/papers?"
+               f"fields={','.join(fields)}&offset={offset}&limit={PAGE_SIZE}")
+        key = self.cache_key("author_papers", f"{author_id}@{offset}+{PAGE_SIZE}", fields)
+        return await self._get(key, url)
+
+    async def iter_author_papers(self, author_id, fields=AUTHOR_PAPER_FIELDS):
+        """
+        Yield all of an author's papers, one page (list) at a time in completion order.
+
+        The first page and the author's paper count are requested together; the
+        remaining pages are then fetched concurrently. The paper count can lag behind
+        the paper list, so pages past it are followed through `next` afterwards.
+        """
+        first, author = await asyncio.gather(
+            self.author_papers_page(author_id, 0, fields),
+            self.author(author_id),
+        )
+        yield first.get("data", [])
+        if first.get("next") is None:
+            return
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch_page(offset):
+            async with semaphore:
+                return offset, await self.author_papers_page(author_id, offset, fields)
+
+        total = author.get("paperCount") or 0
+        tasks = [asyncio.ensure_future(fetch_page(offset)) for offset in range(PAGE_SIZE, total, PAGE_SIZE)]
+        last_offset, last_page = 0, first
+        try:
+            for next_page in asyncio.as_completed(tasks):
+                offset, page = await next_page
+                yield page.get("data", [])
+                if offset > last_offset:
+                    last_offset, last_page = offset, page
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        while last_page.get("next") is not None:
+            last_page = await self.author_papers_page(author_id, last_page["next"], fields)
+            yield last_page.get("data", [])
+
+    async def papers(self, paper_ids, fields=PAPER_FIELDS):
+        """
+        Return {paper_id: paper or None} using /paper/batch for the IDs that are not
+        cached, BATCH_SIZE IDs per call. Unknown IDs map to None.
+        """
+        keys = {self.cache_key("paper", paper_id, fields): paper_id for paper_id in paper_ids}
+        url = f"{BASE_URL}/paper/batch?fields={','.join(fields)}"
+
+        async def fetch_many(missing):
+            ids = [keys[key] for key in missing]
+            found = {}
+            async with client_session("semantic_scholar") as client:
+                for start in range(0, len(ids), BATCH_SIZE):
+                    chunk = ids[start:start + BATCH_SIZE]
+                    await self.rate_limiter.acquire()
+                    logger.info(f"Requesting {len(chunk)} papers from Semantic Scholar batch API")
+                    data = await client.post_json(url, json={"ids": chunk}, headers=self.headers, idempotent=True)
+                    found.update(zip(chunk, data))
+            return {key: found.get(keys[key]) for key in missing}
+
+        values = await self.cache.get_or_fetch_many(list(keys), fetch_many)
+        return {paper_id: values.get(key) for key, paper_id in keys.items()}
+
+    async def paper(self, paper_id, fields=PAPER_FIELDS):
+        return (await self.papers([paper_id], fields))[paper_id]
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_semantic_scholar():
+    """Process-wide client configured from the SEMANTIC_SCHOLAR_* settings."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                shared = caches["semantic_scholar"] if "semantic_scholar" in settings.CACHES else None
+                _client = SemanticScholarClient(
+                    ResponseCache(
+                        "semantic_scholar",
+                        ttl=settings.SEMANTIC_SCHOLAR_CACHE_TTL,
+                        stale_ttl=settings.SEMANTIC_SCHOLAR_CACHE_STALE_TTL,
+                        max_entries=settings.SEMANTIC_SCHOLAR_CACHE_SIZE,
+                        shared=shared,
+                    ),
+                    AsyncTokenBucket(settings.SEMANTIC_SCHOLAR_RATE, burst=settings.SEMANTIC_SCHOLAR_BURST),
+                    concurrency=settings.SEMANTIC_SCHOLAR_CONCURRENCY,
+                    api_key=settings.SEMANTIC_SCHOLAR_API_KEY,
+                )
+    return _client
@@ -0,0 +1,154 @@
+import logging
+import re
+import threading
+
+from django.conf import settings
+
+from utils.registry import registry
+
+logger = logging.getLogger(__name__)
+
+_PIECE_RE = re.compile(r"\w+|[^\w\s]")
+
+TOPIC_TOKENS = 40        # Output reserved per paper for its topic list
+ID_TOKENS = 4            # ... and for its batch-local ID ("P12") and JSON punctuation
+MIN_SAMPLES = 3          # Batches of one size needed before their parse rate is trusted
+TARGET_PARSE_RATE = 0.9  # Share of papers per batch that must come back with topics
+
+
+def load_tokenizer():
+    """Hugging Face fast tokenizer named by OLLAMA_TOKENIZER, or None to use the estimate."""
+    if not settings.OLLAMA_TOKENIZER:
+        return None
+    try:
+        from tokenizers import Tokenizer
+        return Tokenizer.from_pretrained(settings.OLLAMA_TOKENIZER)
+    except Exception as e:
+        logger.warning(f"Could not load tokenizer '{settings.OLLAMA_TOKENIZER}', estimating token counts: {e}")
+        return None
+
+
+def count_tokens(text):
+    """
+    Token count of `text` for the configured tokenizer. Without one, every word or
+    punctuation mark counts as one token per five characters, which overestimates
+    typical English text a little, so prompts stay inside the budget.
+    """
+    if not text:
+        return 0
+    tokenizer = registry.get("prompt_tokenizer")
+    if tokenizer is not None:
+        return len(tokenizer.encode(text, add_special_tokens=False).ids)
+    return sum((len(piece) + 4) // 5 for piece in _PIECE_RE.findall(text))
+
+
+def truncate_to_tokens(text, limit):
+    """Cut `text` at a word boundary so that it counts at most `limit` tokens."""
+    if limit <= 0:
+        return ""
+    tokens = count_tokens(text)
+    while text and tokens > limit:
+        text = text[:int(len(text) * limit / tokens * 0.95)].rsplit(" ", 1)[0]
+        tokens = count_tokens(text)
+    return text
+
+
+class TopicBatcher:
+    """
+    Packs papers into topic-extraction prompts for one model.
+
+    Papers are added to a batch until its prompt plus the output reserved for the
+    answer would exceed the model's context window, so short abstracts share a call
+    and long ones are not cut off by the server. Parse results are recorded per batch
+    size: when batches of some size stop coming back complete, the limit drops below
+    that size (even if the token budget, not the limit, made them that small), and
+    while batches at the limit do come back complete it creeps back up towards `max_items`.
+    """
+
+    def __init__(self, context_window, max_items=16, min_items=1):
+        self.context_window = context_window
+        self.max_items = max_items
+        self.min_items = min_items
+        self.limit = max_items
+        self._stats = {}  # batch size -> [batches, parse rate EWMA]
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def output_tokens(paper):
+        return ID_TOKENS + TOPIC_TOKENS
+
+    def batches(self, papers, build_prompt, cap=None):
+        """
+        Split `papers` into batches whose prompt (`build_prompt(batch)`) and reserved
+        output fit the context window, with at most `cap` papers each. Abstracts too
+        long for a prompt of their own are shortened.
+        """
+        limit = min(self.limit, cap or self.limit)
+        overhead = count_tokens(build_prompt([]))
+        budget = self.context_window - overhead
+
+        # First fit: each paper goes into the first batch that still has room for it
+        batches = []  # [papers, tokens used]
+        for paper in papers:
+            cost = count_tokens(build_prompt([paper])) - overhead + self.output_tokens(paper)
+            if cost > budget:
+                excess = cost - budget
+                abstract = paper.get("abstract") or ""
+                paper = {**paper, "abstract": truncate_to_tokens(abstract, count_tokens(abstract) - excess)}
+                cost = count_tokens(build_prompt([paper])) - overhead + self.output_tokens(paper)
+            batch = next((b for b in batches if b[1] + cost <= budget and len(b[0]) < limit), None)
+            if batch is None:
+                batch = [[], 0]
+                batches.append(batch)
+            batch[0].append(paper)
+            batch[1] += cost
+        return [batch for batch, _ in batches]
+
+    def num_predict(self, batch):
+        """Output tokens to allow the model for `batch`."""
+        return sum(self.output_tokens(paper) for paper in batch)
+
+    def record(self, size, parsed):
+        """Record that `parsed` of a batch of `size` papers came back with topics."""
+        if size == 0:
+            return
+        rate = parsed / size
+        with self._lock:
+            stats = self._stats.setdefault(size, [0, rate])
+            stats[0] += 1
+            stats[1] = 0.3 * rate + 0.7 * stats[1]
+            if stats[0] < MIN_SAMPLES or size > self.limit:
+                return  # Not enough batches yet, or sent before the limit went down
+
+            # Any size actually sent can push the limit below it; only full ones raise it
+            if stats[1] < TARGET_PARSE_RATE and self.limit > self.min_items:
+                self.limit = max(self.min_items, size - 1)
+                logger.info(f"Topic batches of {size} parse {stats[1]:.0%} of papers; "
+                            f"lowering the batch limit to {self.limit}")
+            elif stats[1] >= TARGET_PARSE_RATE and size == self.limit and self.limit < self.max_items:
+                self.limit += 1
+                self._stats.pop(self.limit, None)  # Judge the larger size afresh
+
+    def stats(self):
+        with self._lock:
+            return {
+                "context_window": self.context_window,
+                "limit": self.limit,
+                "parse_rate": {size: round(rate, 3) for size, (_, rate) in sorted(self._stats.items())},
+            }
+
+
+_batchers = {}
+_batchers_lock = threading.Lock()
+
+
+def get_topic_batcher(model):
+    """Process-wide batcher for `model`, sized from OLLAMA_CONTEXT_WINDOW(S)."""
+    if model not in _batchers:
+        with _batchers_lock:
+            if model not in _batchers:
+                _batchers[model] = TopicBatcher(
+                    settings.OLLAMA_CONTEXT_WINDOWS.get(model, settings.OLLAMA_CONTEXT_WINDOW),
+                    max_items=settings.OLLAMA_TOPIC_BATCH_MAX,
+                )
+    return _batchers[model]
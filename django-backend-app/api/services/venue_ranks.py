@@ -0,0 +1,79 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+def core_fingerprint(path):
+    """SHA-256 of the CORE file, stored in the table to detect a stale build."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class VenueRankTable:
+    """
+    DBLP venue -> CORE rank table written by `manage.py build_venue_ranks`.
+
+    The file stores a snapshot of the CORE entries it was built from and, for every
+    distinct DBLP venue string, the position of the matched entry (or null). Lookups
+    are plain dict hits; venues missing from the table are left to VenueRanker.
+    """
+
+    def __init__(self, data):
+        self.core_fingerprint = data["core_fingerprint"]
+        self.core = [tuple(entry) for entry in data["core"]]
+        self.matches = data["venues"]
+        self._ranks = {
+            venue: self.core[position][3] if position is not None else None
+            for venue, position in self.matches.items()
+        }
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def __len__(self):
+        return len(self._ranks)
+
+    def lookup(self, venues):
+        """Return {venue: CORE rank or None} for the venues the table knows about."""
+        return {venue: self._ranks[venue] for venue in venues if venue in self._ranks}
+
+
+_table = None
+_table_lock = threading.Lock()
+_table_unavailable = False
+
+
+def get_venue_rank_table():
+    """
+    Return the precomputed venue rank table, or None when it has not been built or
+    was built from a different CORE file. Callers fall back to fuzzy matching then.
+    """
+    global _table, _table_unavailable
+    if _table is None and not _table_unavailable:
+        with _table_lock:
+            if _table is None and not _table_unavailable:
+                path = settings.VENUE_RANKS_FILE
+                if not os.path.exists(path):
+                    logger.warning(f"Venue rank table not found at {path}; ranking venues at request time.")
+                    _table_unavailable = True
+                    return None
+                table = VenueRankTable.from_file(path)
+                if table.core_fingerprint != core_fingerprint(settings.CORE_RANKS_FILE):
+                    logger.warning(f"Venue rank table {path} was built from a different CORE file; "
+                                   f"run `manage.py build_venue_ranks`. Ranking venues at request time.")
+                    _table_unavailable = True
+                    return None
+                _table = table
+                logger.info(f"Loaded venue rank table with {len(table)} venues from {path}")
+    return _table
@@ -1,3 +1,254 @@
-from django.test import TestCase
+import asyncio
+import io
+import json
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from utils.CORE import VenueRanker
+from utils.rate_limit import AdaptiveRateLimiter
+from utils.response_cache import ResponseCache
+from .management.commands.build_venue_ranks import Command as BuildVenueRanksCommand
+from .services.ollama_processor import OllamaTextProcessor
+from .services.topic_batching import MIN_SAMPLES, TopicBatcher
+from .services.venue_ranks import VenueRankTable
+
+
+def topic_prompt(batch):
+    return "Papers:\n" + "".join(f"{paper['title']}\n{paper['abstract']}\n" for paper in batch)
+
+
+def make_papers(count, words=50):
+    return [{"title": f"Paper {i}", "abstract": "word " * words} for i in range(count)]
+
+
+class TopicBatcherTests(SimpleTestCase):
+
+    def setUp(self):
+        # Count tokens with the built-in estimate rather than a configured tokenizer
+        patcher = mock.patch("api.services.topic_batching.registry.get", return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_budget_bound_batches_lower_the_limit(self):
+        batcher = TopicBatcher(context_window=500, max_items=16)
+        papers = make_papers(20)
+        size = len(batcher.batches(papers, topic_prompt)[0])
+        self.assertTrue(1 < size < batcher.limit)
+
+        for _ in range(MIN_SAMPLES):
+            batcher.record(size, size // 2)
+
+        self.assertEqual(batcher.limit, size - 1)
+        self.assertEqual(max(len(batch) for batch in batcher.batches(papers, topic_prompt)), size - 1)
+
+    def test_limit_needs_enough_samples_to_move(self):
+        batcher = TopicBatcher(context_window=4096, max_items=8)
+        for _ in range(MIN_SAMPLES - 1):
+            batcher.record(8, 0)
+        self.assertEqual(batcher.limit, 8)
+
+    def test_limit_recovers_while_full_batches_parse(self):
+        batcher = TopicBatcher(context_window=4096, max_items=8)
+        for _ in range(MIN_SAMPLES):
+            batcher.record(8, 2)
+        self.assertEqual(batcher.limit, 7)
+
+        # Complete smaller batches do not raise the limit, complete full ones do
+        for _ in range(MIN_SAMPLES):
+            batcher.record(3, 3)
+        self.assertEqual(batcher.limit, 7)
+        for _ in range(MIN_SAMPLES):
+            batcher.record(7, 7)
+        self.assertEqual(batcher.limit, 8)
+
+
+class TopicResponseTests(SimpleTestCase):
+
+    def setUp(self):
+        patcher = mock.patch("api.services.topic_batching.registry.get", return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.processor = OllamaTextProcessor(model="test-model")
+        self.batch = [
+            {"id": "a", "title": "A", "abstract": "x"},
+            {"id": "b", "title": "B", "abstract": "y"},
+            {"id": "c", "title": "C", "abstract": "z"},
+        ]
+
+    def test_parse_maps_local_ids_and_drops_extra_or_invalid_entries(self):
+        response = json.dumps({
+            "P1": [" graphs ", "", "learning", "search", "extra"],
+            "P2": "not a list",
+            "P9": ["unknown paper"],
+        })
+        self.assertEqual(self.processor.parse_topic_response(response, self.batch),
+                         {"a": ["graphs", "learning", "search"]})
+
+    def test_parse_rejects_answers_that_are_not_a_json_object(self):
+        self.assertEqual(self.processor.parse_topic_response("P1: graphs", self.batch), {})
+        self.assertEqual(self.processor.parse_topic_response("[]", self.batch), {})
+
+    def test_generate_topics_retries_only_missing_papers(self):
+        prompts = []
+
+        def answer(prompt, **kwargs):
+            prompts.append(prompt)
+            if len(prompts) == 1:
+                return json.dumps({"P1": ["graphs"], "P3": ["search"]})
+            return json.dumps({"P1": ["learning"]})
+
+        pool = mock.Mock(**{"capacity.return_value": 1})
+        with mock.patch("api.services.ollama_processor.get_topic_batcher", return_value=TopicBatcher(4096)), \
+                mock.patch("api.services.ollama_processor.get_ollama_pool", return_value=pool), \
+                mock.patch.object(self.processor, "send_request_to_ollama", side_effect=answer):
+            topics = self.processor.generate_topics(self.batch)
+
+        self.assertEqual(topics, {"a": ["graphs"], "b": ["learning"], "c": ["search"]})
+        self.assertEqual(len(prompts), 2)
+        self.assertIn("Title: B", prompts[1])
+        self.assertNotIn("Title: A", prompts[1])
+        self.assertNotIn("Title: C", prompts[1])
+
+
+class AdaptiveRateLimiterTests(SimpleTestCase):
+
+    def test_throttle_halves_the_rate_once_per_cooldown(self):
+        limiter = AdaptiveRateLimiter(8, cooldown=60)
+        limiter.on_throttle()
+        limiter.on_throttle()  # From a request that was already in flight
+        self.assertEqual(limiter.rate, 4)
+
+    def test_rate_does_not_drop_below_min_rate(self):
+        limiter = AdaptiveRateLimiter(2, min_rate=0.5, cooldown=0)
+        for _ in range(5):
+            limiter.on_throttle()
+        self.assertEqual(limiter.rate, 0.5)
+
+    def test_successes_recover_the_rate_up_to_max_rate(self):
+        limiter = AdaptiveRateLimiter(8, cooldown=0)
+        limiter.on_throttle()
+        limiter.on_success()
+        self.assertEqual(limiter.rate, 4.25)  # One more request per second, spread over a second of calls
+
+        for _ in range(100):
+            limiter.on_success()
+        self.assertEqual(limiter.rate, 8)
+
+    def test_retry_after_holds_back_callers(self):
+        limiter = AdaptiveRateLimiter(10, burst=5)
+        limiter.on_throttle(retry_after=2)
+        self.assertGreater(limiter._reserve(), 1.9)
+
+
+class ResponseCacheTests(SimpleTestCase):
+
+    def counting_fetch(self, value="v"):
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0)
+            return value
+        return fetch, calls
+
+    async def test_concurrent_misses_share_one_fetch(self):
+        cache = ResponseCache("test", ttl=60)
+        fetch, calls = self.counting_fetch()
+        values = await asyncio.gather(*(cache.get_or_fetch("k", fetch) for _ in range(5)))
+        self.assertEqual(values, ["v"] * 5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(await cache.get_or_fetch("k", fetch), "v")
+        self.assertEqual(len(calls), 1)
+
+    async def test_stale_entry_is_served_while_it_is_refreshed(self):
+        cache = ResponseCache("test", ttl=60, stale_ttl=60)
+        fetch, _ = self.counting_fetch("old")
+        await cache.get_or_fetch("k", fetch)
+        cache._memory["k"]["fetched_at"] -= 90  # Past ttl, within stale_ttl
+
+        fetch, calls = self.counting_fetch("new")
+        self.assertEqual(await cache.get_or_fetch("k", fetch), "old")
+        await asyncio.sleep(0.01)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(await cache.get_or_fetch("k", fetch), "new")
+
+    async def test_failed_fetches_are_not_cached(self):
+        cache = ResponseCache("test", ttl=60)
+
+        async def fail():
+            raise RuntimeError("upstream down")
+        with self.assertRaises(RuntimeError):
+            await cache.get_or_fetch("k", fail)
+
+        fetch, calls = self.counting_fetch()
+        self.assertEqual(await cache.get_or_fetch("k", fetch), "v")
+        self.assertEqual(len(calls), 1)
+
+    async def test_batch_fetches_only_missing_keys(self):
+        cache = ResponseCache("test", ttl=60)
+        requested = []
+
+        async def fetch_many(keys):
+            requested.append(list(keys))
+            return {key: key.upper() for key in keys if key != "unknown"}
+
+        self.assertEqual(await cache.get_or_fetch_many(["a", "unknown"], fetch_many), {"a": "A", "unknown": None})
+        self.assertEqual(await cache.get_or_fetch_many(["a", "b", "unknown"], fetch_many),
+                         {"a": "A", "b": "B", "unknown": None})
+        self.assertEqual(requested, [["a", "unknown"], ["b", "unknown"]])
+
+
+CORE_ENTRIES = [
+    ("1", "International Conference on Machine Learning", "ICML", "A*"),
+    ("2", "Neural Information Processing Systems", "NeurIPS", "A*"),
+    ("3", "International Conference on Data Engineering", "ICDE", "A"),
+]
+
+
+class VenueRankerTests(SimpleTestCase):
+
+    def test_ranks_by_name_or_abbreviation(self):
+        ranker = VenueRanker(CORE_ENTRIES)
+        self.assertEqual(ranker.rank_many(["ICML", "Neural Information Processing System", "Some Workshop"]), {
+            "ICML": "A*",
+            "Neural Information Processing System": "A*",
+            "Some Workshop": None,
+        })
+
+    def test_results_are_cached_per_venue(self):
+        ranker = VenueRanker(CORE_ENTRIES)
+        self.assertEqual(ranker.rank("ICDE"), "A")
+        with mock.patch.object(ranker, "match_many") as match_many:
+            self.assertEqual(ranker.rank("ICDE"), "A")
+        match_many.assert_not_called()
+
+
+class BuildVenueRanksTests(SimpleTestCase):
+
+    def carry_over(self, new_entries, venues):
+        ranker = VenueRanker(CORE_ENTRIES)
+        previous = VenueRankTable({
+            "core_fingerprint": "",
+            "core": CORE_ENTRIES,
+            "venues": ranker.match_many(["ICML", "NeurIPS", "ICDE", "Some Workshop"]),
+        })
+        command = BuildVenueRanksCommand(stdout=io.StringIO())
+        return command._carry_over(previous, VenueRanker(new_entries), venues)
+
+    def test_unchanged_and_reranked_entries_are_carried_over(self):
+        entries = [CORE_ENTRIES[0], CORE_ENTRIES[1], ("3", "International Conference on Data Engineering", "ICDE", "A*")]
+        matches, to_rescore = self.carry_over(entries, ["ICML", "ICDE", "Some Workshop", "VLDB"])
+        self.assertEqual(matches, {"ICML": 0, "ICDE": 2, "Some Workshop": None})
+        self.assertEqual(to_rescore, {"VLDB"})
+
+    def test_venues_affected_by_renamed_or_added_entries_are_rescored(self):
+        entries = [
+            ("2", "Neural Information Processing Systems", "NIPS", "A*"),
+            CORE_ENTRIES[0],
+            CORE_ENTRIES[2],
+            ("4", "Some Workshops", "SW", "B"),
+        ]
+        matches, to_rescore = self.carry_over(entries, ["ICML", "NeurIPS", "ICDE", "Some Workshop"])
+        self.assertEqual(matches, {"ICML": 1, "ICDE": 2})
+        self.assertEqual(to_rescore, {"NeurIPS", "Some Workshop"})
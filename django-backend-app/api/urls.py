@@ -1,19 +1,22 @@
 from django.urls import path, re_path
-from .views import  CompareResearchersView, PublicationSearchView, PaperDetailsView
-from .views import SearchView, ResearcherProfileView, OpenAlexView, GenerateTopicsView
-from .views import GitHubProfileView, HuggingFaceProfileView
+from .views import  CompareResearchersView, PublicationSearchView, PaperDetailsView, PaperBatchView
+from .views import SearchView, SearchDescriptionsView, ResearcherProfileView, OpenAlexView, GenerateTopicsView
+from .views import GitHubProfileView, HuggingFaceProfileView, HttpMetricsView
 
 
 urlpatterns = [
     path('sem-scholar-publication-search/', PublicationSearchView.as_view(), name='sem-scholar-publication-search'),
     path('paper-details/', PaperDetailsView.as_view(), name='paper-details'),
+    path('paper-details/batch/', PaperBatchView.as_view(), name='paper-details-batch'),
     path('search/', SearchView.as_view(), name='dblp-search'),
+    path('search/descriptions/', SearchDescriptionsView.as_view(), name='dblp-search-descriptions'),
     path('researcher-profile/', ResearcherProfileView.as_view(), name='researcher-profile'),
     path('compare-researchers/', CompareResearchersView.as_view(), name='compare-researchers'),  #  ADD THIS!
     path('open-alex/', OpenAlexView.as_view(), name='open-alex'), 
     path('generate-topics/', GenerateTopicsView.as_view(), name='generate-topics'),
     path('github-profile/', GitHubProfileView.as_view(), name='github-profile'),
-    path('huggingfacedata/', HuggingFaceProfileView.as_view(), name='huggingface-profile') 
+    path('huggingfacedata/', HuggingFaceProfileView.as_view(), name='huggingface-profile'),
+    path('http-metrics/', HttpMetricsView.as_view(), name='http-metrics'),
 ]
 
 
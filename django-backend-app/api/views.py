@@ -1,10 +1,15 @@
 from collections import defaultdict
+import json
 import logging
 from urllib.parse import unquote
 import requests
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from django.http import JsonResponse, StreamingHttpResponse
+from django.conf import settings
+from django.views import View
+from asgiref.sync import sync_to_async
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
@@ -12,14 +17,20 @@ from rest_framework.authtoken.models import Token  # For token-based auth
 from rest_framework.permissions import AllowAny
 from django.utils.decorators import method_decorator
 import xml.etree.ElementTree as ET
-from utils.keybert import KeywordExtractor
 
 import string
 from .services.profile_fetcher import ProfileFetcher
 from .services.author_search import AuthorSearchService
-from .services.openalex_service import OpenAlexFetcher
+from .services.openalex_service import get_openalex_fetcher
+from .services.enrichment_cache import get_enrichment_cache
 from .services.ollama_processor import OllamaTextProcessor
+from .services.ollama_pool import get_ollama_pool
+from .services.topic_batching import get_topic_batcher
+from .services.publication_store import PublicationStore
+from .services.semantic_scholar import get_semantic_scholar
 import asyncio
+from utils import http_client
+from utils.http_client import UpstreamError, client_session
 from api.models import Author  # Ensure this matches your models import path
 import time 
 
@@ -27,111 +38,135 @@ logger = logging.getLogger(__name__)
 
 
 #########
-class PublicationSearchView(APIView):
-    permission_classes = [AllowAny]
+def format_publication(pub):
+    return {
+        "url": pub.get("url"),
+        "title": pub.get("title"),
+        "year": pub.get("year"),
+        "authors": [
+            {"name": author.get("name"), "id": author.get("authorId")}
+            for author in pub.get("authors", [])
+        ],
+        "abstract": pub.get("abstract"),
+        "venue": pub.get("venue"),
+        "citationCount": pub.get("citationCount"),
+        "fieldsOfStudy": pub.get("fieldsOfStudy"),
+    }
+
+
+class PublicationSearchView(View):
     """
-    Handles retrieval of publications for a given author using Semantic Scholar.
+    Handles retrieval of all publications of an author using Semantic Scholar. Pages
+    are fetched concurrently; with ?stream=true the publications are streamed as
+    newline-delimited JSON while pages arrive instead of returned in one response.
     """
 
-    def get(self, request):
+    async def get(self, request):
         # Get the author ID from the query parameter
         author_id = request.GET.get('author_id', '')
         logger.info(f"Received publication search request for author ID: {author_id}")
 
         if not author_id:
-            return Response({"error": "Author ID parameter is required."}, status=status.HTTP_400_BAD_REQUEST)
-
-        # Semantic Scholar API query URL with expanded fields
-        semantic_scholar_url = (
-            f"https://api.semanticscholar.org/graph/v1/author/{author_id}/papers?"
-            f"fields=url,title,year,authors,abstract,venue,citationCount,fieldsOfStudy"
-        )
-        logger.info(f"Making request to Semantic Scholar API: {semantic_scholar_url}")
+            return JsonResponse({"error": "Author ID parameter is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+        pages = get_semantic_scholar().iter_author_papers(author_id)
+
+        if request.GET.get('stream', '').lower() in ('1', 'true'):
+            async def ndjson_stream():
+                count = 0
+                try:
+                    async for page in pages:
+                        for pub in page:
+                            count += 1
+                            yield json.dumps({"publication": format_publication(pub)}) + "\n"
+                except UpstreamError as e:
+                    logger.error(f"Error while calling Semantic Scholar API: {e}")
+                    yield json.dumps({"error": str(e)}) + "\n"
+                    return
+                logger.info(f"Streamed {count} publications for author ID {author_id}.")
+                yield json.dumps({"done": True, "count": count}) + "\n"
+
+            response = StreamingHttpResponse(ndjson_stream(), content_type="application/x-ndjson")
+            response["X-Accel-Buffering"] = "no"  # Disable proxy buffering (nginx)
+            return response
 
         try:
-            # Make the API request
-            semantic_scholar_response = requests.get(semantic_scholar_url)
-            logger.info(f"Semantic Scholar API response status code: {semantic_scholar_response.status_code}")
-            semantic_scholar_response.raise_for_status()  # Raise error for HTTP issues
-            
-            # Parse JSON response
-            data = semantic_scholar_response.json()
-            
-            # Transform the data into a structured response if needed
-            publications = data.get("data", [])
-            formatted_publications = []
-            for pub in publications:
-                formatted_publications.append({
-                    "url": pub.get("url"),
-                    "title": pub.get("title"),
-                    "year": pub.get("year"),
-                    "authors": [
-                        {"name": author.get("name"), "id": author.get("authorId")}
-                        for author in pub.get("authors", [])
-                    ],
-                    "abstract": pub.get("abstract"),
-                    "venue": pub.get("venue"),
-                    "citationCount": pub.get("citationCount"),
-                    "fieldsOfStudy": pub.get("fieldsOfStudy"),
-                })
+            formatted_publications = [format_publication(pub) async for page in pages for pub in page]
 
             # Return the transformed response
             logger.info(f"Successfully fetched and formatted {len(formatted_publications)} publications.")
-            return Response({"publications": formatted_publications}, status=status.HTTP_200_OK)
+            return JsonResponse({"publications": formatted_publications}, status=status.HTTP_200_OK)
 
-        except requests.exceptions.RequestException as e:
+        except UpstreamError as e:
             logger.error(f"Error while calling Semantic Scholar API: {e}")
-            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            return JsonResponse({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+def format_paper(paper_data):
+    return {
+        "url": paper_data.get("url"),
+        "year": paper_data.get("year"),
+        "authors": [{"name": author.get("name")} for author in paper_data.get("authors", [])],
+        "abstract": paper_data.get("abstract"),
+        "fieldsOfStudy": paper_data.get("fieldsOfStudy"),
+        "venue": paper_data.get("venue"),
+    }
 
-class PaperDetailsView(APIView):
-    permission_classes = [AllowAny]
+
+class PaperDetailsView(View):
     """
     Handles retrieval of paper details using Semantic Scholar.
     """
     # Integrate keywords here. 
-    def get(self, request):
+    async def get(self, request):
         # Get the paper ID from the query parameter
         paper_id = request.GET.get('paper_id', '')
         logger.info(f"Received paper details request for paper ID: {paper_id}")
 
         if not paper_id:
-            return Response({"error": "Paper ID parameter is required."}, status=status.HTTP_400_BAD_REQUEST)
-
-        # Semantic Scholar API query URL for a specific paper
-        semantic_scholar_url = (
-            f"https://api.semanticscholar.org/graph/v1/paper/{paper_id}?"
-            f"fields=url,year,authors,abstract,fieldsOfStudy,venue"
-        )
-        logger.info(f"Making request to Semantic Scholar API: {semantic_scholar_url}")
+            return JsonResponse({"error": "Paper ID parameter is required."}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            # Make the API request
-            semantic_scholar_response = requests.get(semantic_scholar_url)
-            logger.info(f"Semantic Scholar API response status code: {semantic_scholar_response.status_code}")
-            semantic_scholar_response.raise_for_status()  # Raise error for HTTP issues
-            
-            # Parse JSON response
-            paper_data = semantic_scholar_response.json()
-            
-            # Transform the data into a structured response
-            formatted_paper = {
-                "url": paper_data.get("url"),
-                "year": paper_data.get("year"),
-                "authors": [{"name": author.get("name")} for author in paper_data.get("authors", [])],
-                "abstract": paper_data.get("abstract"),
-                "fieldsOfStudy": paper_data.get("fieldsOfStudy"),
-                "venue": paper_data.get("venue"),
-            }
+            # Cached Semantic Scholar lookup, through the batch endpoint
+            paper_data = await get_semantic_scholar().paper(paper_id)
+        except UpstreamError as e:
+            logger.error(f"Error while calling Semantic Scholar API: {e}")
+            return JsonResponse({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-            # Return the transformed response
-            logger.info(f"Successfully fetched paper details for paper ID {paper_id}.")
-            return Response({"paper": formatted_paper}, status=status.HTTP_200_OK)
+        if paper_data is None:
+            return JsonResponse({"error": f"Paper {paper_id} not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        except requests.exceptions.RequestException as e:
+        logger.info(f"Successfully fetched paper details for paper ID {paper_id}.")
+        return JsonResponse({"paper": format_paper(paper_data)}, status=status.HTTP_200_OK)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class PaperBatchView(View):
+    """
+    Paper details for many papers in one request: POST {"paper_ids": [...]} returns
+    {"papers": {paper_id: details or null}}. Uncached papers are requested from the
+    Semantic Scholar batch endpoint, up to 500 per upstream call.
+    """
+
+    async def post(self, request):
+        try:
+            payload = json.loads(request.body or b"{}")
+        except ValueError:
+            payload = {}
+        paper_ids = payload.get("paper_ids", []) if isinstance(payload, dict) else []
+        if not paper_ids or not isinstance(paper_ids, list):
+            return JsonResponse({"error": "A list of paper IDs must be provided."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            papers = await get_semantic_scholar().papers([str(paper_id) for paper_id in paper_ids])
+        except UpstreamError as e:
             logger.error(f"Error while calling Semantic Scholar API: {e}")
-            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            return JsonResponse({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        logger.info(f"Fetched details for {sum(1 for p in papers.values() if p)}/{len(papers)} papers.")
+        return JsonResponse({
+            "papers": {paper_id: format_paper(paper) if paper else None for paper_id, paper in papers.items()}
+        }, status=status.HTTP_200_OK)
 
 
 class SearchView(APIView):
@@ -144,7 +179,13 @@ class SearchView(APIView):
         if not search_query:
             return Response({"error": "Query parameter is required."}, status=status.HTTP_400_BAD_REQUEST)
 
-        search_service = AuthorSearchService(search_query)
+        try:
+            limit = int(request.GET.get('limit', 5))
+            offset = int(request.GET.get('offset', 0))
+        except ValueError:
+            return Response({"error": "limit and offset must be integers."}, status=status.HTTP_400_BAD_REQUEST)
+
+        search_service = AuthorSearchService(search_query, limit=max(1, min(limit, 50)), offset=max(0, offset))
         author_results = search_service.search_and_save_authors()
         end_time = time.time()
 
@@ -159,38 +200,88 @@ class SearchView(APIView):
         return Response({"query": search_query, "results": author_results}, status=status.HTTP_200_OK)
 
 
-class ResearcherProfileView(APIView):
-    permission_classes = [AllowAny]
+class SearchDescriptionsView(View):
+    """
+    Streams researcher descriptions as Server-Sent Events while they are generated.
+    The search endpoint returns placeholders for these authors; the client passes
+    their names here (?name=A&name=B) and receives one `description` event per
+    author followed by a final `done` event. With ?tokens=true, `token` events
+    ({"name", "text"}) carry each description's text while it is being generated.
+
+    The view is async so that ASGI servers send each event as soon as it is ready;
+    a sync iterator would be read to the end before anything is sent.
+    """
 
-    def get(self, request):
+    async def get(self, request):
+        names = [n.strip() for n in request.GET.getlist('name') if n.strip()]
+        if not names:
+            return JsonResponse({"error": "At least one 'name' parameter is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+        tokens = request.GET.get('tokens', '').lower() in ('1', 'true')
+
+        async def event_stream():
+            # The service blocks between events (MongoDB, worker threads); step through it off the event loop
+            events = AuthorSearchService("").stream_description_events(names, tokens=tokens)
+            next_event = sync_to_async(next, thread_sensitive=False)
+            step = None
+            try:
+                while True:
+                    step = asyncio.ensure_future(next_event(events, None))
+                    if (item := await asyncio.shield(step)) is None:
+                        break
+                    event, name, text = item
+                    if event == "token":
+                        payload = json.dumps({"name": name, "text": text})
+                    else:
+                        payload = json.dumps({"name": name, "description": text})
+                    yield f"event: {event}\ndata: {payload}\n\n"
+                yield "event: done\ndata: {}\n\n"
+            finally:
+                # Stop the service's workers when the client goes away. A disconnect cancels
+                # the await but not the step running in its thread, so close after it returns.
+                if step is None or step.done():
+                    events.close()
+                else:
+                    step.add_done_callback(lambda _: events.close())
+
+        response = StreamingHttpResponse(event_stream(), content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"  # Disable proxy buffering (nginx)
+        return response
+
+
+class ResearcherProfileView(View):
+
+    async def get(self, request):
         author_name = request.GET.get('author_name', '').strip()
 
         if not author_name:
             logger.warning("No NAME provided in request")
-            return Response({"error": "NAME parameter is required."}, status=status.HTTP_400_BAD_REQUEST)
+            return JsonResponse({"error": "NAME parameter is required."}, status=status.HTTP_400_BAD_REQUEST)
 
         logger.info(f"Fetching profile for author: {author_name}")
 
         try:
+            # BaseX and MongoDB are blocking; run them off the event loop
             fetcher = ProfileFetcher(author_name)
-            profile_data = fetcher.fetch_profile()
+            profile_data = await sync_to_async(fetcher.fetch_profile, thread_sensitive=False)()
 
             # Ensure coauthors are extracted and added to response
             profile_data["coauthors"] = self.extract_coauthors(profile_data["publications"], author_name)
 
-            return Response(profile_data, status=status.HTTP_200_OK)
+            return JsonResponse(profile_data, status=status.HTTP_200_OK)
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching data from DBLP for NAME {author_name}: {e}")
-            return Response({"error": "Failed to fetch data from DBLP."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            return JsonResponse({"error": "Failed to fetch data from DBLP."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
         except ValueError as e:
             logger.error(f"Invalid NAME or no data found for NAME {author_name}: {e}")
-            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+            return JsonResponse({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
 
         except Exception as e:
             logger.exception(f"Unexpected error occurred for NAME {author_name}: {e}")
-            return Response({"error": "An unexpected error occurred."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            return JsonResponse({"error": "An unexpected error occurred."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     def extract_coauthors(self, publications, author_name):
         """
@@ -211,73 +302,85 @@ class ResearcherProfileView(APIView):
 
 
 
-class OpenAlexView(APIView):
+@method_decorator(csrf_exempt, name="dispatch")
+class OpenAlexView(View):
     """
     API endpoint to fetch abstracts and citation counts from OpenAlex for given DOIs
     and save them into corresponding MongoDB Publication entries.
     """
-    permission_classes = [AllowAny]
-    def post(self, request):
-        dois = request.data.get("dois", [])
+
+    async def post(self, request):
+        try:
+            payload = json.loads(request.body or b"{}")
+        except ValueError:
+            payload = {}
+        dois = payload.get("dois", []) if isinstance(payload, dict) else []
         if not dois or not isinstance(dois, list):
-            return Response({"error": "A list of DOIs must be provided."}, status=status.HTTP_400_BAD_REQUEST)
+            return JsonResponse({"error": "A list of DOIs must be provided."}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Filter DOIs that actually need fetching (missing abstracts)
-        dois_to_fetch = []
-        for doi in dois:
-            found = False
-            authors = Author.objects(publications__links__contains=doi)
-            for author in authors:
-                for publication in author.publications:
-                    if doi in publication.links and publication.abstract:
-                        found = True
-                        break  # Found abstract, skip
-                if found:
-                    break
-            if not found:
-                dois_to_fetch.append(doi)
+        # Filter DOIs that actually need fetching (missing abstracts), one query for all DOIs
+        stored = await sync_to_async(PublicationStore.find_by_dois, thread_sensitive=False)(dois)
+        dois_to_fetch = [
+            doi for doi in dois
+            if not any(publication.get("abstract") for publication in stored.get(doi, []))
+        ]
 
         if not dois_to_fetch:
-            return Response({"message": "All DOIs already have abstracts. No update needed."}, status=status.HTTP_200_OK)
-
-        # Fetch from OpenAlex for those without abstract
-        fetched_data = asyncio.run(OpenAlexFetcher.fetch_openalex_data(dois_to_fetch))
-
-        if isinstance(fetched_data, dict) and fetched_data.get("error") == 429:
-            return Response(
-                {"error": "OpenAlex rate-limited. Please wait before retrying."},
+            return JsonResponse({"message": "All DOIs already have abstracts. No update needed."}, status=status.HTTP_200_OK)
+
+        # The enrichment cache answers DOIs fetched before, for any author or endpoint
+        cache = get_enrichment_cache()
+        cached = await sync_to_async(cache.get_many, thread_sensitive=False)(dois_to_fetch)
+        details = {
+            doi: {"doi": entry["doi"], "title": entry.get("title"),
+                  "cited_by_count": entry.get("citations"), "abstract": entry.get("abstract")}
+            for doi, entry in cached.items() if entry.get("found")
+        }
+        updated_count = await sync_to_async(PublicationStore.bulk_update, thread_sensitive=False)({
+            doi: {"citations": data["cited_by_count"], "abstract": data["abstract"]} for doi, data in details.items()
+        })
+        dois_to_fetch = [doi for doi in dois_to_fetch if doi not in cached]
+        logger.info(f"Enrichment cache answered {len(cached)} DOIs; fetching {len(dois_to_fetch)} from OpenAlex.")
+
+        # Fetch the rest from OpenAlex on this request's event loop. Each batch is cached
+        # and written to MongoDB as soon as it arrives (citations always, abstract only
+        # if empty), so a later throttled batch does not lose earlier ones.
+        def store_batch(batch):
+            cache.put_many({
+                doi: {"title": data.get("title"), "abstract": data.get("abstract"), "citations": data.get("cited_by_count")}
+                for doi, data in batch.items()
+            }, source="openalex")
+            return PublicationStore.bulk_update({
+                doi: {"citations": data.get("cited_by_count"), "abstract": data.get("abstract")}
+                for doi, data in batch.items() if data
+            })
+
+        async def save_batch(batch):
+            nonlocal updated_count
+            updated_count += await sync_to_async(store_batch, thread_sensitive=False)(batch)
+
+        fetched_data, missing, rate_limited = {}, [], False
+        if dois_to_fetch:
+            fetched_data, missing, rate_limited = await get_openalex_fetcher().fetch_works(dois_to_fetch, save_batch)
+
+            # Remember DOIs OpenAlex does not know, so they are not requested again
+            unknown = [doi for doi in dois_to_fetch if doi not in fetched_data and doi not in missing]
+            if unknown:
+                await sync_to_async(cache.put_many, thread_sensitive=False)(dict.fromkeys(unknown), source="openalex")
+
+        if rate_limited and not fetched_data and not details:
+            return JsonResponse(
+                {"error": "OpenAlex rate-limited. Please wait before retrying.", "missing": missing},
                 status=status.HTTP_429_TOO_MANY_REQUESTS
             )
-        
-        updated_count = 0
 
-        # Update publications in MongoDB
-        for doi, data in fetched_data.items():
-            if not data:
-                continue
-
-            authors = Author.objects(publications__links__contains=doi)
-            for author in authors:
-                updated = False
-                for publication in author.publications:
-                    if doi in publication.links:
-                        # Update citations
-                        if data.get("cited_by_count") is not None:
-                            publication.citations = data["cited_by_count"]
-                        # Update abstract only if empty
-                        if not publication.abstract and data.get("abstract") is not None:
-                            if isinstance(data["abstract"], str):  # Ensure it's a string
-                                publication.abstract = data["abstract"]
-                        updated = True
-                if updated:
-                    author.save()
-                    updated_count += 1
-
-        return Response({
-            "message": f"Successfully updated {updated_count} authors' publications.",
-            "details": fetched_data
+        # DOIs in `missing` were not fetched (throttled or failed) and can be sent again
+        return JsonResponse({
+            "message": f"Successfully updated {updated_count} publications.",
+            "details": {**details, **fetched_data},
+            "missing": missing,
         }, status=status.HTTP_200_OK)
-    
+
 
 class GenerateTopicsView(APIView):
     permission_classes = [AllowAny]
@@ -287,58 +390,61 @@ class GenerateTopicsView(APIView):
         if not dois or not isinstance(dois, list):
             return Response({"error": "A list of DOIs must be provided."}, status=status.HTTP_400_BAD_REQUEST)
 
-        processor = OllamaTextProcessor(batch_size=3, max_tokens=130, temperature=0.6)  # Create processor instance
+        processor = OllamaTextProcessor(max_tokens=130, temperature=0.6)  # Batch sizes come from the topic batcher
         updated_count = 0
         updated_publications = []
         existing_publications = []  # Store publications that already have topics
 
-        # Collect papers for batch processing
+        # Collect papers for batch processing, one query for all DOIs
         papers_to_process = []
+        stored = PublicationStore.find_by_dois(dois)
 
         for doi in dois:
-            authors = Author.objects(publications__links__contains=doi)
-            for author in authors:
-                for publication in author.publications:
-                    if doi in publication.links:
-                        # If topics already exist, return existing ones instead of extracting again
-                        if publication.topics:
-                            existing_publications.append({
-                                "doi": doi,
-                                "title": publication.title,
-                                "abstract": publication.abstract,
-                                "topics": publication.topics
-                            })
-                            continue  # Skip topic extraction for this paper
-
-                        # Concatenate title and abstract for topic extraction
-                        text_to_analyze = f"{publication.title} {publication.abstract}".strip()
-                        if not text_to_analyze:
-                            continue  # Skip if both title and abstract are empty
-
-                        papers_to_process.append({
-                            "id": doi,  # Using DOI as a unique identifier
-                            "title": publication.title,
-                            "abstract": publication.abstract
-                        })
+            publications = stored.get(doi, [])
+            with_topics = next((p for p in publications if p.get("topics")), None)
+
+            # If topics already exist, return existing ones instead of extracting again
+            if with_topics:
+                existing_publications.append({
+                    "doi": doi,
+                    "title": with_topics.get("title"),
+                    "abstract": with_topics.get("abstract"),
+                    "topics": with_topics["topics"]
+                })
+                continue
+
+            if not publications:
+                continue
+            publication = publications[0]
+
+            # Concatenate title and abstract for topic extraction
+            text_to_analyze = f"{publication.get('title', '')} {publication.get('abstract') or ''}".strip()
+            if not text_to_analyze:
+                continue  # Skip if both title and abstract are empty
+
+            papers_to_process.append({
+                "id": doi,  # Using DOI as a unique identifier
+                "title": publication.get("title"),
+                "abstract": publication.get("abstract")
+            })
 
         # Generate topics in batch if there are new papers to process
         if papers_to_process:
             topics_dict = processor.generate_topics(papers_to_process)
 
-            # Update publications with extracted topics
-            for doi, topics in topics_dict.items():
-                for author in Author.objects(publications__links__contains=doi):
-                    for publication in author.publications:
-                        if doi in publication.links and not publication.topics:
-                            publication.topics = topics
-                            author.save()
-                            updated_count += 1
-                            updated_publications.append({
-                                "doi": doi,
-                                "title": publication.title,
-                                "abstract": publication.abstract,
-                                "topics": publication.topics
-                            })
+            # Update publications with extracted topics in one bulk write
+            PublicationStore.bulk_update({doi: {"topics": topics} for doi, topics in topics_dict.items()})
+
+            for paper in papers_to_process:
+                topics = topics_dict.get(paper["id"])
+                if topics:
+                    updated_count += 1
+                    updated_publications.append({
+                        "doi": paper["id"],
+                        "title": paper["title"],
+                        "abstract": paper["abstract"],
+                        "topics": topics
+                    })
 
         return Response({
             "message": f"Successfully updated topics for {updated_count} publications.",
@@ -378,7 +484,7 @@ class CompareResearchersView(APIView):
             # Check if author exists (case-insensitive)
             author = Author.objects(name__iexact=name).first()
 
-            if author and author.publications:
+            if author and author.publication_keys:
                 # Add to comparison list and return existing data
                 comparison_list.add(author.name)  # Use exact name from DB
                 return Response({"message": "Researcher added to comparison list."}, status=status.HTTP_200_OK)
@@ -392,10 +498,10 @@ class CompareResearchersView(APIView):
             author = Author.objects(name__iexact=name).first()
             if author:
                 # Case: Exists but no publications, update
-                if not author.publications:
+                if not author.publication_keys:
                     logger.info(f"Updating existing author '{name}' with fetched publications.")
                     author.affiliations = profile_data["affiliations"]
-                    author.publications = fetcher._build_publications_for_db(profile_data["publications"])
+                    author.publication_keys = fetcher._store_publications(profile_data["publications"])
                     author.save()
             else:
                 # Case: Fully new author, save
@@ -404,7 +510,7 @@ class CompareResearchersView(APIView):
                     name=profile_data["name"],
                     affiliations=profile_data["affiliations"],
                     description=profile_data.get("description", ""),
-                    publications=fetcher._build_publications_for_db(profile_data["publications"])
+                    publication_keys=fetcher._store_publications(profile_data["publications"])
                 )
                 new_author.save()
 
@@ -451,20 +557,19 @@ class CompareResearchersView(APIView):
             "name": author.name,
             "affiliations": author.affiliations,
             "description": author.description,
-            "publications": [pub.to_mongo() for pub in author.publications]  # Convert publications for response
+            "publications": PublicationStore.find_by_keys(author.publication_keys)
         }
     
 
 
-class GitHubProfileView(APIView):
-    permission_classes = [AllowAny]
+class GitHubProfileView(View):
 
-    def get(self, request):
+    async def get(self, request):
         name = request.GET.get("name", "").strip()
         affiliation = request.GET.get("affiliation", "").strip()
 
         if not name or not affiliation:
-            return Response(
+            return JsonResponse(
                 {"error": "Both 'name' and 'affiliation' parameters are required."},
                 status=status.HTTP_400_BAD_REQUEST
             )
@@ -479,66 +584,67 @@ class GitHubProfileView(APIView):
         query = name.replace(" ", "+")
         search_api_url = f"https://api.github.com/search/users?q={query}"
 
-        try:
-            search_response = requests.get(search_api_url)
-            search_response.raise_for_status()
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error calling GitHub Search API: {e}")
-            return Response({"error": "Error calling GitHub Search API"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        async with client_session("github") as client:
+            try:
+                search_data = await client.get_json(search_api_url)
+            except UpstreamError as e:
+                logger.error(f"Error calling GitHub Search API: {e}")
+                return JsonResponse({"error": "Error calling GitHub Search API"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-        search_data = search_response.json()
-        items = search_data.get("items", [])
+            items = search_data.get("items", [])
 
-        if not items:
-            logger.warning(f"No GitHub user found for name: {name}")
-            return Response({"github_url": "No GitHub user found", "repositories": []}, status=status.HTTP_200_OK)
+            if not items:
+                logger.warning(f"No GitHub user found for name: {name}")
+                return JsonResponse({"github_url": "No GitHub user found", "repositories": []}, status=status.HTTP_200_OK)
 
-        # --- First matched user ---
-        user_info = items[0]
-        github_username = user_info.get("login")
-        github_profile_url = user_info.get("html_url", "No GitHub profile found")
+            # --- First matched user ---
+            user_info = items[0]
+            github_username = user_info.get("login")
+            github_profile_url = user_info.get("html_url", "No GitHub profile found")
 
-        # --- Fetch user details ---
-        user_details_api = user_info.get("url")
-        if not user_details_api:
-            logger.warning("No user details URL found in search result.")
-            return Response({"github_url": "No GitHub profile found", "repositories": []}, status=status.HTTP_200_OK)
+            # --- Fetch user details ---
+            user_details_api = user_info.get("url")
+            if not user_details_api:
+                logger.warning("No user details URL found in search result.")
+                return JsonResponse({"github_url": "No GitHub profile found", "repositories": []}, status=status.HTTP_200_OK)
 
-        try:
-            user_details_resp = requests.get(user_details_api)
-            user_details_resp.raise_for_status()
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error fetching user details: {e}")
-            return Response({"error": "Error fetching user details from GitHub"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            try:
+                user_details = await client.get_json(user_details_api)
+            except UpstreamError as e:
+                logger.error(f"Error fetching user details: {e}")
+                return JsonResponse({"error": "Error fetching user details from GitHub"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-        user_details = user_details_resp.json()
-        company = user_details.get("company", "") or ""
-        location = user_details.get("location", "") or ""
+            company = user_details.get("company", "") or ""
+            location = user_details.get("location", "") or ""
 
-        location_words = location.strip().split()
-        location_first_word = location_words[0].strip(string.punctuation) if location_words else ""
+            location_words = location.strip().split()
+            location_first_word = location_words[0].strip(string.punctuation) if location_words else ""
 
-        logger.debug(f"[GitHubProfileView] company={company}, location={location}")
+            logger.debug(f"[GitHubProfileView] company={company}, location={location}")
 
-        # --- Check if user matches affiliation ---
-        condition_location = (location_first_word and location_first_word in affiliation_excl_last)
-        condition_company = (company == affiliation_excl_last)
+            # --- Check if user matches affiliation ---
+            condition_location = (location_first_word and location_first_word in affiliation_excl_last)
+            condition_company = (company == affiliation_excl_last)
 
-        if not (condition_location or condition_company):
-            return Response({"github_url": "No GitHub profile found", "repositories": []}, status=status.HTTP_200_OK)
+            if not (condition_location or condition_company):
+                return JsonResponse({"github_url": "No GitHub profile found", "repositories": []}, status=status.HTTP_200_OK)
 
-        # --- Fetch Repositories ---
-        repositories = self.get_github_repositories(github_username)
+            # --- Fetch Repositories ---
+            repositories = await self.get_github_repositories(client, github_username)
 
-        return Response({"github_url": github_profile_url, "repositories": repositories}, status=status.HTTP_200_OK)
+        return JsonResponse({"github_url": github_profile_url, "repositories": repositories}, status=status.HTTP_200_OK)
 
-    def get_github_repositories(self, username):
+    async def get_github_repositories(self, client, username):
         """ Fetch all repositories for a given GitHub username. """
         url = f"https://api.github.com/users/{username}/repos"
-        response = requests.get(url)
+        try:
+            response = await client.get(url)
+        except UpstreamError as e:
+            logger.error(f"Failed to fetch repositories for {username}: {e}")
+            return []
 
-        if response.status_code == 200:
-            repos = response.json()
+        if response.status == 200:
+            repos = response.json() or []
             return [
                 {
                     "name": repo["name"],
@@ -549,43 +655,40 @@ class GitHubProfileView(APIView):
                 for repo in repos
             ]
         else:
-            logger.error(f"Failed to fetch repositories for {username}: {response.status_code}")
+            logger.error(f"Failed to fetch repositories for {username}: {response.status}")
             return []
 
 
-class HuggingFaceProfileView(APIView):
-    permission_classes = [AllowAny]
+class HuggingFaceProfileView(View):
+
+    @staticmethod
+    async def _get_list(client, url, label, username):
+        """GET a Hugging Face listing endpoint; returns [] on failures and non-200 responses."""
+        try:
+            response = await client.get(url)
+        except UpstreamError as e:
+            logger.warning(f"Failed to fetch {label} for user {username}: {e}")
+            return []
+        if response.status != 200:
+            logger.warning(
+                f"Failed to fetch {label} for user {username}. "
+                f"Status code: {response.status}"
+            )
+            return []
+        return response.json() or []
 
     @staticmethod
-    def get_huggingface_resources(username):
+    async def get_huggingface_resources(client, username):
         """
-        Fetch models and datasets associated with a Hugging Face username.
+        Fetch models and datasets associated with a Hugging Face username (concurrently).
         """
         models_url = f"https://huggingface.co/api/models?author={username}"
         datasets_url = f"https://huggingface.co/api/datasets?author={username}"
 
-        models_response = requests.get(models_url)
-        datasets_response = requests.get(datasets_url)
-
-        # Handle non-200 responses for models
-        if models_response.status_code != 200:
-            logger.warning(
-                f"Failed to fetch models for user {username}. "
-                f"Status code: {models_response.status_code}"
-            )
-            models = []
-        else:
-            models = models_response.json() if models_response.content else []
-
-        # Handle non-200 responses for datasets
-        if datasets_response.status_code != 200:
-            logger.warning(
-                f"Failed to fetch datasets for user {username}. "
-                f"Status code: {datasets_response.status_code}"
-            )
-            datasets = []
-        else:
-            datasets = datasets_response.json() if datasets_response.content else []
+        models, datasets = await asyncio.gather(
+            HuggingFaceProfileView._get_list(client, models_url, "models", username),
+            HuggingFaceProfileView._get_list(client, datasets_url, "datasets", username),
+        )
 
         model_links = [
             f"https://huggingface.co/{model['id']}"
@@ -621,25 +724,30 @@ class HuggingFaceProfileView(APIView):
         ]
 
     @staticmethod
-    def find_valid_username(first_name, last_name):
+    async def find_valid_username(client, first_name, last_name):
         """
         Check Hugging Face API for valid usernames from generated possibilities.
-        Returns the first valid username found, or None if none match.
+        All candidates are checked concurrently; returns the first valid username in
+        pattern order, or None if none match.
         """
         possibilities = HuggingFaceProfileView.generate_possible_usernames(first_name, last_name)
-        for username in possibilities:
-            # Query the user's models to check existence
-            response = requests.get(f"https://huggingface.co/api/models?author={username}")
+
+        async def has_models(username):
             # If the request is OK and the JSON array is non-empty, we consider that username valid
-            if response.status_code == 200 and response.json():
-                return username
-        return None
+            try:
+                response = await client.get(f"https://huggingface.co/api/models?author={username}")
+            except UpstreamError:
+                return False
+            return response.status == 200 and bool(response.json())
 
-    def get(self, request):
+        found = await asyncio.gather(*(has_models(username) for username in possibilities))
+        return next((username for username, valid in zip(possibilities, found) if valid), None)
+
+    async def get(self, request):
         # Grab the entire name from the query parameter
         full_name = request.GET.get("name", "").strip()
         if not full_name:
-            return Response(
+            return JsonResponse(
                 {"error": "The 'name' parameter is required (e.g. 'Heiko Paulheim')."},
                 status=status.HTTP_400_BAD_REQUEST
             )
@@ -647,33 +755,45 @@ class HuggingFaceProfileView(APIView):
         # Split name into first and last; require at least two words
         parts = full_name.split()
         if len(parts) < 2:
-            return Response(
+            return JsonResponse(
                 {"error": "Please provide at least first and last name (e.g. 'Heiko Paulheim')."},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
         first_name, last_name = parts[0], parts[-1]
 
-        # --- Attempt to find a valid Hugging Face username ---
-        logger.info(f"Searching Hugging Face for user: {first_name} {last_name}")
-        username = self.__class__.find_valid_username(first_name, last_name)
+        async with client_session("huggingface") as client:
+            # --- Attempt to find a valid Hugging Face username ---
+            logger.info(f"Searching Hugging Face for user: {first_name} {last_name}")
+            username = await self.find_valid_username(client, first_name, last_name)
 
-        if not username:
-            logger.warning(f"No Hugging Face user found for {full_name}")
-            return Response(
-                {"huggingface_url": "No Hugging Face profile found", "models": [], "datasets": []},
-                status=status.HTTP_200_OK
-            )
+            if not username:
+                logger.warning(f"No Hugging Face user found for {full_name}")
+                return JsonResponse(
+                    {"huggingface_url": "No Hugging Face profile found", "models": [], "datasets": []},
+                    status=status.HTTP_200_OK
+                )
 
-        # --- If found, fetch models and datasets ---
-        model_links, dataset_links = self.__class__.get_huggingface_resources(username)
+            # --- If found, fetch models and datasets ---
+            model_links, dataset_links = await self.get_huggingface_resources(client, username)
         huggingface_profile_url = f"https://huggingface.co/{username}"
 
-        return Response(
+        return JsonResponse(
             {
                 "huggingface_url": huggingface_profile_url,
                 "models": model_links,
                 "datasets": dataset_links
             },
             status=status.HTTP_200_OK
-        )
\ No newline at end of file
+        )
+
+
+class HttpMetricsView(View):
+    """Per-upstream call counters, latency and connection pool usage of this worker."""
+
+    def get(self, request):
+        return JsonResponse({
+            **http_client.metrics(),
+            "ollama_backends": get_ollama_pool().stats(),
+            "topic_batching": get_topic_batcher(settings.OLLAMA_MODEL).stats(),
+        }, status=status.HTTP_200_OK)
@@ -11,6 +11,11 @@ import os
 
 from django.core.asgi import get_asgi_application
 
+from utils import http_client
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 
+# All requests of an ASGI worker share its event loop, so outbound HTTP sessions can be shared too
+http_client.use_shared_sessions()
+
 application = get_asgi_application()
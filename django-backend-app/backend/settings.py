@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import os
 from pathlib import Path
 import mongoengine
 
@@ -154,4 +155,118 @@ mongoengine.connect(
     alias='default'                   # An alias to use in your project
 )
 
-print("DEBUG: Connected to MongoDB in settings.py") 
\ No newline at end of file
+print("DEBUG: Connected to MongoDB in settings.py")
+
+# BaseX server holding the DBLP database (see api/services/basex_pool.py)
+BASEX = {
+    'HOST': os.environ.get('BASEX_HOST', 'localhost'),
+    'PORT': int(os.environ.get('BASEX_PORT', 1984)),
+    'USER': os.environ.get('BASEX_USER', 'admin'),
+    'PASSWORD': os.environ.get('BASEX_PASSWORD', 'admin'),
+    'DATABASE': os.environ.get('BASEX_DATABASE', 'dblp'),
+    'POOL_SIZE': int(os.environ.get('BASEX_POOL_SIZE', 8)),         # Max open sessions per process
+    'CHECKOUT_TIMEOUT': float(os.environ.get('BASEX_CHECKOUT_TIMEOUT', 10)),  # Seconds to wait for a free session
+    'HEALTHCHECK_INTERVAL': float(os.environ.get('BASEX_HEALTHCHECK_INTERVAL', 30)),  # Ping idle sessions older than this
+} 
+
+# Precomputed author -> record index built by
+# dblp_parser_preprocessing/parser/build_author_index.py (see api/services/author_index.py).
+# When it is missing, author lookups fall back to BaseX.
+DBLP_AUTHOR_INDEX_DIR = os.environ.get('DBLP_AUTHOR_INDEX_DIR', str(BASE_DIR / 'data' / 'dblp_index'))
+
+# CORE conference/journal rankings and the venue -> rank table precomputed from them by
+# `manage.py build_venue_ranks` (see api/services/venue_ranks.py).
+CORE_RANKS_FILE = os.environ.get('CORE_RANKS_FILE', str(BASE_DIR / 'data' / 'CORE.csv'))
+VENUE_RANKS_FILE = os.environ.get('VENUE_RANKS_FILE', str(BASE_DIR / 'data' / 'dblp_index' / 'venue_ranks.json'))
+
+# Ollama servers used for topic and description generation (see api/services/ollama_pool.py),
+# comma-separated. Requests go to the least-loaded healthy server; one that fails
+# OLLAMA_FAILURE_THRESHOLD times in a row is skipped for OLLAMA_COOLDOWN seconds.
+# OLLAMA_PARALLEL should match the servers' OLLAMA_NUM_PARALLEL.
+OLLAMA_URLS = [url.strip() for url in os.environ.get(
+    'OLLAMA_URLS', 'http://localhost:11434,http://localhost:11435'
+).split(',') if url.strip()]
+OLLAMA_FAILURE_THRESHOLD = int(os.environ.get('OLLAMA_FAILURE_THRESHOLD', 3))
+OLLAMA_COOLDOWN = float(os.environ.get('OLLAMA_COOLDOWN', 30))
+OLLAMA_PARALLEL = int(os.environ.get('OLLAMA_PARALLEL', 1))
+
+# Default model for generation. OLLAMA_KEEP_ALIVE is how long a server keeps it loaded after
+# a request (Ollama duration string, "-1" for forever); add "ollama_model" to
+# WARM_UP_RESOURCES to load it on every server at startup. OLLAMA_RATE caps requests per
+# second across all servers, with bursts of OLLAMA_BURST (0 means no cap).
+OLLAMA_MODEL = os.environ.get('OLLAMA_MODEL', 'mistral')
+OLLAMA_KEEP_ALIVE = os.environ.get('OLLAMA_KEEP_ALIVE', '30m')
+OLLAMA_RATE = float(os.environ.get('OLLAMA_RATE', 0))
+OLLAMA_BURST = int(os.environ.get('OLLAMA_BURST', 4))
+
+# Topic extraction packs papers into each prompt up to the model's context window
+# (OLLAMA_CONTEXT_WINDOW tokens, or per model via OLLAMA_CONTEXT_WINDOWS, e.g.
+# "mistral=8192,gemma:2b=8192") and at most OLLAMA_TOPIC_BATCH_MAX papers, lowering that
+# limit while larger batches fail to parse (see api/services/topic_batching.py). The window is
+# sent as num_ctx with every Ollama request, preloads included, so the model is not reloaded
+# when the context size changes between calls. Token counts use the Hugging Face tokenizer
+# named by OLLAMA_TOKENIZER (e.g. "mistralai/Mistral-7B-v0.1"), or a conservative estimate
+# when it is empty.
+OLLAMA_CONTEXT_WINDOW = int(os.environ.get('OLLAMA_CONTEXT_WINDOW', 4096))
+OLLAMA_CONTEXT_WINDOWS = {
+    model.strip(): int(tokens)
+    for model, _, tokens in (
+        item.rpartition('=') for item in os.environ.get('OLLAMA_CONTEXT_WINDOWS', '').split(',') if '=' in item
+    )
+}
+OLLAMA_TOPIC_BATCH_MAX = int(os.environ.get('OLLAMA_TOPIC_BATCH_MAX', 16))
+OLLAMA_TOKENIZER = os.environ.get('OLLAMA_TOKENIZER', '')
+
+# Comma-separated names of resources registered in api/resources.py (e.g.
+# "venue_ranker,venue_rank_table,author_index") to load in the background when a worker
+# starts. Everything else is loaded on first use.
+WARM_UP_RESOURCES = [name.strip() for name in os.environ.get('WARM_UP_RESOURCES', '').split(',') if name.strip()]
+
+# OpenAlex access (see api/services/openalex_service.py). Setting OPENALEX_MAILTO to a contact
+# address puts requests in OpenAlex's polite pool; requests share a token bucket of
+# OPENALEX_RATE per second (the API allows 10) with up to OPENALEX_CONCURRENCY batches in flight.
+# The rate is halved on every 429 (not below OPENALEX_MIN_RATE) and grows back on successes.
+OPENALEX_MAILTO = os.environ.get('OPENALEX_MAILTO', '')
+OPENALEX_RATE = float(os.environ.get('OPENALEX_RATE', 8))
+OPENALEX_MIN_RATE = float(os.environ.get('OPENALEX_MIN_RATE', 0.5))
+OPENALEX_BURST = int(os.environ.get('OPENALEX_BURST', 4))
+OPENALEX_CONCURRENCY = int(os.environ.get('OPENALEX_CONCURRENCY', 4))
+
+# DOI -> abstract/citation cache shared by all enrichment paths (see api/services/enrichment_cache.py).
+# Entries older than ENRICHMENT_MAX_AGE_DAYS are fetched again, mainly to refresh citation counts.
+ENRICHMENT_MAX_AGE_DAYS = int(os.environ.get('ENRICHMENT_MAX_AGE_DAYS', 30))
+ENRICHMENT_CACHE_SIZE = int(os.environ.get('ENRICHMENT_CACHE_SIZE', 50000))  # Entries kept in process
+
+# Semantic Scholar API access (see api/services/semantic_scholar.py). Upstream calls share a
+# token bucket of SEMANTIC_SCHOLAR_RATE requests per second; an API key raises the limit.
+SEMANTIC_SCHOLAR_API_KEY = os.environ.get('SEMANTIC_SCHOLAR_API_KEY', '')
+SEMANTIC_SCHOLAR_RATE = float(os.environ.get('SEMANTIC_SCHOLAR_RATE', 1))
+SEMANTIC_SCHOLAR_BURST = int(os.environ.get('SEMANTIC_SCHOLAR_BURST', 1))
+SEMANTIC_SCHOLAR_CONCURRENCY = int(os.environ.get('SEMANTIC_SCHOLAR_CONCURRENCY', 4))  # Pages in flight per author
+
+# Semantic Scholar responses are cached in-process (LRU) and, when SEMANTIC_SCHOLAR_CACHE_URL
+# is set, in a shared tier: "redis://host:6379/0" (needs the `redis` package) or a directory
+# path for an on-disk cache. Entries are fresh for CACHE_TTL seconds and then served stale
+# for up to CACHE_STALE_TTL more seconds while being refreshed (see api/services/semantic_scholar.py).
+SEMANTIC_SCHOLAR_CACHE_URL = os.environ.get('SEMANTIC_SCHOLAR_CACHE_URL', '')
+SEMANTIC_SCHOLAR_CACHE_SIZE = int(os.environ.get('SEMANTIC_SCHOLAR_CACHE_SIZE', 2048))
+SEMANTIC_SCHOLAR_CACHE_TTL = int(os.environ.get('SEMANTIC_SCHOLAR_CACHE_TTL', 24 * 3600))
+SEMANTIC_SCHOLAR_CACHE_STALE_TTL = int(os.environ.get('SEMANTIC_SCHOLAR_CACHE_STALE_TTL', 7 * 24 * 3600))
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+}
+if SEMANTIC_SCHOLAR_CACHE_URL.startswith(('redis://', 'rediss://')):
+    CACHES['semantic_scholar'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': SEMANTIC_SCHOLAR_CACHE_URL,
+        'KEY_PREFIX': 's2',
+    }
+elif SEMANTIC_SCHOLAR_CACHE_URL:
+    CACHES['semantic_scholar'] = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': SEMANTIC_SCHOLAR_CACHE_URL,
+        'OPTIONS': {'MAX_ENTRIES': 100000},
+    }
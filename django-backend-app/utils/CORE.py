@@ -1,4 +1,7 @@
-import pandas as pd
+import csv
+import threading
+from collections import OrderedDict
+
 from rapidfuzz import process, fuzz  # Use rapidfuzz instead of fuzzywuzzy for better performance
 
 
@@ -24,4 +27,95 @@ def fuzzy_match(df, search_string, col1='name', col2='abbreviation', threshold=8
         matched_row = df[df[match_column] == best_match]
         return matched_row['rank'].values[0]
     
-    return None
\ No newline at end of file
+    return None
+
+
+class VenueRanker:
+    """
+    CORE rank lookup for venue names. Same matching rules as `fuzzy_match` (best
+    `fuzz.ratio` over names and abbreviations, abbreviation wins only with a strictly
+    higher score), but the choices are loaded once, all venues of a profile are
+    scored in one `process.cdist` call, and results are memoized per venue string.
+
+    `entries` holds the CORE rows as (id, name, abbreviation, rank) tuples; `match_many`
+    returns positions in that list, which the precomputed venue table stores.
+    """
+
+    def __init__(self, entries, threshold=80, cache_size=4096):
+        self.entries = list(entries)
+        self.threshold = threshold
+        self.cache_size = cache_size
+        self._names, self._name_entries = self._choices(1)
+        self._abbreviations, self._abbreviation_entries = self._choices(2)
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _choices(self, column):
+        """Non-empty values of a column and value -> entry position (first row wins, like `fuzzy_match`)."""
+        choices, value_entries = [], {}
+        for position, entry in enumerate(self.entries):
+            value = entry[column]
+            if value:
+                choices.append(value)
+                value_entries.setdefault(value, position)
+        return choices, value_entries
+
+    @staticmethod
+    def read_csv(path):
+        """Read a CORE export (id, name, abbreviation, source, rank, ...) without pandas."""
+        with open(path, newline="", encoding="utf-8") as f:
+            return [(row[0], row[1], row[2], row[4]) for row in csv.reader(f) if len(row) >= 5]
+
+    @classmethod
+    def from_csv(cls, path, **kwargs):
+        return cls(cls.read_csv(path), **kwargs)
+
+    def _best(self, venues, choices, value_entries):
+        """(score, entry position) of the best choice for every venue, or (0, None) below the threshold."""
+        if not choices:
+            return [(0, None)] * len(venues)
+        scores = process.cdist(venues, choices, scorer=fuzz.ratio,
+                               score_cutoff=self.threshold, workers=-1)
+        best = scores.argmax(axis=1)
+        results = []
+        for row, column in enumerate(best):
+            score = scores[row, column]
+            results.append((score, value_entries[choices[column]]) if score >= self.threshold else (0, None))
+        return results
+
+    def match_many(self, venues):
+        """Return {venue: position in `entries` or None} for a list of venue strings, bypassing the cache."""
+        venues = list(dict.fromkeys(venues))
+        if not venues:
+            return {}
+        by_name = self._best(venues, self._names, self._name_entries)
+        by_abbreviation = self._best(venues, self._abbreviations, self._abbreviation_entries)
+        matches = {}
+        for venue, (name_score, name_entry), (abbr_score, abbr_entry) in zip(venues, by_name, by_abbreviation):
+            matches[venue] = abbr_entry if abbr_entry is not None and abbr_score > name_score else name_entry
+        return matches
+
+    def rank_many(self, venues):
+        """Return {venue: CORE rank or None} for an iterable of venue strings."""
+        ranks, missing = {}, []
+        with self._lock:
+            for venue in dict.fromkeys(venues):
+                if venue in self._cache:
+                    self._cache.move_to_end(venue)
+                    ranks[venue] = self._cache[venue]
+                else:
+                    missing.append(venue)
+
+        if missing:
+            matches = self.match_many(missing)
+            with self._lock:
+                for venue, position in matches.items():
+                    rank = self.entries[position][3] if position is not None else None
+                    ranks[venue] = self._cache[venue] = rank
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return ranks
+
+    def rank(self, venue):
+        """CORE rank of a single venue, or None if nothing matches closely enough."""
+        return self.rank_many([venue])[venue]
@@ -1,9 +1,9 @@
 import re
-import requests
 
-def get_researcher_description(name, paper_titles):
-    url = "http://localhost:11434/api/generate"
+from api.services.ollama_pool import OllamaUnavailable, get_ollama_pool
+from utils.http_client import sync_session
 
+def get_researcher_description(name, paper_titles):
     papers_str = "; ".join(paper_titles) if paper_titles else "No published papers listed"
 
     prompt = (
@@ -23,7 +23,11 @@ def get_researcher_description(name, paper_titles):
         "options": {"seed": 42}
     }
     
-    response = requests.post(url, json=payload)
+    try:
+        with get_ollama_pool().lease() as backend:
+            response = sync_session("ollama").post(f"{backend.url}/api/generate", json=payload)
+    except OllamaUnavailable as e:
+        return f"Error: {e}"
     
     if response.status_code == 200:
         output_text = response.json().get("response", "")
@@ -1,4 +1,5 @@
-import requests
+from api.services.enrichment_cache import get_enrichment_cache
+from utils.http_client import sync_session
 
 
 def reconstruct_abstract(inverted_index):
@@ -19,19 +20,33 @@ def reconstruct_abstract(inverted_index):
     return " ".join(abstract_words)
 
 
-def get_abstract_from_openalex(title):
+def get_abstract_from_openalex(title, doi=None):
     """
     Fetches paper abstract from OpenAlex by title and converts it to plain text.
+    When the DOI is known, the enrichment cache is consulted first; search results
+    are added to the cache under the DOI OpenAlex returns.
     """
+    cache = get_enrichment_cache()
+    if doi:
+        entry = cache.get_many([doi]).get(doi)
+        if entry and entry.get("abstract"):
+            return entry["abstract"]
+
     base_url = "https://api.openalex.org/works"
     params = {"search": title, "per_page": 1}
-    response = requests.get(base_url, params=params)
+    response = sync_session("openalex").get(base_url, params=params)
 
     if response.status_code == 200:
         data = response.json()
         if "results" in data and len(data["results"]) > 0:
             paper = data["results"][0]
             inverted_index = paper.get("abstract_inverted_index", {})
+            if paper.get("doi"):
+                cache.put_many({paper["doi"]: {
+                    "title": paper.get("title"),
+                    "abstract": reconstruct_abstract(inverted_index) if inverted_index else None,
+                    "citations": paper.get("cited_by_count"),
+                }}, source="openalex")
             return reconstruct_abstract(inverted_index)
 
     return "Abstract not found"
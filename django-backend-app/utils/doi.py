@@ -0,0 +1,21 @@
+import re
+
+# Matches a DOI either bare ("10.1145/123") or inside a resolver link
+# ("https://doi.org/10.1145/123", "http://dx.doi.org/10.1145/123").
+DOI_PATTERN = re.compile(r"^(?:https?://(?:dx\.)?doi\.org/|doi:)?(10\.\d{4,9}/\S+)$", re.IGNORECASE)
+
+
+def normalize_doi(value):
+    """
+    Return the lower-cased bare DOI for a DOI or DOI link, or None if `value` is not one.
+    DOIs are case-insensitive, so this is the form used for lookups and indexes.
+    """
+    if not value:
+        return None
+    match = DOI_PATTERN.match(value.strip())
+    return match.group(1).lower() if match else None
+
+
+def extract_dois(links):
+    """Normalized DOIs found in a list of publication links, without duplicates."""
+    return list(dict.fromkeys(doi for doi in map(normalize_doi, links) if doi))
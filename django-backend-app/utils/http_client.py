@@ -0,0 +1,342 @@
+import asyncio
+import json
+import logging
+import random
+import threading
+import time
+import weakref
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Mapping
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Central client for every upstream HTTP API (Semantic Scholar, OpenAlex, GitHub,
+# Hugging Face, Ollama). Each upstream gets its own keep-alive connection pool,
+# timeouts and retry policy, and every call is counted in `metrics()`.
+#
+# Async callers use `client_session(upstream)`. Under ASGI every request of a worker
+# runs on the same event loop, so one aiohttp session per upstream and loop is shared
+# by all requests. Under WSGI, Django runs each async view on a fresh event loop, so
+# a session is created and closed per use instead; backend/asgi.py switches to shared
+# sessions. Sync callers (thread pools, management commands) use `sync_session(upstream)`,
+# a process-wide requests.Session per upstream.
+#
+# Neither aiohttp nor requests speaks HTTP/2; pooled HTTP/1.1 keep-alive connections
+# avoid the per-call TCP+TLS handshake, which is where most of the latency went.
+
+
+@dataclass(frozen=True)
+class UpstreamPolicy:
+    connect_timeout: float = 5
+    read_timeout: float = 30
+    pool_size: int = 20                 # Connections kept per host
+    retries: int = 2                    # Extra attempts after the first one
+    backoff: float = 0.5                # Base of the exponential backoff, in seconds
+    max_backoff: float = 30             # Cap for backoff and honoured Retry-After values
+    retry_statuses: frozenset = frozenset({429, 500, 502, 503, 504})
+    retry_methods: frozenset = frozenset({"GET", "HEAD"})
+
+
+UPSTREAMS = {
+    "default": UpstreamPolicy(),
+    "semantic_scholar": UpstreamPolicy(read_timeout=30, pool_size=20, retries=3),
+    # 429s are left to OpenAlexFetcher, whose adaptive rate limiter has to see them
+    "openalex": UpstreamPolicy(read_timeout=30, pool_size=20, retries=3,
+                               retry_statuses=frozenset({500, 502, 503, 504})),
+    "github": UpstreamPolicy(read_timeout=15, pool_size=10),
+    "huggingface": UpstreamPolicy(read_timeout=15, pool_size=20),
+    # Local LLM servers: generation is slow and POSTs are not retried, only connection failures
+    "ollama": UpstreamPolicy(connect_timeout=3, read_timeout=300, pool_size=8, retries=1,
+                             retry_statuses=frozenset({502, 503}), retry_methods=frozenset()),
+}
+
+
+def policy_for(upstream):
+    return UPSTREAMS.get(upstream, UPSTREAMS["default"])
+
+
+class UpstreamError(Exception):
+    """An upstream call failed: transport error, timeout, or (from `get_json`) an HTTP error status."""
+
+    def __init__(self, upstream, message, status=None):
+        super().__init__(f"{upstream}: {message}")
+        self.upstream = upstream
+        self.status = status
+
+
+# ---------------- Metrics -------------------
+
+_metrics_lock = threading.Lock()
+_counters = defaultdict(lambda: defaultdict(int))   # upstream -> counter -> value
+_latency = defaultdict(lambda: [0, 0.0, 0.0])       # upstream -> [count, total seconds, max seconds]
+
+
+def _count(upstream, name, amount=1):
+    with _metrics_lock:
+        _counters[upstream][name] += amount
+
+
+def _record(upstream, status, elapsed):
+    with _metrics_lock:
+        counters = _counters[upstream]
+        counters["responses"] += 1
+        counters[f"status_{status // 100}xx"] += 1
+        latency = _latency[upstream]
+        latency[0] += 1
+        latency[1] += elapsed
+        latency[2] = max(latency[2], elapsed)
+
+
+def retry_after_seconds(value, cap):
+    """Parse a Retry-After header (seconds or HTTP date); None if absent or invalid."""
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0), cap)
+
+
+# ---------------- Sync (requests) -------------------
+
+class _PolicyAdapter(HTTPAdapter):
+    """HTTPAdapter that applies the upstream's timeouts when the caller does not pass one."""
+
+    def __init__(self, upstream, policy):
+        self.upstream = upstream
+        self.policy = policy
+        retry = Retry(
+            total=policy.retries,
+            connect=policy.retries,
+            read=policy.retries if policy.retry_methods else 0,
+            status=policy.retries,
+            backoff_factor=policy.backoff,
+            backoff_max=policy.max_backoff,
+            status_forcelist=policy.retry_statuses,
+            allowed_methods=policy.retry_methods,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        super().__init__(pool_connections=4, pool_maxsize=policy.pool_size, max_retries=retry)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = (self.policy.connect_timeout, self.policy.read_timeout)
+        _count(self.upstream, "requests")
+        start = time.perf_counter()
+        try:
+            response = super().send(request, **kwargs)
+        except requests.RequestException:
+            _count(self.upstream, "errors")
+            raise
+        retries = getattr(response.raw, "retries", None)
+        if retries is not None and retries.history:
+            _count(self.upstream, "retries", len(retries.history))
+        _record(self.upstream, response.status_code, time.perf_counter() - start)
+        return response
+
+
+_sync_sessions = {}
+_sync_lock = threading.Lock()
+
+
+def sync_session(upstream="default"):
+    """Process-wide requests.Session for `upstream`, with pooling, timeouts and retries."""
+    session = _sync_sessions.get(upstream)
+    if session is None:
+        with _sync_lock:
+            session = _sync_sessions.get(upstream)
+            if session is None:
+                session = requests.Session()
+                adapter = _PolicyAdapter(upstream, policy_for(upstream))
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _sync_sessions[upstream] = session
+    return session
+
+
+# ---------------- Async (aiohttp) -------------------
+
+@dataclass
+class UpstreamResponse:
+    status: int
+    headers: Mapping  # Case-insensitive (multidict)
+    body: bytes = field(repr=False)
+
+    def json(self):
+        return json.loads(self.body) if self.body else None
+
+
+class AsyncUpstreamClient:
+    """aiohttp session bound to one upstream's retry policy. Responses are read fully."""
+
+    def __init__(self, upstream, session):
+        self.upstream = upstream
+        self.policy = policy_for(upstream)
+        self.session = session
+
+    def _delay(self, attempt, retry_after=None):
+        if retry_after is not None:
+            return retry_after
+        delay = min(self.policy.max_backoff, self.policy.backoff * (2 ** attempt))
+        return delay * random.uniform(0.5, 1.0)  # Jitter so concurrent retries spread out
+
+    async def request(self, method, url, idempotent=None, **kwargs):
+        """
+        Send a request, retrying transport failures and retryable statuses (honouring
+        Retry-After) according to the upstream policy. `idempotent` overrides the policy's
+        retry_methods for read-only POST endpoints. Returns the last response, which may
+        still carry an error status; raises UpstreamError if no response was received.
+        """
+        retryable = method.upper() in self.policy.retry_methods if idempotent is None else idempotent
+        attempt = 0
+        while True:
+            _count(self.upstream, "requests")
+            start = time.perf_counter()
+            try:
+                async with self.session.request(method, url, **kwargs) as response:
+                    body = await response.read()
+                    result = UpstreamResponse(response.status, response.headers.copy(), body)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                _count(self.upstream, "errors")
+                # Requests that may already have reached the upstream are only retried if idempotent
+                connect_failure = isinstance(e, aiohttp.ClientConnectorError)
+                if attempt >= self.policy.retries or not (retryable or connect_failure):
+                    raise UpstreamError(self.upstream, f"{method} {url} failed: {e!r}") from e
+                delay = self._delay(attempt)
+            else:
+                _record(self.upstream, result.status, time.perf_counter() - start)
+                if (not retryable or result.status not in self.policy.retry_statuses
+                        or attempt >= self.policy.retries):
+                    return result
+                retry_after = retry_after_seconds(result.headers.get("Retry-After"), self.policy.max_backoff)
+                delay = self._delay(attempt, retry_after)
+
+            attempt += 1
+            _count(self.upstream, "retries")
+            logger.info(f"Retrying {self.upstream} {method} {url} in {delay:.1f}s (attempt {attempt + 1})")
+            await asyncio.sleep(delay)
+
+    async def get(self, url, **kwargs):
+        return await self.request("GET", url, **kwargs)
+
+    async def get_json(self, url, **kwargs):
+        """GET `url` and return its decoded JSON body; raises UpstreamError on error statuses."""
+        return self._decode("GET", url, await self.get(url, **kwargs))
+
+    async def post_json(self, url, idempotent=None, **kwargs):
+        """POST to `url` and return the decoded JSON body; raises UpstreamError on error statuses."""
+        return self._decode("POST", url, await self.request("POST", url, idempotent=idempotent, **kwargs))
+
+    def _decode(self, method, url, response):
+        if response.status >= 400:
+            raise UpstreamError(self.upstream, f"{method} {url} returned {response.status}", status=response.status)
+        return response.json()
+
+
+_shared = False
+_sessions = weakref.WeakKeyDictionary()  # event loop -> {upstream: ClientSession}
+
+
+def use_shared_sessions():
+    """Share one session per upstream and event loop; call once from the ASGI entry point."""
+    global _shared
+    _shared = True
+
+
+def _new_session(policy):
+    connector = aiohttp.TCPConnector(
+        limit=policy.pool_size * 4,
+        limit_per_host=policy.pool_size,
+        ttl_dns_cache=300,
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=None, connect=policy.connect_timeout, sock_read=policy.read_timeout
+    )
+    return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+
+@asynccontextmanager
+async def client_session(upstream="default"):
+    """
+    Yield an AsyncUpstreamClient for `upstream`. The shared session is not closed on
+    exit; a per-use session (WSGI) is.
+    """
+    policy = policy_for(upstream)
+    if not _shared:
+        async with _new_session(policy) as session:
+            yield AsyncUpstreamClient(upstream, session)
+        return
+
+    loop_sessions = _sessions.setdefault(asyncio.get_running_loop(), {})
+    session = loop_sessions.get(upstream)
+    if session is None or session.closed:
+        session = loop_sessions[upstream] = _new_session(policy)
+    yield AsyncUpstreamClient(upstream, session)
+
+
+# ---------------- Reporting -------------------
+
+def _sync_pool_stats(session):
+    pools = []
+    for adapter in set(session.adapters.values()):
+        for key in adapter.poolmanager.pools.keys():
+            pool = adapter.poolmanager.pools.get(key)
+            if pool is None:
+                continue
+            pools.append({
+                "host": f"{pool.scheme}://{pool.host}:{pool.port}",
+                "connections_opened": pool.num_connections,
+                "requests": pool.num_requests,
+                "idle": pool.pool.qsize() if pool.pool is not None else 0,
+                "max_size": pool.pool.maxsize if pool.pool is not None else 0,
+            })
+    return pools
+
+
+def _async_pool_stats(session):
+    connector = session.connector
+    if connector is None or connector.closed:
+        return None
+    # aiohttp has no public pool introspection; these attributes are stable across 3.x
+    idle = getattr(connector, "_conns", {})
+    return {
+        "in_use": len(getattr(connector, "_acquired", ())),
+        "idle": sum(len(conns) for conns in idle.values()),
+        "limit": connector.limit,
+        "limit_per_host": connector.limit_per_host,
+    }
+
+
+def metrics():
+    """Snapshot of per-upstream call counters, latency and connection pool usage."""
+    with _metrics_lock:
+        report = {}
+        for upstream in set(_counters) | set(_sync_sessions):
+            count, total, worst = _latency.get(upstream, (0, 0.0, 0.0))
+            report[upstream] = {
+                **_counters.get(upstream, {}),
+                "latency_avg_ms": round(total / count * 1000, 1) if count else None,
+                "latency_max_ms": round(worst * 1000, 1) if count else None,
+            }
+
+    for upstream, session in list(_sync_sessions.items()):
+        report.setdefault(upstream, {})["sync_pools"] = _sync_pool_stats(session)
+    for loop_sessions in list(_sessions.values()):
+        for upstream, session in list(loop_sessions.items()):
+            stats = _async_pool_stats(session)
+            if stats:
+                report.setdefault(upstream, {}).setdefault("async_pools", []).append(stats)
+    return report
@@ -1,6 +1,3 @@
-from keybert import KeyBERT
-
-
 class KeywordExtractor:
     """
     Keyword extractor class utilized KeyBERT to generate keywords.
@@ -15,6 +12,7 @@ class KeywordExtractor:
     Where first element in tuple is a keyword and second is the similarity score with whole doc.
     """
     def __init__(self):
+        from keybert import KeyBERT  # Pulls in sentence-transformers/torch, only import when used
         self.kw_model = KeyBERT()
 
 
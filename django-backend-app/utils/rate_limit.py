@@ -0,0 +1,94 @@
+import asyncio
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncTokenBucket:
+    """
+    Token bucket for upstream calls: `rate` requests per second on average, with bursts
+    of up to `burst` requests.
+
+    State is guarded by a threading lock rather than an asyncio primitive, so one bucket
+    can be shared by every event loop and thread of a process. Callers reserve a slot
+    and then sleep until it comes up, which keeps waiting callers in FIFO order.
+    """
+
+    def __init__(self, rate, burst=1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        """Add the tokens accrued since the last update; call with the lock held."""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _reserve(self):
+        """Take one token, going into debt if none is left; returns the seconds to wait."""
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def pause(self, seconds):
+        """Hold back every caller for at least `seconds` (e.g. an upstream Retry-After)."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, -seconds * self.rate)
+
+    async def acquire(self):
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def acquire_sync(self):
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class AdaptiveRateLimiter(AsyncTokenBucket):
+    """
+    Token bucket whose rate follows the upstream's throttling (AIMD): every success
+    adds `increase` requests per second spread over one second of traffic, every 429
+    multiplies the rate by `decrease`, and a Retry-After value pauses all callers.
+
+    Throttles reported within `cooldown` seconds of the last decrease do not decrease
+    the rate again, since they usually come from requests that were already in flight.
+    """
+
+    def __init__(self, rate, burst=1, min_rate=0.5, max_rate=None, increase=1.0, decrease=0.5,
+                 cooldown=1.0, name="upstream"):
+        super().__init__(rate, burst)
+        self.min_rate = min_rate
+        self.max_rate = max_rate or rate
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.name = name
+        self._last_decrease = float("-inf")
+
+    def on_success(self):
+        with self._lock:
+            if self.rate < self.max_rate:
+                self._refill()
+                self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+
+    def on_throttle(self, retry_after=None):
+        with self._lock:
+            self._refill()
+            now = time.monotonic()
+            if now - self._last_decrease >= self.cooldown:
+                self._last_decrease = now
+                self.rate = max(self.min_rate, self.rate * self.decrease)
+                logger.warning(f"{self.name} throttled; lowering rate to {self.rate:.2f} req/s")
+        if retry_after:
+            self.pause(retry_after)
@@ -0,0 +1,67 @@
+import importlib
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class LazyRegistry:
+    """
+    Process-wide registry of heavy resources (CORE tables, models, indexes) that are
+    created on first use instead of at import time.
+
+    Factories are callables or "package.module.attribute" paths, so registering a
+    resource does not import anything; the module is only imported when the resource
+    is first requested.
+    """
+
+    def __init__(self):
+        self._factories = {}
+        self._instances = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, factory):
+        with self._lock:
+            self._factories[name] = factory
+            self._locks.setdefault(name, threading.Lock())
+
+    def is_loaded(self, name):
+        return name in self._instances
+
+    def _resolve(self, factory):
+        if callable(factory):
+            return factory
+        module_path, attribute = factory.rsplit(".", 1)
+        return getattr(importlib.import_module(module_path), attribute)
+
+    def get(self, name):
+        """Return the resource, creating it on the first call. Concurrent first calls create it once."""
+        if name in self._instances:
+            return self._instances[name]
+        if name not in self._factories:
+            raise KeyError(f"No resource registered under '{name}'")
+
+        with self._locks[name]:
+            if name not in self._instances:
+                start = time.perf_counter()
+                self._instances[name] = self._resolve(self._factories[name])()
+                logger.info(f"Loaded resource '{name}' in {time.perf_counter() - start:.2f}s")
+        return self._instances[name]
+
+    def warm_up(self, names):
+        """Load the given resources now, logging (not raising) failures."""
+        for name in names:
+            try:
+                self.get(name)
+            except Exception as e:
+                logger.error(f"Failed to warm up resource '{name}': {e}")
+
+    def warm_up_in_background(self, names):
+        thread = threading.Thread(target=self.warm_up, args=(list(names),), daemon=True)
+        thread.start()
+        return thread
+
+
+registry = LazyRegistry()
@@ -0,0 +1,250 @@
+import asyncio
+import logging
+import threading
+import time
+import weakref
+from collections import OrderedDict, defaultdict
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """
+    Two-tier cache for upstream API responses with stale-while-revalidate and request
+    coalescing.
+
+    The first tier is an in-process LRU; the optional second tier is any Django cache
+    (Redis, file-based, ...) shared between workers. An entry is fresh for `ttl`
+    seconds and is then served stale for up to `stale_ttl` more seconds while a single
+    background refresh runs. Concurrent misses for the same key on an event loop share
+    one upstream call. Failed fetches are not cached.
+
+    Background refreshes run on the caller's event loop, which under ASGI outlives the
+    request. Under WSGI the loop ends with the request and may cancel the refresh; the
+    entry then simply stays stale until a later request refreshes it.
+    """
+
+    def __init__(self, name, ttl, stale_ttl=0, max_entries=1024, shared=None):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.shared = shared
+        self._memory = OrderedDict()  # key -> {"value": ..., "fetched_at": epoch seconds}
+        self._lock = threading.Lock()
+        self._inflight = weakref.WeakKeyDictionary()  # event loop -> {key: Task or Future}
+        self._background = set()  # Strong references so unawaited fetches are not collected
+        self._stats = defaultdict(int)
+
+    # ---------------- Tiers -------------------
+
+    def _memory_get(self, key):
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+            return entry
+
+    def _memory_set(self, key, entry):
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    async def _shared_set(self, key, entry):
+        if self.shared is None:
+            return
+        try:
+            await self.shared.aset(key, entry, timeout=self.ttl + self.stale_ttl)
+        except Exception as e:
+            logger.warning(f"{self.name} cache: shared tier write failed: {e}")
+
+    # ---------------- Lookups -------------------
+
+    async def _lookup(self, keys):
+        """Return {key: entry} for the keys found in memory or in the shared tier."""
+        entries = {}
+        for key in keys:
+            entry = self._memory_get(key)
+            if entry is not None:
+                entries[key] = entry
+        remaining = [key for key in keys if key not in entries]
+        if remaining and self.shared is not None:
+            try:
+                shared = await self.shared.aget_many(remaining)
+            except Exception as e:
+                logger.warning(f"{self.name} cache: shared tier read failed: {e}")
+                shared = {}
+            for key, entry in shared.items():
+                self._count("shared_hits")
+                self._memory_set(key, entry)
+                entries[key] = entry
+        return entries
+
+    def _freshness(self, entry):
+        """'fresh', 'stale' or None (expired) for a cache entry."""
+        age = time.time() - entry["fetched_at"]
+        if age < self.ttl:
+            return "fresh"
+        if age < self.ttl + self.stale_ttl:
+            return "stale"
+        return None
+
+    async def get_or_fetch(self, key, fetch):
+        """
+        Return the cached value for `key`, calling the coroutine function `fetch` on a
+        miss. Values must be picklable when a shared tier is configured and must not be
+        mutated by callers, since they are shared between requests.
+        """
+        entry = (await self._lookup([key])).get(key)
+        freshness = self._freshness(entry) if entry is not None else None
+        if freshness == "fresh":
+            self._count("hits")
+            return entry["value"]
+        if freshness == "stale":
+            self._count("stale_hits")
+            self._revalidate(self._fetch_once(key, fetch))
+            return entry["value"]
+
+        self._count("misses")
+        return await asyncio.shield(self._fetch_once(key, fetch))
+
+    async def get_or_fetch_many(self, keys, fetch_many):
+        """
+        Batch variant of `get_or_fetch`. Keys that miss (and are not already being fetched)
+        are passed together to the coroutine function `fetch_many(keys)`, which returns
+        {key: value}. Returns {key: value} for every key; keys the upstream did not return
+        map to None and are not cached.
+        """
+        keys = list(dict.fromkeys(keys))
+        entries = await self._lookup(keys)
+        values, missing, stale = {}, [], []
+        for key in keys:
+            entry = entries.get(key)
+            freshness = self._freshness(entry) if entry is not None else None
+            if freshness is not None:
+                self._count("hits" if freshness == "fresh" else "stale_hits")
+                values[key] = entry["value"]
+                if freshness == "stale":
+                    stale.append(key)
+            else:
+                self._count("misses")
+                missing.append(key)
+
+        if stale:
+            for future in self._fetch_batch_once(stale, fetch_many).values():
+                self._revalidate(future)
+        if missing:
+            waiting = self._fetch_batch_once(missing, fetch_many)
+            results = await asyncio.gather(*(asyncio.shield(f) for f in waiting.values()), return_exceptions=True)
+            for key, result in zip(waiting, results):
+                if isinstance(result, BaseException):
+                    raise result
+                values[key] = result
+        return values
+
+    def _fetch_once(self, key, fetch):
+        """Return the in-flight fetch for `key`, starting one if there is none."""
+        loop = asyncio.get_running_loop()
+        inflight = self._inflight.setdefault(loop, {})
+        future = inflight.get(key)
+        if future is not None:
+            self._count("coalesced")
+            return future
+
+        future = loop.create_task(self._fetch_and_store(key, fetch))
+        inflight[key] = future
+        future.add_done_callback(lambda _: inflight.pop(key, None))
+        return future
+
+    def _fetch_batch_once(self, keys, fetch_many):
+        """
+        Return {key: future} for `keys`, joining fetches already in flight and starting
+        a single `fetch_many` call for the rest.
+        """
+        loop = asyncio.get_running_loop()
+        inflight = self._inflight.setdefault(loop, {})
+        futures, new_keys = {}, []
+        for key in keys:
+            if key in inflight:
+                self._count("coalesced")
+                futures[key] = inflight[key]
+            else:
+                new_keys.append(key)
+        if not new_keys:
+            return futures
+
+        pending = {}
+        for key in new_keys:
+            pending[key] = inflight[key] = loop.create_future()
+            pending[key].add_done_callback(lambda _, key=key: inflight.pop(key, None))
+
+        def resolve(task):
+            for key, future in pending.items():
+                if future.done():
+                    continue
+                if task.cancelled():
+                    future.cancel()
+                elif task.exception() is not None:
+                    future.set_exception(task.exception())
+                else:
+                    future.set_result(task.result().get(key))
+
+        task = loop.create_task(self._fetch_many_and_store(new_keys, fetch_many))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        task.add_done_callback(resolve)
+        futures.update(pending)
+        return futures
+
+    def _revalidate(self, future):
+        """Let an in-flight fetch finish in the background, logging its failure."""
+        if future in self._background:
+            return
+        self._background.add(future)
+        future.add_done_callback(self._revalidated)
+
+    def _revalidated(self, future):
+        self._background.discard(future)
+        if not future.cancelled() and future.exception() is not None:
+            logger.warning(f"{self.name} cache: background refresh failed: {future.exception()}")
+
+    async def _fetch_and_store(self, key, fetch):
+        self._count("fetches")
+        value = await fetch()
+        entry = {"value": value, "fetched_at": time.time()}
+        self._memory_set(key, entry)
+        await self._shared_set(key, entry)
+        return value
+
+    async def _fetch_many_and_store(self, keys, fetch_many):
+        self._count("fetches")
+        values = await fetch_many(keys)
+        fetched_at = time.time()
+        entries = {key: {"value": value, "fetched_at": fetched_at}
+                   for key, value in values.items() if value is not None}
+        for key, entry in entries.items():
+            self._memory_set(key, entry)
+        if entries and self.shared is not None:
+            try:
+                await self.shared.aset_many(entries, timeout=self.ttl + self.stale_ttl)
+            except Exception as e:
+                logger.warning(f"{self.name} cache: shared tier write failed: {e}")
+        return values
+
+    # ---------------- Maintenance -------------------
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def invalidate(self, key):
+        with self._lock:
+            self._memory.pop(key, None)
+        if self.shared is not None:
+            self.shared.delete(key)
+
+    def stats(self):
+        with self._lock:
+            return {**self._stats, "entries": len(self._memory)}
@@ -22,12 +22,23 @@ if [ $exit_code -eq 0 ]; then
     # Log start of database creation
     echo "[$(date '+%Y-%m-%d %H:%M:%S')] Creating BaseX database 'dblp'..."
 
-    # Run BaseX command to create the database from the downloaded file
-    basex -c "CREATE DB dblp dblp.xml.gz"
+    # Run BaseX command to create the database from the downloaded file.
+    # The text and attribute indexes serve exact author lookups (author = $name),
+    # the token index serves @key/@publtype lookups and the full-text index
+    # (restricted to <author>) serves the fuzzy name search.
+    basex -c "SET TEXTINDEX true; SET ATTRINDEX true; SET TOKENINDEX true; SET FTINDEX true; SET FTINCLUDE author; CREATE DB dblp dblp.xml.gz"
 
     # Check if BaseX ran successfully
     if [ $? -eq 0 ]; then
         echo "[$(date '+%Y-%m-%d %H:%M:%S')] BaseX database 'dblp' created successfully."
+
+        # Rebuild the author -> record index the backend reads instead of scanning BaseX
+        echo "[$(date '+%Y-%m-%d %H:%M:%S')] Building DBLP author index..."
+        if python3 ./dblp_parser_preprocessing/parser/build_author_index.py dblp.xml.gz ./django-backend-app/data/dblp_index; then
+            echo "[$(date '+%Y-%m-%d %H:%M:%S')] DBLP author index built successfully."
+        else
+            echo "[$(date '+%Y-%m-%d %H:%M:%S')] DBLP author index build failed."
+        fi
     else
         echo "[$(date '+%Y-%m-%d %H:%M:%S')] BaseX database creation failed."
     fi
@@ -75,7 +75,7 @@ const SearchResultsPage: React.FC = () => {
               key={name}
               name={name}
               affiliations={data.affiliations}
-              description={data.description}
+              description={data.description ?? (data.description_pending ? "Generating description…" : "")}
               onViewProfile={() =>
                 navigate(`/profile/${encodeURIComponent(name)}`)
               }
@@ -1,9 +1,11 @@
-import { useQuery } from "@tanstack/react-query";
+import React from "react";
+import { useQuery, useQueryClient } from "@tanstack/react-query";
 import axios from "axios";
 
 // Type for each author in results
 export interface Author {
-  description: string;
+  description: string | null;
+  description_pending?: boolean;
   affiliations: string[];
 }
 
@@ -24,11 +26,55 @@ const fetchResearchers = async (query: string): Promise<Record<string, Author>>
 
 // React Query hook to fetch multiple researchers
 export const useResearcherQuery = (query: string) => {
-  return useQuery<Record<string, Author>>({
+  const queryClient = useQueryClient();
+  const result = useQuery<Record<string, Author>>({
     queryKey: ["researcher", query],
     queryFn: () => fetchResearchers(query),
     enabled: !!query,
     staleTime: 5 * 60 * 1000,
     retry: 2,
   });
+
+  // Descriptions are generated after the search returns; stream them in as they complete.
+  // `description_pending` is left untouched when a description arrives so the key (and
+  // therefore the open stream) stays stable until the search itself is refetched.
+  const pendingKey = Object.entries(result.data ?? {})
+    .filter(([, author]) => author.description_pending)
+    .map(([name]) => name)
+    .join("\n");
+
+  React.useEffect(() => {
+    if (!pendingKey) return;
+
+    const params = new URLSearchParams();
+    pendingKey.split("\n").forEach((name) => params.append("name", name));
+    const source = new EventSource(`http://134.155.86.170:8000/api/search/descriptions/?${params}`);
+
+    source.addEventListener("description", (event) => {
+      const { name, description } = JSON.parse((event as MessageEvent).data);
+      queryClient.setQueryData<Record<string, Author>>(["researcher", query], (oldData) => {
+        if (!oldData || !oldData[name]) return oldData;
+        return { ...oldData, [name]: { ...oldData[name], description } };
+      });
+    });
+    source.addEventListener("done", () => source.close());
+    // Authors still waiting when the stream fails would otherwise show the placeholder forever
+    source.onerror = () => {
+      source.close();
+      queryClient.setQueryData<Record<string, Author>>(["researcher", query], (oldData) => {
+        if (!oldData) return oldData;
+        const updated = { ...oldData };
+        for (const name of pendingKey.split("\n")) {
+          if (updated[name] && updated[name].description === null) {
+            updated[name] = { ...updated[name], description: "Description unavailable." };
+          }
+        }
+        return updated;
+      });
+    };
+
+    return () => source.close();
+  }, [pendingKey, query, queryClient]);
+
+  return result;
 };